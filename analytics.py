@@ -0,0 +1,128 @@
+"""Векторизована аналітика курсу над матрицею завершення студент x урок (потрібен numpy)"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from repository import repository
+
+HISTOGRAM_BINS = 10
+
+
+def completion_matrix(course):
+    """Булева матриця (студенти x уроки курсу) та масиви ID студентів і уроків
+
+    Рядки - записані студенти в порядку запису, стовпці - уроки в порядку курсу.
+    """
+    if np is None:
+        raise RuntimeError("Для аналітики потрібен пакет numpy (pip install numpy)")
+
+    student_ids = np.fromiter(course.enrolled_students, dtype=np.int64, count=len(course.enrolled_students))
+    lesson_ids = np.fromiter(course.lessons, dtype=np.int64, count=len(course.lessons))
+
+    rows = []
+    columns = []
+    for row, student_id in enumerate(course.enrolled_students):
+        student = repository.get("students", student_id)
+        progress = student.progress.get(course.course_id) if student else None
+        if progress is None:
+            continue
+        for lesson_id in progress.completed_lessons:
+            column = course.lessons.position(lesson_id)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+
+    matrix = np.zeros((len(student_ids), len(lesson_ids)), dtype=bool)
+    matrix[np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)] = True
+    return matrix, student_ids, lesson_ids
+
+
+def course_analytics(course):
+    """Обчислює статистику курсу; повертає словник масивів numpy
+
+    completion_rate - частка студентів, що завершили кожен урок;
+    drop_off_index - позиція уроку з найбільшим падінням частки завершення (-1, якщо падіння немає);
+    histogram, bin_edges - розподіл загального прогресу студентів у відсотках;
+    stuck_counts - скільки студентів зупинилось на кожному уроці (перший незавершений урок);
+    stuck_students - масив ID студентів, що зупинились на кожному уроці.
+    """
+    matrix, student_ids, lesson_ids = completion_matrix(course)
+    students, lessons = matrix.shape
+
+    if lessons:
+        completion_rate = matrix.mean(axis=0) if students else np.zeros(lessons)
+        student_progress = matrix.mean(axis=1) * 100
+    else:
+        completion_rate = np.zeros(0)
+        student_progress = np.zeros(students)
+
+    drops = -np.diff(completion_rate)
+    drop_off_index = int(np.argmax(drops)) + 1 if drops.size and drops.max() > 0 else -1
+
+    histogram, bin_edges = np.histogram(student_progress, bins=HISTOGRAM_BINS, range=(0, 100))
+
+    # Перший незавершений урок кожного студента; студенти, що завершили все, не "застрягли"
+    finished = matrix.all(axis=1) if lessons else np.ones(students, dtype=bool)
+    first_missing = np.argmin(matrix, axis=1) if lessons else np.zeros(students, dtype=np.intp)
+    stuck_at = np.where(finished, -1, first_missing)
+    stuck_counts = np.bincount(stuck_at[stuck_at >= 0], minlength=lessons)
+    stuck_students = [student_ids[stuck_at == column] for column in range(lessons)]
+
+    return {
+        "student_ids": student_ids,
+        "lesson_ids": lesson_ids,
+        "matrix": matrix,
+        "completion_rate": completion_rate,
+        "drop_off_index": drop_off_index,
+        "histogram": histogram,
+        "bin_edges": bin_edges,
+        "stuck_counts": stuck_counts,
+        "stuck_students": stuck_students,
+    }
+
+
+def show_course_analytics():
+    """Відображення аналітики курсу в меню"""
+    from courses import Course
+
+    print("\nАналітика курсу")
+    if np is None:
+        print("Для аналітики потрібен пакет numpy (pip install numpy)")
+        return
+
+    course_id_input = input("Введіть ID курсу: ")
+    try:
+        course_id = int(course_id_input)
+    except ValueError:
+        print("ID курсу повинен бути числом")
+        return
+
+    course = Course.find_by_id(course_id)
+    if not course:
+        print("Курс з таким ID не знайдено")
+        return
+
+    if not course.lessons or not course.enrolled_students:
+        print("У курсі немає уроків або записаних студентів")
+        return
+
+    stats = course_analytics(course)
+
+    print(f"\nКурс: {course.title}")
+    print(f"Студентів: {len(stats['student_ids'])}, уроків: {len(stats['lesson_ids'])}")
+
+    print("\nЗавершення уроків:")
+    for position, lesson_id in enumerate(stats["lesson_ids"]):
+        lesson = repository.get("lessons", int(lesson_id))
+        title = lesson.title if lesson else f"ID {lesson_id}"
+        print(f"{position + 1}. {title}: {stats['completion_rate'][position] * 100:.0f}% "
+              f"(зупинились тут: {stats['stuck_counts'][position]})")
+
+    if stats["drop_off_index"] >= 0:
+        print(f"\nНайбільший відтік студентів перед уроком №{stats['drop_off_index'] + 1}")
+
+    print("\nРозподіл прогресу студентів:")
+    edges = stats["bin_edges"]
+    for count, low, high in zip(stats["histogram"], edges[:-1], edges[1:]):
+        print(f"{low:3.0f}-{high:3.0f}%: {count}")
@@ -0,0 +1,220 @@
+"""Неінтерактивне виконання команд з JSONL файлу або stdin
+
+Кожен рядок - об'єкт з полем "command" та аргументами команди, наприклад:
+    {"command": "register_student", "first_name": "Іван", "last_name": "Петренко", "email": "ivan@example.com"}
+    {"command": "enroll", "student_id": 2, "course_id": 1}
+"""
+import json
+import sys
+import time
+
+from repository import repository
+from iostats import io_stats
+from sequences import allocator
+from student import Student
+from courses import Course
+from lecture import Lecture
+from task import Task
+from validators import validate_batch
+
+# Назва операції в статистиці вводу-виводу для збереження накопичених змін
+SAVE_OPERATION = "Збереження змін"
+# ID резервуються блоками: по flush_every або, якщо зберігаємо лише в кінці, по стільки
+ID_BLOCK_SIZE = 100
+
+
+NAME_ERROR = "Ім'я та прізвище повинні містити тільки літери і не бути порожніми"
+
+
+def _field(command, name, kind, message, optional=False):
+    """Значення поля команди потрібного типу; інакше ValueError з тим же повідомленням, що й в меню"""
+    value = command.get(name) if optional else command[name]
+    if value is None and optional:
+        return None
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ValueError(message)
+    return value
+
+
+def _id(command, name, message):
+    return _field(command, name, int, message)
+
+
+def _register_student(command):
+    student = Student.register(_field(command, "first_name", str, NAME_ERROR),
+                               _field(command, "last_name", str, NAME_ERROR),
+                               _field(command, "email", str, "Некоректний формат електронної пошти"),
+                               _field(command, "phone", str, "Номер телефону повинен бути рядком", optional=True))
+    return {"student_id": student.student_id}
+
+
+def _create_course(command):
+    course = Course.create(_field(command, "title", str, "Назва курсу не може бути порожньою"),
+                           _field(command, "description", str, "Опис курсу не може бути порожнім"),
+                           _field(command, "author", str, "Ім'я автора не може бути порожнім"))
+    return {"course_id": course.course_id}
+
+
+def _add_lecture(command):
+    lecture = Lecture.create(_id(command, "course_id", "ID курсу повинен бути числом"),
+                             _field(command, "title", str, "Назва лекції не може бути порожньою"),
+                             _field(command, "description", str, "Опис уроку не може бути порожнім"),
+                             _field(command, "content", str, "Вміст лекції не може бути порожнім"),
+                             _field(command, "duration", (int, float), "Тривалість повинна бути числом"),
+                             _field(command, "video_url", str, "Посилання на відео повинно бути рядком",
+                                    optional=True))
+    return {"lesson_id": lecture.lesson_id}
+
+
+def _add_task(command):
+    task = Task.create(_id(command, "course_id", "ID курсу повинен бути числом"),
+                       _field(command, "title", str, "Назва завдання не може бути порожньою"),
+                       _field(command, "summary", str, "Опис уроку не може бути порожнім"),
+                       _field(command, "description", str, "Опис завдання не може бути порожнім"),
+                       _field(command, "max_score", (int, float), "Максимальний бал повинен бути числом"),
+                       _field(command, "deadline", str, "Дедлайн повинен бути датою у форматі YYYY-MM-DD",
+                              optional=True),
+                       command.get("tests"))
+    return {"lesson_id": task.lesson_id}
+
+
+def _enroll(command):
+    Course.enroll(_id(command, "student_id", "ID студента повинен бути числом"),
+                  _id(command, "course_id", "ID курсу повинен бути числом"))
+    return {}
+
+
+def _submit(command):
+    submission = Task.submit(_id(command, "student_id", "ID студента повинен бути числом"),
+                             _id(command, "course_id", "ID курсу повинен бути числом"),
+                             _id(command, "lesson_id", "ID завдання повинен бути числом"),
+                             _field(command, "solution", str, "Рішення не може бути порожнім"))
+    student = repository.get("students", submission.student_id)
+    return {
+        "submission_id": submission.submission_id,
+        "status": submission.status,
+        "overall_progress": student.progress[submission.course_id].overall_progress
+    }
+
+
+def _grade(command):
+    import grader
+    workers = _field(command, "workers", int, "Кількість процесів повинна бути числом", optional=True)
+    return {"graded": grader.grade_pending(workers)}
+
+
+def _edit_course(command):
+    Course.edit(_id(command, "course_id", "ID курсу повинен бути числом"),
+                _field(command, "title", str, "Назва курсу не може бути порожньою", optional=True),
+                _field(command, "description", str, "Опис курсу не може бути порожнім", optional=True),
+                _field(command, "author", str, "Ім'я автора не може бути порожнім", optional=True))
+    return {}
+
+
+COMMANDS = {
+    "register_student": _register_student,
+    "create_course": _create_course,
+    "add_lecture": _add_lecture,
+    "add_task": _add_task,
+    "enroll": _enroll,
+    "submit": _submit,
+    "edit_course": _edit_course,
+    "grade": _grade,
+}
+
+
+def execute(command):
+    """Виконує одну команду і повертає результат; помилки повертаються в полі error"""
+    if not isinstance(command, dict):
+        return {"ok": False, "error": "Команда повинна бути JSON об'єктом"}
+
+    name = command.get("command")
+    handler = COMMANDS.get(name)
+    if handler is None:
+        return {"ok": False, "error": f"Невідома команда: {name}"}
+    try:
+        with io_stats.operation(f"Команда {name}"):
+            return {"ok": True, "result": handler(command)}
+    except KeyError as error:
+        return {"ok": False, "error": f"Відсутнє поле: {error.args[0]}"}
+    except (TypeError, ValueError) as error:
+        return {"ok": False, "error": str(error)}
+
+
+def run_batch(lines, output, flush_every=0):
+    """Виконує команди з рядків JSONL; flush після кожних flush_every команд (0 - лише в кінці)"""
+    started = time.perf_counter()
+    total = errors = 0
+
+    with allocator.blocks(flush_every or ID_BLOCK_SIZE):
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                command = json.loads(line)
+            except json.JSONDecodeError as error:
+                result = {"ok": False, "error": f"Некоректний JSON: {error}"}
+            else:
+                result = execute(command)
+                if isinstance(command, dict):
+                    result["command"] = command.get("command")
+
+            result["line"] = line_number
+            total += 1
+            if not result["ok"]:
+                errors += 1
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+            if flush_every and total % flush_every == 0:
+                with io_stats.operation(SAVE_OPERATION):
+                    repository.flush()
+
+    with io_stats.operation(SAVE_OPERATION):
+        repository.flush()
+    elapsed = time.perf_counter() - started
+    return {
+        "commands": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "commands_per_second": round(total / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def main(path, flush_every=0):
+    """Запуск з файлу (або '-' для stdin); підсумок виводиться в stderr"""
+    if path == "-":
+        summary = run_batch(sys.stdin, sys.stdout, flush_every)
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            summary = run_batch(file, sys.stdout, flush_every)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 1 if summary["errors"] else 0
+
+
+def validate_lines(lines, output, workers=None):
+    """Перевіряє команди з рядків JSONL без виконання; у output пишуться лише рядки з помилками"""
+    started = time.perf_counter()
+    total = errors = 0
+    for report in validate_batch(lines, workers):
+        total += 1
+        if not report["ok"]:
+            errors += 1
+            output.write(json.dumps(report, ensure_ascii=False) + "\n")
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(total / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def validate(path, workers=None):
+    """Перевірка з файлу (або '-' для stdin); підсумок виводиться в stderr"""
+    if path == "-":
+        summary = validate_lines(sys.stdin, sys.stdout, workers)
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            summary = validate_lines(file, sys.stdout, workers)
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 1 if summary["errors"] else 0
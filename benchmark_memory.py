@@ -0,0 +1,67 @@
+"""Вимірювання пам'яті на одного студента (100 000 студентів за замовчуванням)"""
+import sys
+import tracemalloc
+
+from student import Student
+
+
+class LegacyStudent:
+    """Попереднє представлення: звичайний клас з __dict__ та списками рядкових ID"""
+
+    def __init__(self, student_dict):
+        self.student_id = student_dict["student_id"]
+        self.first_name = student_dict["first_name"]
+        self.last_name = student_dict["last_name"]
+        self.email = student_dict["email"]
+        self.phone = student_dict.get("phone")
+        self.enrolled_courses = list(student_dict["enrolled_courses"])
+        self.progress = {
+            course_id: {
+                "completed_lessons": list(progress["completed_lessons"]),
+                "overall_progress": progress["overall_progress"]
+            }
+            for course_id, progress in student_dict["progress"].items()
+        }
+
+
+def student_record(student_id, courses=2, completed=3):
+    """Типовий запис студента у форматі students.json"""
+    return {
+        "student_id": student_id,
+        "first_name": f"Ім'я{student_id}",
+        "last_name": f"Прізвище{student_id}",
+        "email": f"student{student_id}@example.com",
+        "phone": None,
+        "enrolled_courses": [str(course_id) for course_id in range(1, courses + 1)],
+        "progress": {
+            str(course_id): {
+                "completed_lessons": [str(lesson_id) for lesson_id in range(1, completed + 1)],
+                "overall_progress": 30
+            }
+            for course_id in range(1, courses + 1)
+        }
+    }
+
+
+def measure(factory, count):
+    """Байти на об'єкт, виділені під час створення count об'єктів"""
+    records = [student_record(student_id) for student_id in range(1, count + 1)]
+    tracemalloc.start()
+    objects = [factory(record) for record in records]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return allocated / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    legacy = measure(LegacyStudent, count)
+    slotted = measure(Student.from_dict, count)
+    print(f"Студентів: {count}")
+    print(f"Попередній формат: {legacy:.0f} байт/студента")
+    print(f"Поточний формат:   {slotted:.0f} байт/студента")
+
+
+if __name__ == "__main__":
+    main()
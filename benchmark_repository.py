@@ -0,0 +1,101 @@
+"""Підрахунок розборів і записів JSON файлів для кожної опції меню"""
+import builtins
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from repository import repository
+from storage import backend
+from student import Student
+from courses import Course
+from lecture import Lecture
+from task import Task
+
+DATA_FILES = ["students.json", "courses.json", "lessons.json", "lectures.json", "tasks.json"]
+
+OPERATIONS = [
+    ("1. Реєстрація студента", Student.register_student, ["Іван", "Петренко", "ivan@example.com", ""]),
+    ("2. Створення курсу", Course.create_course, ["Алгоритми", "Опис курсу", "Автор"]),
+    ("3. Додавання лекції", Lecture.add_to_course, ["1", "Лекція", "Опис", "Вміст", "15", ""]),
+    ("4. Додавання завдання", Task.add_to_course, ["1", "Завдання", "Опис", "Повний опис", "10", "", ""]),
+    ("5. Запис на курс", Course.enroll_student, ["2", "1"]),
+    ("6. Прогрес студента", Student.show_progress, ["1"]),
+    ("7. Редагування курсу", Course.edit_course, ["1", "1", "Нова назва"]),
+    ("8. Список курсів", Course.list_all_courses, []),
+    ("9. Інформація про курс", Course.show_course_details, ["1"]),
+    ("10. Подання рішення", Task.submit_solution, ["1", "1", "1", "print(1)"]),
+]
+
+
+class Counter:
+    """Рахує розбори json та записи знімків і журналу"""
+
+    def __init__(self):
+        self.parses = 0
+        self.writes = 0
+        self._load = json.load
+        self._dump = json.dump
+        self._append = backend.append
+
+    def load(self, *args, **kwargs):
+        self.parses += 1
+        return self._load(*args, **kwargs)
+
+    def dump(self, *args, **kwargs):
+        self.writes += 1
+        return self._dump(*args, **kwargs)
+
+    def append(self, entries):
+        if entries:
+            self.writes += 1
+        return self._append(entries)
+
+
+def run(session):
+    """Виконує всі операції меню; session=False скидає стан перед кожною операцією"""
+    counter = Counter()
+    json.load, json.dump = counter.load, counter.dump
+    backend.append = counter.append
+    results = []
+    try:
+        for name, operation, answers in OPERATIONS:
+            if not session:
+                repository.clear()
+            parses, writes = counter.parses, counter.writes
+            feed = iter(answers)
+            builtins.input = lambda prompt="": next(feed)
+            with contextlib.redirect_stdout(io.StringIO()):
+                operation()
+                repository.flush()
+            results.append((name, counter.parses - parses, counter.writes - writes))
+    finally:
+        json.load, json.dump = counter._load, counter._dump
+        backend.append = counter._append
+        builtins.input = _input
+    return results
+
+
+_input = builtins.input
+
+
+def main():
+    source = os.path.dirname(os.path.abspath(__file__))
+    session = "--session" in sys.argv
+    with tempfile.TemporaryDirectory() as workdir:
+        for file in DATA_FILES:
+            shutil.copy(os.path.join(source, file), workdir)
+        os.chdir(workdir)
+        results = run(session)
+        os.chdir(source)
+
+    print(f"{'Операція':<28}{'Розборів':>10}{'Записів':>10}")
+    for name, parses, writes in results:
+        print(f"{name:<28}{parses:>10}{writes:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Вимірювання масштабованості операцій меню на синтетичних даних зростаючого розміру
+
+Для кожного розміру дані генеруються в тимчасовому каталозі (generate_data.py), а операції
+виконуються в окремому процесі, щоб кеші сховища та індексів не переходили між розмірами.
+Кожна операція викликається --repeat разів з різними аргументами так само, як у головному
+меню (разом зі збереженням змін); виводяться перцентилі затримки та показник масштабування -
+нахил log(p50) від log(кількості студентів) між найменшим і найбільшим розміром
+(0 - не залежить від обсягу, 1 - лінійно).
+
+Використання:
+    python benchmark_scaling.py [--sizes 1000,10000,50000] [--courses 50] [--lessons 10]
+                                [--enrollment 0.05] [--completion 0.5] [--repeat 30] [--cold] [--json FILE]
+"""
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+@contextlib.contextmanager
+def _answers(values):
+    """Підставляє відповіді на input() і приховує виведення інтерактивних методів"""
+    feed = iter(values)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(feed, "")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+
+def operations(rng, students, courses):
+    """Операції меню: (назва, функція, що готує аргументи та повертає виклик)"""
+    from student import Student
+    from courses import Course
+    from lecture import Lecture
+    from task import Task
+    from repository import repository
+    from analytics import show_course_analytics
+    from submission import Submission
+    from search import search_catalog
+    from deadlines import show_student_deadlines, show_overdue_tasks
+
+    counter = iter(range(1, 10 ** 9))
+
+    def interactive(function, *answers):
+        def call():
+            with _answers([str(answer) for answer in answers]):
+                function()
+        return call
+
+    def enrolled_student():
+        """Випадковий студент, записаний хоча б на один курс"""
+        while True:
+            student = repository.get("students", rng.randint(1, students))
+            if student and student.enrolled_courses:
+                return student
+
+    def register():
+        number = next(counter)
+        return lambda: Student.register("Бенчмарк", "Тестовий", f"bench{number}-{rng.random()}@example.com")
+
+    def create_course():
+        return lambda: Course.create(f"Новий курс {next(counter)}", "Опис курсу", "Автор")
+
+    def add_lecture():
+        course_id = rng.randint(1, courses)
+        return lambda: Lecture.create(course_id, "Нова лекція", "Опис", "Вміст лекції", 15)
+
+    def add_task():
+        course_id = rng.randint(1, courses)
+        return lambda: Task.create(course_id, "Нове завдання", "Опис", "Повний опис", 10, "2030-01-01")
+
+    def enroll():
+        while True:
+            student_id, course_id = rng.randint(1, students), rng.randint(1, courses)
+            student = repository.get("students", student_id)
+            if student and course_id not in student.enrolled_courses:
+                return lambda: Course.enroll(student_id, course_id)
+
+    def submit():
+        while True:
+            student = enrolled_student()
+            course_id = rng.choice(list(student.enrolled_courses))
+            course = repository.get("courses", course_id)
+            completed = student.progress[course_id].completed_lessons
+            pending = [lesson_id for lesson_id in course.lessons
+                       if lesson_id not in completed and repository.get("tasks", lesson_id)]
+            if pending:
+                lesson_id = rng.choice(pending)
+                return lambda: Task.submit(student.student_id, course_id, lesson_id, "print(1)")
+
+    def edit_course():
+        course_id = rng.randint(1, courses)
+        return lambda: Course.edit(course_id, description=f"Оновлений опис {next(counter)}")
+
+    return [
+        ("1. Реєстрація студента", register),
+        ("2. Створення курсу", create_course),
+        ("3. Додавання лекції", add_lecture),
+        ("4. Додавання завдання", add_task),
+        ("5. Запис на курс", enroll),
+        ("6. Прогрес студента", lambda: interactive(Student.show_progress, enrolled_student().student_id)),
+        ("7. Редагування курсу", edit_course),
+        ("8. Список курсів", lambda: interactive(Course.list_all_courses, "")),
+        ("9. Інформація про курс", lambda: interactive(Course.show_course_details, rng.randint(1, courses))),
+        ("10. Подання рішення", submit),
+        ("11. Аналітика курсу", lambda: interactive(show_course_analytics, rng.randint(1, courses))),
+        ("12. Мої рішення",
+         lambda: interactive(Submission.show_student_submissions, enrolled_student().student_id, "")),
+        ("13. Пошук", lambda: interactive(search_catalog, rng.choice(["python", "алгоритми", "лекція історія"]))),
+        ("14. Дедлайни студента", lambda: interactive(show_student_deadlines, enrolled_student().student_id, "")),
+        ("15. Прострочені завдання", lambda: interactive(show_overdue_tasks, rng.randint(1, courses))),
+    ]
+
+
+def _reset_caches():
+    """Скидає кеші в пам'яті, як у новому процесі"""
+    from repository import repository
+    from completion import completions
+    from deadlines import deadlines
+
+    repository.clear()
+    completions.clear()
+    deadlines.clear()
+
+
+def run_worker(args):
+    """Вимірює всі операції в поточному каталозі даних; повертає {операція: [секунди]}"""
+    from repository import repository
+    from storage import ENTITY_KINDS, backend
+
+    rng = random.Random(args.seed)
+    for kind in ENTITY_KINDS:
+        repository.all(kind)
+
+    timings = {}
+    for name, prepare in operations(rng, args.students, args.courses):
+        samples = []
+        for _ in range(args.repeat):
+            call = prepare()
+            if args.cold:
+                _reset_caches()
+            started = time.perf_counter()
+            call()
+            repository.flush()
+            samples.append(time.perf_counter() - started)
+        timings[name] = samples
+    backend.wait()
+    return timings
+
+
+def measure_size(args, students):
+    """Генерує дані одного розміру й вимірює операції в окремому процесі"""
+    from generate_data import generate
+
+    with tempfile.TemporaryDirectory() as directory:
+        generate(directory, students, args.courses, args.lessons, args.enrollment, args.completion, seed=args.seed)
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--students", str(students),
+                   "--courses", str(args.courses), "--repeat", str(args.repeat), "--seed", str(args.seed)]
+        if args.cold:
+            command.append("--cold")
+        result = subprocess.run(command, cwd=directory, capture_output=True, text=True,
+                                env={**os.environ, "PYTHONPATH": os.path.dirname(os.path.abspath(__file__))})
+    if result.returncode != 0:
+        raise RuntimeError(f"Помилка вимірювання для {students} студентів:\n{result.stderr}")
+    # Результати - останній рядок виведення процесу
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(timings):
+    summary = {}
+    for name, samples in timings.items():
+        samples = sorted(samples)
+        summary[name] = {label: round(percentile(samples, fraction) * 1000, 3) for label, fraction in PERCENTILES}
+    return summary
+
+
+def scaling_exponent(sizes, values):
+    """Нахил log(значення) від log(розміру) між першим і останнім розміром"""
+    if len(sizes) < 2 or values[0] <= 0 or values[-1] <= 0:
+        return None
+    return math.log(values[-1] / values[0]) / math.log(sizes[-1] / sizes[0])
+
+
+def report(sizes, results):
+    names = list(results[sizes[0]])
+    for size in sizes:
+        print(f"\nСтудентів: {size}")
+        print(f"{'Операція':<28}" + "".join(f"{label + ', мс':>12}" for label, _ in PERCENTILES))
+        for name in names:
+            row = results[size][name]
+            print(f"{name:<28}" + "".join(f"{row[label]:>12.3f}" for label, _ in PERCENTILES))
+
+    print("\nМасштабування p50, мс")
+    print(f"{'Операція':<28}" + "".join(f"{size:>10}" for size in sizes) + f"{'нахил':>8}")
+    for name in names:
+        values = [results[size][name]["p50"] for size in sizes]
+        exponent = scaling_exponent(sizes, values)
+        print(f"{name:<28}" + "".join(f"{value:>10.3f}" for value in values)
+              + (f"{exponent:>8.2f}" if exponent is not None else f"{'-':>8}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Масштабованість операцій меню на синтетичних даних")
+    parser.add_argument("--sizes", default="1000,10000,50000", help="кількості студентів через кому")
+    parser.add_argument("--students", type=int, default=1000, help=argparse.SUPPRESS)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--lessons", type=int, default=10, help="уроків на курс")
+    parser.add_argument("--enrollment", type=float, default=0.05)
+    parser.add_argument("--completion", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=30, help="повторів кожної операції")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cold", action="store_true", help="скидати кеші перед кожною операцією (як новий запуск)")
+    parser.add_argument("--json", help="зберегти результати у файл")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return 0
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    results = {}
+    for size in sizes:
+        started = time.perf_counter()
+        results[size] = summarize(measure_size(args, size))
+        print(f"Розмір {size}: виміряно за {time.perf_counter() - started:.1f} с", file=sys.stderr)
+
+    report(sizes, results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"sizes": sizes, "parameters": vars(args), "results": results}, file,
+                      ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""Бітові множини завершених уроків: хто з записаних студентів завершив урок курсу"""
+from repository import repository
+
+
+class CourseCompletions:
+    """Для кожного уроку курсу - ціле число, біт i якого означає студента на позиції i запису"""
+
+    __slots__ = ("course", "_lessons")
+
+    def __init__(self, course):
+        self.course = course
+        self._lessons = {}
+
+    @staticmethod
+    def build(course):
+        """Будує бітові множини з прогресу записаних студентів курсу"""
+        completions = CourseCompletions(course)
+        for position, student_id in enumerate(course.enrolled_students):
+            student = repository.get("students", student_id)
+            progress = student.progress.get(course.course_id) if student else None
+            if progress is None:
+                continue
+            for lesson_id in progress.completed_lessons:
+                completions._set(lesson_id, position)
+        return completions
+
+    def _set(self, lesson_id, position):
+        self._lessons[lesson_id] = self._lessons.get(lesson_id, 0) | (1 << position)
+
+    def mark(self, student_id, lesson_id):
+        """Позначає урок завершеним студентом; студент має бути записаний на курс"""
+        position = self.course.enrolled_students.position(student_id)
+        if position is None:
+            return False
+        self._set(lesson_id, position)
+        return True
+
+    def sync(self, student):
+        """Переносить у біти студента його збережений прогрес курсу (ставить і знімає біти)"""
+        position = self.course.enrolled_students.position(student.student_id)
+        if position is None:
+            return
+        bit = 1 << position
+        for lesson_id, bits in self._lessons.items():
+            if bits & bit:
+                self._lessons[lesson_id] = bits & ~bit
+        progress = student.progress.get(self.course.course_id)
+        if progress is not None:
+            for lesson_id in progress.completed_lessons:
+                self._set(lesson_id, position)
+
+    @property
+    def everyone(self):
+        """Бітова множина всіх записаних студентів"""
+        return (1 << len(self.course.enrolled_students)) - 1
+
+    def bits(self, lesson_id):
+        """Бітова множина студентів, що завершили урок"""
+        return self._lessons.get(lesson_id, 0)
+
+    def count(self, lesson_id):
+        """Кількість студентів, що завершили урок"""
+        return self.bits(lesson_id).bit_count()
+
+    def all_of(self, lesson_ids):
+        """Студенти, що завершили всі задані уроки (AND)"""
+        bits = self.everyone
+        for lesson_id in lesson_ids:
+            bits &= self.bits(lesson_id)
+            if not bits:
+                break
+        return bits
+
+    def any_of(self, lesson_ids):
+        """Студенти, що завершили хоча б один із заданих уроків (OR)"""
+        bits = 0
+        for lesson_id in lesson_ids:
+            bits |= self.bits(lesson_id)
+        return bits
+
+    def student_ids(self, bits):
+        """Перетворює бітову множину на список ID студентів у порядку запису"""
+        students = self.course.enrolled_students
+        ids = []
+        while bits:
+            lowest = bits & -bits
+            ids.append(students[lowest.bit_length() - 1])
+            bits ^= lowest
+        return ids
+
+    def completed(self, lesson_id):
+        """ID студентів, що завершили урок"""
+        return self.student_ids(self.bits(lesson_id))
+
+    def completed_all(self, lesson_ids):
+        """ID студентів, що завершили всі задані уроки"""
+        return self.student_ids(self.all_of(lesson_ids))
+
+
+class CompletionIndex:
+    """Ліниво будує бітові множини курсів і підтримує їх актуальними при змінах прогресу"""
+
+    def __init__(self):
+        self._courses = {}
+        repository.watch("students", self._update)
+
+    def _update(self, student):
+        """Зміна студента поза update_progress (put або перечитування з диска) оновлює його біти"""
+        if student is None:
+            self._courses.clear()
+            return
+        for course_id in student.progress:
+            completions = self._courses.get(course_id)
+            if completions is not None:
+                completions.sync(student)
+
+    def for_course(self, course):
+        """Бітові множини курсу; перебудовуються, якщо сховище завантажило курс наново"""
+        completions = self._courses.get(course.course_id)
+        if completions is None or completions.course is not course:
+            completions = CourseCompletions.build(course)
+            self._courses[course.course_id] = completions
+        return completions
+
+    def mark(self, course_id, student_id, lesson_id):
+        """Викликається з Student.update_progress; непобудовані курси не чіпаються"""
+        completions = self._courses.get(course_id)
+        if completions is not None:
+            completions.mark(student_id, lesson_id)
+
+    def add_student(self, course_id, student_id):
+        """Викликається з Course.add_student: студент отримує наступну позицію запису
+
+        Зазвичай його біти нульові, але вже збережений прогрес (наприклад, з імпорту) теж враховується.
+        """
+        completions = self._courses.get(course_id)
+        if completions is None:
+            return
+        student = repository.get("students", student_id)
+        progress = student.progress.get(course_id) if student else None
+        if progress is not None:
+            for lesson_id in progress.completed_lessons:
+                completions.mark(student_id, lesson_id)
+
+    def clear(self):
+        """Скидає побудовані бітові множини"""
+        self._courses.clear()
+
+
+completions = CompletionIndex()
@@ -1,34 +1,35 @@
-import json
 from validators import validate_title, validate_content
+from repository import repository
+from storage import backend
+from sequences import allocator
+from idset import IdSet
+from completion import completions
+from search import search_index
+import pagination
 
 
 class Course:
     """Клас представлення курсів"""
-    __COURSE_ID = 1
 
-    def __init__(self, title, description, author, lessons=None, enrolled_students=None):
-        self.course_id = Course.__COURSE_ID
+    __slots__ = ("course_id", "title", "description", "author", "lessons", "enrolled_students")
+
+    def __init__(self, title, description, author, lessons=None, enrolled_students=None, course_id=None):
+        self.course_id = course_id if course_id is not None else allocator.next_id("courses")
         self.title = title
         self.description = description
         self.author = author
-        self.lessons = lessons if lessons else []
-        self.enrolled_students = enrolled_students if enrolled_students else []
-        Course.course_index()
-
-    @classmethod
-    def course_index(cls):
-        """Лічильник індексів, робить їх унікальними"""
-        cls.__COURSE_ID += 1
+        self.lessons = IdSet(lessons or ())
+        self.enrolled_students = IdSet(enrolled_students or ())
 
     def to_dict(self):
-        """Перетворення об'єкта в словник"""
+        """Перетворення об'єкта в словник (ID зберігаються рядками, як і раніше)"""
         return {
             "course_id": self.course_id,
             "title": self.title,
             "description": self.description,
             "author": self.author,
-            "lessons": self.lessons,
-            "enrolled_students": self.enrolled_students
+            "lessons": self.lessons.to_strings(),
+            "enrolled_students": self.enrolled_students.to_strings()
         }
 
     @staticmethod
@@ -38,35 +39,38 @@ class Course:
             course_dict["title"],
             course_dict["description"],
             course_dict["author"],
-            course_dict.get("lessons", []),
-            course_dict.get("enrolled_students", [])
+            [int(lesson_id) for lesson_id in course_dict.get("lessons", [])],
+            [int(student_id) for student_id in course_dict.get("enrolled_students", [])],
+            course_dict["course_id"]
         )
-        course.course_id = course_dict["course_id"]
         return course
 
     @staticmethod
     def load_courses():
         """Підтягує всі курси з словника"""
-        try:
-            with open("courses.json", "r", encoding="utf-8") as file:
-                courses_data = json.load(file)
-                courses = []
-                for course_dict in courses_data:
-                    course = Course.from_dict(course_dict)
-                    courses.append(course)
-                return courses
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return backend.load_objects("courses", Course.from_dict)
+
+    @staticmethod
+    def iter_courses():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("courses")
 
     @staticmethod
-    def save_courses(courses):
-        """Зберігає курси у словник"""
-        courses_data = []
-        for course in courses:
-            courses_data.append(course.to_dict())
+    def create(title, description, author):
+        """Створення курсу без діалогу; при помилці валідації кидає ValueError"""
+        if not validate_title(title):
+            raise ValueError("Назва курсу не може бути порожньою")
+
+        if not validate_content(description):
+            raise ValueError("Опис курсу не може бути порожнім")
+
+        if not validate_title(author):
+            raise ValueError("Ім'я автора не може бути порожнім")
 
-        with open("courses.json", "w", encoding="utf-8") as file:
-            json.dump(courses_data, file, ensure_ascii=False, indent=2)
+        new_course = Course(title, description, author)
+        repository.add("courses", new_course)
+        search_index.update_course(new_course)
+        return new_course
 
     @staticmethod
     def create_course():
@@ -76,140 +80,151 @@ class Course:
         description = input("Введіть опис курсу: ")
         author = input("Введіть ім'я автора курсу: ")
 
-        if not validate_title(title):
-            print("Назва курсу не може бути порожньою")
-            return
-
-        if not validate_content(description):
-            print("Опис курсу не може бути порожнім")
-            return
-
-        if not validate_title(author):
-            print("Ім'я автора не може бути порожнім")
+        try:
+            new_course = Course.create(title, description, author)
+        except ValueError as error:
+            print(error)
             return
 
-        courses = Course.load_courses()
-        new_course = Course(title, description, author)
-        courses.append(new_course)
-        Course.save_courses(courses)
         print(f"Курс '{title}' з ID {new_course.course_id} успішно створено!")
 
     @staticmethod
     def find_by_id(course_id):
         """Пошук курсу за ID"""
-        courses = Course.load_courses()
-        for course in courses:
-            if course.course_id == course_id:
-                return course
-        return None
+        return repository.get("courses", course_id)
 
     def add_lesson(self, lesson_id):
         """Додавання уроку до курсу"""
-        if str(lesson_id) not in self.lessons:
-            self.lessons.append(str(lesson_id))
-
-            courses = Course.load_courses()
-            for i, course in enumerate(courses):
-                if course.course_id == self.course_id:
-                    courses[i] = self
-                    Course.save_courses(courses)
-                    return True
+        if self.lessons.add(lesson_id):
+            repository.record({"op": "add_lesson", "kind": "courses", "course_id": self.course_id,
+                               "lesson_id": lesson_id})
+            self.refresh_students_progress()
+            return True
         return False
 
+    @property
+    def lesson_count(self):
+        """Кількість уроків курсу (IdSet зберігає довжину, тож це O(1))"""
+        return len(self.lessons)
+
+    def refresh_students_progress(self):
+        """Оновлює відсоток прогресу лише студентів цього курсу - O(кількість записаних)"""
+        from student import Student
+
+        total_lessons = self.lesson_count
+        for student_id in self.enrolled_students:
+            student = Student.find_by_id(student_id)
+            if student:
+                student.refresh_progress(self.course_id, total_lessons)
+
     def add_student(self, student_id):
         """Додавання студента до курсу"""
-        if str(student_id) not in self.enrolled_students:
-            self.enrolled_students.append(str(student_id))
-
-            courses = Course.load_courses()
-            for i, course in enumerate(courses):
-                if course.course_id == self.course_id:
-                    courses[i] = self
-                    Course.save_courses(courses)
-                    return True
+        if self.enrolled_students.add(student_id):
+            repository.record({"op": "add_student", "kind": "courses", "course_id": self.course_id,
+                               "student_id": student_id})
+            completions.add_student(self.course_id, student_id)
+            return True
         return False
 
     @staticmethod
-    def enroll_student():
-        """Зареєструвати студента на курс"""
+    def enroll(student_id, course_id):
+        """Запис студента на курс без діалогу; при помилці кидає ValueError"""
         from student import Student
 
+        student = Student.find_by_id(student_id)
+        if not student:
+            raise ValueError("Студента з таким ID не знайдено")
+
+        course = Course.find_by_id(course_id)
+        if not course:
+            raise ValueError("Курс з таким ID не знайдено")
+
+        if student.student_id in course.enrolled_students:
+            raise ValueError(f"Студент вже записаний на курс '{course.title}'")
+
+        if not (course.add_student(student.student_id) and student.enroll_in_course(course.course_id)):
+            raise ValueError("Помилка при записі на курс")
+        return student, course
+
+    @staticmethod
+    def enroll_student():
+        """Зареєструвати студента на курс"""
         print("\nЗапис студента на курс")
 
-        students = Student.load_students()
-        if not students:
+        if not pagination.count("students"):
             print("Немає зареєстрованих студентів. Спочатку зареєструйте студента.")
             return
 
-        courses = Course.load_courses()
-        if not courses:
+        if not pagination.count("courses"):
             print("Немає доступних курсів. Спочатку створіть курс.")
             return
 
-        print("\nДоступні студенти:")
-        for i, student in enumerate(students, 1):
-            print(f"{i}. {student.first_name} {student.last_name} (ID: {student.student_id})")
+        student = pagination.choose(
+            "students", "Доступні студенти:",
+            lambda i, student: print(f"{i}. {student.first_name} {student.last_name} (ID: {student.student_id})"),
+            "\nВиберіть номер студента: ", "Невірний вибір студента", "name")
+        if not student:
+            return
+
+        course = Course.choose_course("\nВиберіть номер курсу: ")
+        if not course:
+            return
 
         try:
-            student_index = int(input("\nВиберіть номер студента: ")) - 1
-            if student_index < 0 or student_index >= len(students):
-                print("Невірний вибір студента")
-                return
-        except ValueError:
-            print("Введіть числове значення")
+            Course.enroll(student.student_id, course.course_id)
+        except ValueError as error:
+            print(error)
             return
 
-        student = students[student_index]
+        print(f"Студент {student.first_name} {student.last_name} успішно записаний на курс '{course.title}'")
 
-        print("\nДоступні курси:")
-        for i, course in enumerate(courses, 1):
-            print(f"{i}. {course.title} (ID: {course.course_id})")
+    @staticmethod
+    def choose_course(prompt="\nВиберіть номер курсу: "):
+        """Посторінковий вибір курсу зі списку; None, якщо вибір невірний"""
+        return pagination.choose(
+            "courses", "Доступні курси:", lambda i, course: print(f"{i}. {course.title} (ID: {course.course_id})"),
+            prompt, "Невірний вибір курсу", "title")
 
-        try:
-            course_index = int(input("\nВиберіть номер курсу: ")) - 1
-            if course_index < 0 or course_index >= len(courses):
-                print("Невірний вибір курсу")
-                return
-        except ValueError:
-            print("Введіть числове значення")
-            return
+    @staticmethod
+    def edit(course_id, title=None, description=None, author=None):
+        """Редагування курсу без діалогу; змінюються лише передані поля"""
+        course = Course.find_by_id(course_id)
+        if not course:
+            raise ValueError("Курс з таким ID не знайдено")
 
-        course = courses[course_index]
+        if title is not None and not validate_title(title):
+            raise ValueError("Назва курсу не може бути порожньою")
 
-        if str(student.student_id) in course.enrolled_students:
-            print(f"Студент вже записаний на курс '{course.title}'")
-            return
+        if description is not None and not validate_content(description):
+            raise ValueError("Опис курсу не може бути порожнім")
+
+        if author is not None and not validate_title(author):
+            raise ValueError("Ім'я автора не може бути порожнім")
 
-        if course.add_student(student.student_id) and student.enroll_in_course(course.course_id):
-            print(f"Студент {student.first_name} {student.last_name} успішно записаний на курс '{course.title}'")
-        else:
-            print("Помилка при записі на курс")
+        if title is not None:
+            course.title = title
+        if description is not None:
+            course.description = description
+        if author is not None:
+            course.author = author
+
+        repository.put("courses", course)
+        search_index.update_course(course)
+        return course
 
     @staticmethod
     def edit_course():
         """Редагування існуючого курсу"""
         print("\nРедагування курсу")
 
-        courses = Course.load_courses()
-        if not courses:
+        if not pagination.count("courses"):
             print("Немає доступних курсів для редагування")
             return
 
-        print("\nДоступні курси:")
-        for i, course in enumerate(courses, 1):
-            print(f"{i}. {course.title} (ID: {course.course_id})")
-
-        try:
-            course_index = int(input("\nВиберіть номер курсу для редагування: ")) - 1
-            if course_index < 0 or course_index >= len(courses):
-                print("Невірний вибір курсу")
-                return
-        except ValueError:
-            print("Введіть числове значення")
+        course = Course.choose_course("\nВиберіть номер курсу для редагування: ")
+        if not course:
             return
 
-        course = courses[course_index]
-
         print("\nЩо ви хочете редагувати?")
         print("1. Назву курсу")
         print("2. Опис курсу")
@@ -224,61 +239,37 @@ class Course:
             print("Введіть числове значення")
             return
 
-        if edit_choice == 1:
-            new_title = input("Введіть нову назву курсу: ")
-            if not validate_title(new_title):
-                print("Назва курсу не може бути порожньою")
-                return
-            course.title = new_title
-            print("Назву курсу успішно оновлено")
+        try:
+            if edit_choice == 1:
+                Course.edit(course.course_id, title=input("Введіть нову назву курсу: "))
+                print("Назву курсу успішно оновлено")
 
-        elif edit_choice == 2:
-            new_description = input("Введіть новий опис курсу: ")
-            if not validate_content(new_description):
-                print("Опис курсу не може бути порожнім")
-                return
-            course.description = new_description
-            print("Опис курсу успішно оновлено")
+            elif edit_choice == 2:
+                Course.edit(course.course_id, description=input("Введіть новий опис курсу: "))
+                print("Опис курсу успішно оновлено")
 
-        elif edit_choice == 3:
-            new_author = input("Введіть нового автора курсу: ")
-            if not validate_title(new_author):
-                print("Ім'я автора не може бути порожнім")
-                return
-            course.author = new_author
-            print("Автора курсу успішно оновлено")
-
-        for i, c in enumerate(courses):
-            if c.course_id == course.course_id:
-                courses[i] = course
-                Course.save_courses(courses)
-                break
+            elif edit_choice == 3:
+                Course.edit(course.course_id, author=input("Введіть нового автора курсу: "))
+                print("Автора курсу успішно оновлено")
+        except ValueError as error:
+            print(error)
 
     @staticmethod
     def list_all_courses():
         """Виведення списку всіх доступних курсів"""
-        courses = Course.load_courses()
-
-        if not courses:
-            print("\nНемає доступних курсів")
-            return
-
-        print("\nДоступні курси:")
-        for i, course in enumerate(courses, 1):
-            student_count = len(course.enrolled_students)
-            lesson_count = len(course.lessons)
+        def show(i, course):
             print(f"{i}. {course.title} (ID: {course.course_id})")
             print(f"   Автор: {course.author}")
-            print(f"   Кількість уроків: {lesson_count}")
-            print(f"   Кількість студентів: {student_count}")
+            print(f"   Кількість уроків: {len(course.lessons)}")
+            print(f"   Кількість студентів: {len(course.enrolled_students)}")
             print("-" * 30)
 
+        pagination.browse("courses", "Доступні курси:", show, "Немає доступних курсів", "title")
+
     @staticmethod
     def show_course_details():
         """Показати детальну інформацію про курс"""
-        from lesson import Lesson
-        from lecture import Lecture
-        from task import Task
+        from outline import course_outline, course_tasks
 
         print("\nІнформація про курс")
         course_id_input = input("Введіть ID курсу: ")
@@ -307,34 +298,22 @@ class Course:
 
         print("\nСписок уроків:")
 
-        lessons = Lesson.load_lessons()
-        lectures = Lecture.load_lectures()
-        tasks = Task.load_tasks()
+        course_completions = completions.for_course(course)
+        for item in course_outline(course):
+            lesson = item.lesson
+            print(f"{item.position}. {lesson.title} (ID: {lesson.lesson_id})")
+            print(f"   Завершили: {course_completions.count(lesson.lesson_id)} з {student_count}")
 
-        for i, lesson_id in enumerate(course.lessons, 1):
-            lesson = None
-            for l in lessons:
-                if str(l.lesson_id) == lesson_id:
-                    lesson = l
-                    break
+            if item.lecture:
+                print(f"   Тип: Лекція")
+                print(f"   Тривалість: {item.lecture.duration} хв")
 
-            if not lesson:
-                continue
-
-            print(f"{i}. {lesson.title} (ID: {lesson.lesson_id})")
-
-            if lesson.type == "lecture":
-                for lecture in lectures:
-                    if lecture.lesson_id == int(lesson_id):
-                        print(f"   Тип: Лекція")
-                        print(f"   Тривалість: {lecture.duration} хв")
-                        break
-
-            elif lesson.type == "task":
-                for task in tasks:
-                    if task.lesson_id == int(lesson_id):
-                        print(f"   Тип: Завдання")
-                        print(f"   Максимальний бал: {task.max_score}")
-                        break
+            elif item.task:
+                print(f"   Тип: Завдання")
+                print(f"   Максимальний бал: {item.task.max_score}")
 
             print("-" * 30)
+
+        task_ids = [lesson.lesson_id for lesson, _ in course_tasks(course)]
+        if task_ids and student_count:
+            print(f"Виконали всі завдання курсу: {len(course_completions.completed_all(task_ids))} з {student_count}")
@@ -0,0 +1,201 @@
+"""Індекс дедлайнів завдань: найближчі та прострочені завдання без перебору всіх завдань і студентів
+
+Для кожного курсу дедлайни розбираються один раз і зберігаються відсортованим списком
+(дата, ID уроку). Діапазон дат знаходиться бінарним пошуком, найближчий дедлайн студента -
+злиттям відсортованих списків його курсів через купу (heapq.merge), а виконані уроки
+перевіряються за completed_lessons студента та бітовими множинами completion.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+
+from repository import repository
+from completion import completions
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_deadline(deadline):
+    """Дата дедлайну або None, якщо дедлайн не задано чи він у невідомому форматі"""
+    if not deadline:
+        return None
+    try:
+        return datetime.strptime(deadline.strip(), DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+
+class CourseDeadlines:
+    """Відсортовані (дата, ID уроку) завдань курсу з дедлайнами"""
+
+    __slots__ = ("course", "lesson_count", "entries")
+
+    def __init__(self, course, entries):
+        self.course = course
+        self.lesson_count = len(course.lessons)
+        self.entries = entries
+
+    @staticmethod
+    def build(course):
+        entries = []
+        for lesson_id in course.lessons:
+            task = repository.get("tasks", lesson_id)
+            due = parse_deadline(task.deadline) if task else None
+            if due is not None:
+                entries.append((due, lesson_id))
+        entries.sort()
+        return CourseDeadlines(course, entries)
+
+    def between(self, start, end):
+        """Записи з датою в межах [start, end]"""
+        return self.entries[bisect_left(self.entries, (start,)):bisect_right(self.entries, (end, float("inf")))]
+
+    def before(self, day):
+        """Записи з датою раніше day"""
+        return self.entries[:bisect_left(self.entries, (day,))]
+
+    def from_day(self, day):
+        """Записи з датою не раніше day"""
+        return self.entries[bisect_left(self.entries, (day,)):]
+
+
+class DeadlineIndex:
+    """Ліниво будує дедлайни курсів; курс перебудовується, якщо його завантажено наново або додано уроки"""
+
+    def __init__(self):
+        self._courses = {}
+
+    def for_course(self, course):
+        deadlines = self._courses.get(course.course_id)
+        if deadlines is None or deadlines.course is not course or deadlines.lesson_count != len(course.lessons):
+            deadlines = CourseDeadlines.build(course)
+            self._courses[course.course_id] = deadlines
+        return deadlines
+
+    def _enrolled(self, student):
+        for course_id in student.enrolled_courses:
+            course = repository.get("courses", course_id)
+            if course:
+                progress = student.progress.get(course_id)
+                yield course, progress.completed_lessons if progress else ()
+
+    def upcoming(self, student, days, today=None):
+        """Невиконані завдання студента з дедлайном у найближчі days днів: список (дата, курс, ID уроку)"""
+        today = today or date.today()
+        end = today + timedelta(days=days)
+        result = []
+        for course, completed in self._enrolled(student):
+            for due, lesson_id in self.for_course(course).between(today, end):
+                if lesson_id not in completed:
+                    result.append((due, course, lesson_id))
+        result.sort(key=lambda item: (item[0], item[2]))
+        return result
+
+    def _pending(self, course, completed, today):
+        """Невиконані завдання курсу з дедлайном від today у порядку дат"""
+        for due, lesson_id in self.for_course(course).from_day(today):
+            if lesson_id not in completed:
+                yield due, lesson_id, course
+
+    def next_deadline(self, student, today=None):
+        """Найближчий дедлайн невиконаного завдання студента: (дата, курс, ID уроку) або None"""
+        today = today or date.today()
+        streams = [self._pending(course, completed, today) for course, completed in self._enrolled(student)]
+        first = next(heapq.merge(*streams, key=lambda item: (item[0], item[1])), None)
+        if first is None:
+            return None
+        due, lesson_id, course = first
+        return due, course, lesson_id
+
+    def overdue(self, course, today=None):
+        """Прострочені завдання курсу з ID студентів, що їх не виконали: список (дата, ID уроку, [ID студентів])"""
+        today = today or date.today()
+        course_completions = completions.for_course(course)
+        result = []
+        for due, lesson_id in self.for_course(course).before(today):
+            missing = course_completions.everyone & ~course_completions.bits(lesson_id)
+            if missing:
+                result.append((due, lesson_id, course_completions.student_ids(missing)))
+        return result
+
+    def clear(self):
+        """Скидає побудовані індекси курсів"""
+        self._courses.clear()
+
+
+deadlines = DeadlineIndex()
+
+
+def _task_title(lesson_id):
+    lesson = repository.get("lessons", lesson_id)
+    return lesson.title if lesson else f"ID {lesson_id}"
+
+
+def show_student_deadlines():
+    """Найближчий дедлайн студента та завдання з дедлайном у найближчі дні"""
+    from student import Student
+
+    print("\nДедлайни студента")
+    try:
+        student_id = int(input("Введіть ID студента: "))
+    except ValueError:
+        print("ID студента повинен бути числом")
+        return
+
+    student = Student.find_by_id(student_id)
+    if not student:
+        print("Студента з таким ID не знайдено")
+        return
+
+    days_input = input("За скільки днів показати завдання (за замовчуванням 7): ")
+    try:
+        days = int(days_input) if days_input.strip() else 7
+        if days < 0:
+            raise ValueError
+    except ValueError:
+        print("Кількість днів повинна бути невід'ємним числом")
+        return
+
+    upcoming = deadlines.next_deadline(student)
+    if upcoming is None:
+        print("Невиконаних завдань з майбутнім дедлайном немає")
+        return
+
+    due, course, lesson_id = upcoming
+    print(f"Найближчий дедлайн: {due.isoformat()} - {_task_title(lesson_id)} (курс '{course.title}')")
+
+    tasks = deadlines.upcoming(student, days)
+    if not tasks:
+        print(f"У найближчі {days} дн. дедлайнів немає")
+        return
+
+    print(f"\nЗавдання з дедлайном у найближчі {days} дн.:")
+    for i, (due, course, lesson_id) in enumerate(tasks, 1):
+        print(f"{i}. {due.isoformat()} - {_task_title(lesson_id)} (курс '{course.title}')")
+
+
+def show_overdue_tasks():
+    """Прострочені завдання курсу та кількість студентів, що їх не виконали"""
+    from courses import Course
+
+    print("\nПрострочені завдання курсу")
+    try:
+        course_id = int(input("Введіть ID курсу: "))
+    except ValueError:
+        print("ID курсу повинен бути числом")
+        return
+
+    course = Course.find_by_id(course_id)
+    if not course:
+        print("Курс з таким ID не знайдено")
+        return
+
+    overdue = deadlines.overdue(course)
+    if not overdue:
+        print("Прострочених невиконаних завдань немає")
+        return
+
+    print(f"\nКурс: {course.title}")
+    for i, (due, lesson_id, student_ids) in enumerate(overdue, 1):
+        print(f"{i}. {_task_title(lesson_id)} - дедлайн {due.isoformat()}")
+        print(f"   Не виконали: {len(student_ids)} з {len(course.enrolled_students)}")
@@ -0,0 +1,124 @@
+"""Атомарний запис файлів, політика fsync, формат серіалізації json та підрахунок прочитаних байтів"""
+import io
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+# always - fsync після кожного запису (і журналу, і знімків);
+# snapshots - лише для знімків та файлів, що замінюються цілком; never - без fsync
+FSYNC_POLICY = os.environ.get("COURSES_FSYNC", "always")
+# Компактний json (без відступів) менший і швидше записується
+COMPACT_JSON = os.environ.get("COURSES_COMPACT_JSON", "") == "1"
+
+FSYNC_POLICIES = ("always", "snapshots", "never")
+
+# Лічильник окремий для кожного потоку, щоб фонове ущільнення не зараховувалось операціям меню
+_reads = threading.local()
+
+
+def configure(fsync=None, compact=None):
+    """Змінює політику fsync та формат серіалізації під час роботи"""
+    global FSYNC_POLICY, COMPACT_JSON
+    if fsync is not None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Невідома політика fsync: {fsync}")
+        FSYNC_POLICY = fsync
+    if compact is not None:
+        COMPACT_JSON = compact
+
+
+def bytes_read():
+    """Скільки байтів файлів даних прочитав поточний потік (різниця значень - байти однієї операції)"""
+    return getattr(_reads, "total", 0)
+
+
+def count_read(size):
+    _reads.total = bytes_read() + size
+
+
+class _CountingFile(io.RawIOBase):
+    """Файл для читання, що додає кожен прочитаний з диска блок до count_read"""
+
+    def __init__(self, path):
+        super().__init__()
+        self._file = io.FileIO(path, "r")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = self._file.readinto(buffer)
+        if size:
+            count_read(size)
+        return size
+
+    def readall(self):
+        data = self._file.readall()
+        count_read(len(data))
+        return data
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_counted(path, binary=False):
+    """Відкриває файл для читання з підрахунком байтів; відсутній файл - FileNotFoundError, як у open"""
+    file = io.BufferedReader(_CountingFile(path))
+    return file if binary else io.TextIOWrapper(file, encoding="utf-8")
+
+
+def sync(file, snapshot=True):
+    """Скидає файл на диск відповідно до політики fsync"""
+    file.flush()
+    if FSYNC_POLICY == "always" or (FSYNC_POLICY == "snapshots" and snapshot):
+        os.fsync(file.fileno())
+
+
+def _sync_directory(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+@contextmanager
+def atomic_open(path):
+    """Відкриває тимчасовий файл, який після успішного запису атомарно замінює path"""
+    tmp_name = path + ".tmp"
+    try:
+        with open(tmp_name, "w", encoding="utf-8") as file:
+            yield file
+            sync(file)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+    if FSYNC_POLICY != "never":
+        _sync_directory(path)
+
+
+def dump_records(records, file):
+    """Пише json масив записів по одному, у компактному або форматованому вигляді"""
+    if COMPACT_JSON:
+        separator = "["
+        for record in records:
+            file.write(separator)
+            file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            separator = ","
+        file.write("[]" if separator == "[" else "]")
+        return
+
+    separator = "[\n"
+    for record in records:
+        file.write(separator)
+        file.write("  " + json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+        separator = ",\n"
+    file.write("[]" if separator == "[\n" else "\n]")
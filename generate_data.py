@@ -0,0 +1,203 @@
+"""Генератор синтетичних даних для вимірювань на великих обсягах
+
+Пише students.json, courses.json, lessons.json, lectures.json, tasks.json (та порожній
+submissions.json) у форматі системи. Кожен студент записується на курс з імовірністю
+--enrollment, а на кожному курсі завершує в середньому частку --completion уроків
+(уроки проходяться по порядку, як у реальному курсі).
+
+Використання:
+    python generate_data.py DIR [--students 10000] [--courses 50] [--lessons 10]
+                                [--enrollment 0.05] [--completion 0.5] [--task-ratio 0.3] [--seed 1] [--force]
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import sys
+from datetime import date, timedelta
+
+from fileio import atomic_open, dump_records
+
+DATA_FILES = ["students.json", "courses.json", "lessons.json", "lectures.json", "tasks.json", "submissions.json"]
+# Похідні файли попередніх даних у каталозі: після генерації вони були б застарілими
+DERIVED_FILES = ["journal.jsonl", "journal.jsonl.old", "sequences.json", "versions.json",
+                 "search_index.json", "search_index.jsonl",
+                 "students.idx", "students.strings", "students.progress"] + [name + ".cache" for name in DATA_FILES]
+# Похідні каталоги: сегменти та індекс журналу рішень (solution_log)
+DERIVED_DIRS = ["solutions"]
+
+FIRST_NAMES = ["Олена", "Іван", "Марія", "Андрій", "Оксана", "Петро", "Наталія", "Юрій", "Софія", "Тарас",
+               "Ірина", "Богдан", "Катерина", "Дмитро", "Ганна", "Олег"]
+LAST_NAMES = ["Шевченко", "Коваленко", "Бондаренко", "Ткаченко", "Кравченко", "Олійник", "Мельник",
+              "Гринюк", "Петренко", "Савченко", "Руденко", "Лисенко", "Мороз", "Павленко"]
+TOPICS = ["Python", "алгоритми", "бази даних", "мережі", "історія України", "математика", "дизайн", "статистика"]
+
+
+def _sample_positions(rng, count, probability):
+    """Позиції з range(count), кожна вибрана з імовірністю probability (геометричні пропуски, O(вибраних))"""
+    if probability <= 0:
+        return []
+    if probability >= 1:
+        return list(range(count))
+    positions = []
+    position = -1
+    log_miss = math.log(1 - probability)
+    while True:
+        position += 1 + int(math.log(1 - rng.random()) / log_miss)
+        if position >= count:
+            return positions
+        positions.append(position)
+
+
+def generate(directory, students=10000, courses=50, lessons=10, enrollment=0.05, completion=0.5,
+             task_ratio=0.3, seed=1):
+    """Пише файли даних у каталог; повертає кількість записів кожного типу"""
+    if not 0 <= enrollment <= 1 or not 0 <= completion <= 1 or not 0 <= task_ratio <= 1:
+        raise ValueError("Щільності повинні бути в межах від 0 до 1")
+    if students < 0 or courses < 0 or lessons < 0:
+        raise ValueError("Кількості не можуть бути від'ємними")
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    today = date.today()
+
+    # Уроки курсу c мають ID від c * lessons + 1; тип і дедлайн визначаються наперед
+    lesson_types = ["task" if rng.random() < task_ratio else "lecture" for _ in range(courses * lessons)]
+
+    enrolled_students = [[] for _ in range(courses)]
+    enrollments = []
+    for student_id in range(1, students + 1):
+        chosen = []
+        for course_index in _sample_positions(rng, courses, enrollment):
+            done = min(lessons, int(rng.random() * 2 * completion * lessons + 0.5))
+            chosen.append((course_index, done))
+            enrolled_students[course_index].append(str(student_id))
+        enrollments.append(chosen)
+
+    def student_records():
+        for student_id, chosen in enumerate(enrollments, 1):
+            progress = {}
+            for course_index, done in chosen:
+                first = course_index * lessons + 1
+                progress[str(course_index + 1)] = {
+                    "completed_lessons": [str(lesson_id) for lesson_id in range(first, first + done)],
+                    "overall_progress": round(done / lessons * 100) if lessons else 0
+                }
+            yield {
+                "student_id": student_id,
+                "first_name": FIRST_NAMES[student_id % len(FIRST_NAMES)],
+                "last_name": LAST_NAMES[(student_id // len(FIRST_NAMES)) % len(LAST_NAMES)],
+                "email": f"student{student_id}@example.com",
+                "phone": None,
+                "enrolled_courses": [str(course_index + 1) for course_index, _ in chosen],
+                "progress": progress
+            }
+
+    def course_records():
+        for course_index in range(courses):
+            first = course_index * lessons + 1
+            yield {
+                "course_id": course_index + 1,
+                "title": f"Курс {course_index + 1}: {TOPICS[course_index % len(TOPICS)]}",
+                "description": f"Вступ до теми {TOPICS[course_index % len(TOPICS)]}",
+                "author": " ".join((FIRST_NAMES[course_index % len(FIRST_NAMES)],
+                                    LAST_NAMES[course_index % len(LAST_NAMES)])),
+                "lessons": [str(lesson_id) for lesson_id in range(first, first + lessons)],
+                "enrolled_students": enrolled_students[course_index]
+            }
+
+    def lesson_records():
+        for index, lesson_type in enumerate(lesson_types):
+            name = "Лекція" if lesson_type == "lecture" else "Завдання"
+            yield {
+                "lesson_id": index + 1,
+                "title": f"{name} {index % lessons + 1}",
+                "description": f"{name} про {TOPICS[index % len(TOPICS)]}",
+                "type": lesson_type
+            }
+
+    def lecture_records():
+        for index, lesson_type in enumerate(lesson_types):
+            if lesson_type == "lecture":
+                yield {
+                    "lesson_id": index + 1,
+                    "content": f"Матеріал лекції про {TOPICS[index % len(TOPICS)]}",
+                    "duration": 15 + index % 4 * 15,
+                    "video_url": None
+                }
+
+    deadline_rng = random.Random(seed + 1)
+
+    def task_records():
+        for index, lesson_type in enumerate(lesson_types):
+            if lesson_type == "task":
+                deadline = today + timedelta(days=deadline_rng.randint(-30, 60))
+                yield {
+                    "lesson_id": index + 1,
+                    "description": f"Практичне завдання про {TOPICS[index % len(TOPICS)]}",
+                    "max_score": 10,
+                    "deadline": deadline.isoformat()
+                }
+
+    counts = {}
+    for file_name, records in (("students.json", student_records()), ("courses.json", course_records()),
+                               ("lessons.json", lesson_records()), ("lectures.json", lecture_records()),
+                               ("tasks.json", task_records()), ("submissions.json", iter(()))):
+        counted = _Counted(records)
+        with atomic_open(os.path.join(directory, file_name)) as file:
+            dump_records(counted, file)
+        counts[file_name[:-5]] = counted.count
+
+    for file_name in DERIVED_FILES:
+        path = os.path.join(directory, file_name)
+        if os.path.exists(path):
+            os.remove(path)
+    for dir_name in DERIVED_DIRS:
+        shutil.rmtree(os.path.join(directory, dir_name), ignore_errors=True)
+    return counts
+
+
+class _Counted:
+    """Ітератор, що рахує видані записи"""
+
+    def __init__(self, records):
+        self._records = records
+        self.count = 0
+
+    def __iter__(self):
+        for record in self._records:
+            self.count += 1
+            yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерація синтетичних даних системи онлайн-курсів")
+    parser.add_argument("directory", help="каталог для файлів даних")
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--lessons", type=int, default=10, help="уроків на курс")
+    parser.add_argument("--enrollment", type=float, default=0.05, help="імовірність запису студента на курс")
+    parser.add_argument("--completion", type=float, default=0.5, help="середня частка завершених уроків курсу")
+    parser.add_argument("--task-ratio", type=float, default=0.3, help="частка завдань серед уроків")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="перезаписати наявні файли даних")
+    args = parser.parse_args()
+
+    existing = [name for name in DATA_FILES if os.path.exists(os.path.join(args.directory, name))]
+    if existing and not args.force:
+        print(f"У каталозі вже є файли даних ({', '.join(existing)}); додайте --force, щоб перезаписати")
+        return 1
+
+    try:
+        counts = generate(args.directory, args.students, args.courses, args.lessons, args.enrollment,
+                          args.completion, args.task_ratio, args.seed)
+    except ValueError as error:
+        print(error)
+        return 1
+    print(", ".join(f"{kind}: {count}" for kind, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Автоматична перевірка рішень завдань тестами в пулі процесів
+
+Кожне рішення (програма Python) запускається окремим процесом для кожного тесту:
+вхідні дані тесту подаються в stdin, а stdout порівнюється з очікуваним результатом.
+Процес обмежено за часом (таймаут) та пам'яттю (RLIMIT_AS, де доступно).
+Це ізоляція від зависань і перевитрати пам'яті, а не пісочниця для ворожого коду.
+
+Використання:
+    python grader.py [--workers N] [--timeout 2] [--memory-mb 256]   перевірити всі рішення в черзі
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from repository import repository
+
+TIME_LIMIT = 2.0
+MEMORY_LIMIT_MB = 256
+
+# Обмеження встановлюється в самому дочірньому процесі перед запуском рішення
+RUNNER = """
+import runpy, sys
+limit = int(sys.argv[1])
+try:
+    import resource
+except ImportError:
+    resource = None
+if resource is not None and limit:
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+sys.argv = sys.argv[2:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def run_tests(solution, tests, timeout=TIME_LIMIT, memory_mb=MEMORY_LIMIT_MB):
+    """Запускає рішення на тестах; повертає (пройдено, всього, відгук про першу помилку)"""
+    passed = 0
+    feedback = None
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "solution.py")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(solution)
+
+        command = [sys.executable, "-I", "-c", RUNNER, str(memory_mb * 1024 * 1024), path]
+        for number, test in enumerate(tests, 1):
+            try:
+                result = subprocess.run(command, input=test.get("input", ""), capture_output=True, text=True,
+                                        timeout=timeout, cwd=directory)
+            except subprocess.TimeoutExpired:
+                error = "перевищено час виконання"
+            else:
+                if result.returncode != 0:
+                    error = "помилка виконання"
+                elif result.stdout.strip() != test["expected"].strip():
+                    error = "неправильна відповідь"
+                else:
+                    passed += 1
+                    continue
+            if feedback is None:
+                feedback = f"Тест {number}: {error}"
+    return passed, len(tests), feedback
+
+
+def _run_job(job):
+    submission_id, solution, tests, timeout, memory_mb = job
+    return submission_id, run_tests(solution, tests, timeout, memory_mb)
+
+
+def apply_result(submission, passed, total, feedback):
+    """Записує бал у рішення та прогрес студента; завдання зараховується, коли пройдено всі тести"""
+    from student import Student
+
+    task = repository.get("tasks", submission.lesson_id)
+    score = round(task.max_score * passed / total) if task and total else 0
+    submission.record_result(passed, total, score, feedback)
+
+    student = Student.find_by_id(submission.student_id)
+    if student:
+        student.record_score(submission.course_id, submission.lesson_id, score)
+        if total and passed == total:
+            student.update_progress(submission.course_id, submission.lesson_id)
+    return score
+
+
+def grade(submissions, workers=None, timeout=TIME_LIMIT, memory_mb=MEMORY_LIMIT_MB):
+    """Перевіряє рішення паралельно (за замовчуванням - по процесу на ядро); повертає кількість перевірених"""
+    jobs = []
+    by_id = {}
+    for submission in submissions:
+        task = repository.get("tasks", submission.lesson_id)
+        tests = task.tests if task else []
+        jobs.append((submission.submission_id, submission.solution, tests, timeout, memory_mb))
+        by_id[submission.submission_id] = submission
+
+    if not jobs:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) == 1 or workers == 1:
+        for submission_id, (passed, total, feedback) in map(_run_job, jobs):
+            apply_result(by_id[submission_id], passed, total, feedback)
+        return len(jobs)
+
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for submission_id, (passed, total, feedback) in executor.map(_run_job, jobs, chunksize=chunksize):
+            apply_result(by_id[submission_id], passed, total, feedback)
+    return len(jobs)
+
+
+def grade_pending(workers=None, timeout=TIME_LIMIT, memory_mb=MEMORY_LIMIT_MB):
+    """Перевіряє всі рішення, що очікують у черзі"""
+    from submission import Submission
+
+    return grade(Submission.pending(), workers, timeout, memory_mb)
+
+
+def main():
+    import time
+    from main import initialize_files
+    from storage import backend
+
+    parser = argparse.ArgumentParser(description="Автоматична перевірка рішень у черзі")
+    parser.add_argument("--workers", type=int, default=None, help="кількість процесів (за замовчуванням - ядра)")
+    parser.add_argument("--timeout", type=float, default=TIME_LIMIT, help="секунд на один тест")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_LIMIT_MB, help="обмеження пам'яті на процес")
+    args = parser.parse_args()
+
+    initialize_files()
+    started = time.perf_counter()
+    count = grade_pending(args.workers, args.timeout, args.memory_mb)
+    repository.flush()
+    backend.wait()
+    print(f"Перевірено рішень: {count} за {time.perf_counter() - started:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
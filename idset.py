@@ -0,0 +1,70 @@
+"""Компактна впорядкована множина цілих ID"""
+from array import array
+
+INDEX_THRESHOLD = 16
+
+
+class IdSet:
+    """Малі множини зберігаються кортежем; великі - масивом int64 зі словником позицій"""
+
+    __slots__ = ("_ids", "_positions")
+
+    def __init__(self, ids=()):
+        # dict.fromkeys прибирає повтори зі збереженням порядку без поелементного add (швидше при завантаженні)
+        unique = tuple(dict.fromkeys(ids))
+        if len(unique) <= INDEX_THRESHOLD:
+            self._ids = unique
+            self._positions = None
+        else:
+            self._ids = array("q", unique)
+            self._positions = {value: position for position, value in enumerate(unique)}
+
+    def add(self, id_):
+        """Додає ID, якщо його ще немає; повертає True, якщо множина змінилась"""
+        if id_ in self:
+            return False
+        if self._positions is not None:
+            self._positions[id_] = len(self._ids)
+            self._ids.append(id_)
+        elif len(self._ids) < INDEX_THRESHOLD:
+            self._ids += (id_,)
+        else:
+            self._ids = array("q", self._ids)
+            self._ids.append(id_)
+            self._positions = {value: position for position, value in enumerate(self._ids)}
+        return True
+
+    def position(self, id_):
+        """Позиція ID у порядку додавання або None"""
+        if self._positions is not None:
+            return self._positions.get(id_)
+        try:
+            return self._ids.index(id_)
+        except ValueError:
+            return None
+
+    def __contains__(self, id_):
+        if self._positions is not None:
+            return id_ in self._positions
+        return id_ in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, position):
+        return self._ids[position]
+
+    def __eq__(self, other):
+        if isinstance(other, IdSet):
+            return list(self._ids) == list(other._ids)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"IdSet({list(self._ids)})"
+
+    def to_strings(self):
+        """Список рядків для збереження у json (зворотна сумісність формату)"""
+        return [str(id_) for id_ in self._ids]
@@ -0,0 +1,229 @@
+"""Статистика вводу-виводу сховища з прив'язкою до операцій меню
+
+Усі load_* сутностей і журнал репозиторію читають і пишуть через storage.backend, тож лічильники
+збираються обгорткою навколо сховища: кількість викликів, записів, байтів, час розбору
+(читання) та серіалізації (запис разом зі збереженням на диск). Прочитані байти - це
+фактично прочитане з файлів даних (fileio.bytes_read), тож потоковий перебір, зупинений
+на першій сторінці, не рахується як читання всього файлу. Кожен виклик зараховується
+операції, що виконується в цей момент (io_stats.operation).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from fileio import bytes_read
+
+OUTSIDE = "Поза операціями"
+JOURNAL_KIND = "journal"
+
+
+class IoCounters:
+    """Лічильники одного типу сутностей в одній операції"""
+
+    __slots__ = ("loads", "saves", "records_read", "records_written", "bytes_read", "bytes_written",
+                 "parse_seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.loads = 0
+        self.saves = 0
+        self.records_read = 0
+        self.records_written = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.parse_seconds = 0.0
+        self.serialize_seconds = 0.0
+
+    def to_dict(self):
+        """Перетворення об'єкта в словник"""
+        return {
+            "loads": self.loads,
+            "saves": self.saves,
+            "records_read": self.records_read,
+            "records_written": self.records_written,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "parse_ms": round(self.parse_seconds * 1000, 3),
+            "serialize_ms": round(self.serialize_seconds * 1000, 3)
+        }
+
+
+class IoStats:
+    """Накопичує лічильники {операція: {тип: IoCounters}} та кількість запусків операцій"""
+
+    def __init__(self):
+        # Поточна операція окрема для кожного потоку (сервер зберігає зміни у фоновому потоці)
+        self._local = threading.local()
+        self._operations = {}
+        self._runs = {}
+
+    @property
+    def _current(self):
+        return getattr(self._local, "operation", OUTSIDE)
+
+    @contextmanager
+    def operation(self, name):
+        """Зараховує весь ввід-вивід поточного потоку усередині блоку операції name"""
+        previous, self._local.operation = self._current, name
+        self._runs[name] = self._runs.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            self._local.operation = previous
+
+    def _counters(self, kind):
+        kinds = self._operations.setdefault(self._current, {})
+        counters = kinds.get(kind)
+        if counters is None:
+            counters = kinds[kind] = IoCounters()
+        return counters
+
+    def record_load(self, kind, seconds, records, size):
+        counters = self._counters(kind)
+        counters.loads += 1
+        counters.records_read += records
+        counters.bytes_read += size
+        counters.parse_seconds += seconds
+
+    def record_save(self, kind, seconds, records, size):
+        counters = self._counters(kind)
+        counters.saves += 1
+        counters.records_written += records
+        counters.bytes_written += size
+        counters.serialize_seconds += seconds
+
+    def reset(self):
+        self._operations.clear()
+        self._runs.clear()
+
+    def to_dict(self):
+        """Статистика для експорту: по операціях, з підсумком і розбивкою за типами"""
+        operations = {}
+        for name, kinds in self._operations.items():
+            total = IoCounters()
+            for counters in kinds.values():
+                for field in IoCounters.__slots__:
+                    setattr(total, field, getattr(total, field) + getattr(counters, field))
+            operations[name] = {
+                "runs": self._runs.get(name, 0),
+                "total": total.to_dict(),
+                "kinds": {kind: counters.to_dict() for kind, counters in kinds.items()}
+            }
+        return {"operations": operations}
+
+    def export(self, path):
+        """Зберігає статистику у json файл"""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+
+io_stats = IoStats()
+
+
+class InstrumentedBackend:
+    """Обгортка сховища: передає виклики далі та записує їх у io_stats"""
+
+    def __init__(self, backend, stats=io_stats):
+        self._backend = backend
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def _load(self, kind, load, *args):
+        read_before = bytes_read()
+        started = time.perf_counter()
+        result = load(kind, *args)
+        seconds = time.perf_counter() - started
+        records = len(result) if isinstance(result, list) else int(result is not None)
+        self._stats.record_load(kind, seconds, records, bytes_read() - read_before)
+        return result
+
+    def load_records(self, kind):
+        return self._load(kind, self._backend.load_records)
+
+    def load_objects(self, kind, from_dict):
+        return self._load(kind, self._backend.load_objects, from_dict)
+
+    def load_record(self, kind, key):
+        return self._load(kind, self._backend.load_record, key)
+
+    def max_id(self, kind, id_field):
+        read_before = bytes_read()
+        started = time.perf_counter()
+        result = self._backend.max_id(kind, id_field)
+        self._stats.record_load(kind, time.perf_counter() - started, 0, bytes_read() - read_before)
+        return result
+
+    def find_student_id(self, email):
+        read_before = bytes_read()
+        started = time.perf_counter()
+        result = self._backend.find_student_id(email)
+        self._stats.record_load("students", time.perf_counter() - started, int(result is not None),
+                                bytes_read() - read_before)
+        return result
+
+    def iter_records(self, kind):
+        """Потоковий перебір: час і байти рахуються лише під час читання записів, а не їх обробки"""
+        seconds = 0.0
+        records = 0
+        size = 0
+        iterator = iter(self._backend.iter_records(kind))
+        try:
+            while True:
+                read_before = bytes_read()
+                started = time.perf_counter()
+                try:
+                    record = next(iterator)
+                except StopIteration:
+                    seconds += time.perf_counter() - started
+                    size += bytes_read() - read_before
+                    return
+                seconds += time.perf_counter() - started
+                size += bytes_read() - read_before
+                records += 1
+                yield record
+        finally:
+            self._stats.record_load(kind, seconds, records, size)
+
+    def append(self, entries):
+        if not entries:
+            return self._backend.append(entries)
+        size = getattr(self._backend, "size", None)
+        before = size() if size else 0
+        started = time.perf_counter()
+        result = self._backend.append(entries)
+        seconds = time.perf_counter() - started
+        self._stats.record_save(JOURNAL_KIND, seconds, len(entries), max(0, size() - before) if size else 0)
+        return result
+
+
+def show_diagnostics():
+    """Таблиця вводу-виводу за операціями з можливістю експорту в JSON"""
+    print("\nДіагностика вводу-виводу")
+    operations = io_stats.to_dict()["operations"]
+    if not operations:
+        print("Ще не було жодного читання чи запису даних")
+        return
+
+    print(f"{'Операція':<32}{'Запусків':>9}{'Читань':>8}{'Записів':>9}{'Об. чит.':>10}{'Об. зап.':>10}"
+          f"{'КБ чит.':>10}{'КБ зап.':>10}{'Розбір, мс':>12}{'Запис, мс':>12}")
+    for name, operation in sorted(operations.items(), key=lambda item: -item[1]["total"]["parse_ms"]):
+        total = operation["total"]
+        print(f"{name[:31]:<32}{operation['runs']:>9}{total['loads']:>8}{total['saves']:>9}"
+              f"{total['records_read']:>10}{total['records_written']:>10}"
+              f"{total['bytes_read'] / 1024:>10.1f}{total['bytes_written'] / 1024:>10.1f}"
+              f"{total['parse_ms']:>12.2f}{total['serialize_ms']:>12.2f}")
+        for kind, counters in operation["kinds"].items():
+            print(f"   {kind}: читань {counters['loads']}, записів {counters['saves']}, "
+                  f"об'єктів {counters['records_read']}/{counters['records_written']}")
+
+    path = input("\nФайл для експорту в JSON (Enter - пропустити): ").strip()
+    if path:
+        try:
+            io_stats.export(path)
+        except OSError as error:
+            print(f"Не вдалося зберегти статистику: {error}")
+            return
+        print(f"Статистику збережено у {os.path.abspath(path)}")
@@ -0,0 +1,373 @@
+"""Журнал змін (JSONL) поверх знімків json файлів з фоновим ущільненням"""
+import json
+import os
+import threading
+from locking import DataLock
+from fileio import atomic_open, dump_records, open_counted, sync
+import snapshot_cache
+
+JOURNAL_FILE = "journal.jsonl"
+COMPACT_THRESHOLD = 1024 * 1024
+READ_CHUNK = 64 * 1024
+
+SNAPSHOTS = {
+    "students": ("students.json", "student_id"),
+    "courses": ("courses.json", "course_id"),
+    "lessons": ("lessons.json", "lesson_id"),
+    "lectures": ("lectures.json", "lesson_id"),
+    "tasks": ("tasks.json", "lesson_id"),
+    "submissions": ("submissions.json", "submission_id"),
+}
+
+
+def read_snapshot(kind):
+    """Читає знімок сутностей з json файлу; пошкоджений файл - помилка, а не порожній список"""
+    file_name, _ = SNAPSHOTS[kind]
+    try:
+        with open_counted(file_name) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as error:
+        raise ValueError(f"Файл {file_name} пошкоджено: {error}") from error
+
+
+def open_snapshot(kind):
+    """Відкриває файл знімка для читання або повертає None, якщо його немає
+
+    Знімок замінюється атомарно (os.replace), тож відкритий файл лишається тією версією,
+    що була на момент відкриття, навіть якщо його замінять під час читання.
+    """
+    file_name, _ = SNAPSHOTS[kind]
+    try:
+        return open_counted(file_name)
+    except FileNotFoundError:
+        return None
+
+
+def iter_snapshot(kind, file=None, chunk_size=READ_CHUNK):
+    """Потоково читає записи знімка по одному, не завантажуючи весь файл; file - уже відкритий знімок"""
+    file_name, _ = SNAPSHOTS[kind]
+    decoder = json.JSONDecoder()
+    if file is None:
+        file = open_snapshot(kind)
+        if file is None:
+            return
+
+    with file:
+        buffer = file.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"Файл {file_name} пошкоджено: очікувався json масив")
+        position = 1
+        eof = False
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if eof:
+                    raise ValueError(f"Файл {file_name} пошкоджено: {error}") from error
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield record
+
+
+def write_snapshot(kind, records):
+    """Атомарно записує знімок сутностей (тимчасовий файл + os.replace), по одному запису"""
+    file_name, _ = SNAPSHOTS[kind]
+    with atomic_open(file_name) as file:
+        dump_records(records, file)
+
+
+def apply_entry(records, entry):
+    """Застосовує один запис журналу до словника {id: запис}"""
+    op = entry["op"]
+
+    if op == "put":
+        _, id_field = SNAPSHOTS[entry["kind"]]
+        record = entry["record"]
+        records[record[id_field]] = record
+        return
+
+    if op == "enroll":
+        student = records.get(entry["student_id"])
+        course_id = str(entry["course_id"])
+        if student is not None and course_id not in student["enrolled_courses"]:
+            student["enrolled_courses"].append(course_id)
+            student["progress"][course_id] = {"completed_lessons": [], "overall_progress": 0}
+
+    elif op == "progress_update":
+        student = records.get(entry["student_id"])
+        if student is not None:
+            progress = student["progress"].get(str(entry["course_id"]))
+            if progress is not None:
+                lesson_id = str(entry["lesson_id"])
+                if lesson_id not in progress["completed_lessons"]:
+                    progress["completed_lessons"].append(lesson_id)
+                progress["overall_progress"] = entry["overall_progress"]
+
+    elif op == "score_set":
+        student = records.get(entry["student_id"])
+        if student is not None:
+            progress = student["progress"].get(str(entry["course_id"]))
+            if progress is not None:
+                progress.setdefault("scores", {})[str(entry["lesson_id"])] = entry["score"]
+
+    elif op == "progress_set":
+        student = records.get(entry["student_id"])
+        if student is not None:
+            progress = student["progress"].get(str(entry["course_id"]))
+            if progress is not None:
+                progress["overall_progress"] = entry["overall_progress"]
+
+    elif op in ("add_student", "add_lesson"):
+        course = records.get(entry["course_id"])
+        if op == "add_student":
+            field, value = "enrolled_students", str(entry["student_id"])
+        else:
+            field, value = "lessons", str(entry["lesson_id"])
+        if course is not None and value not in course[field]:
+            course[field].append(value)
+
+
+def entry_key(entry):
+    """ID запису, якого стосується запис журналу"""
+    op = entry["op"]
+    if op == "put":
+        _, id_field = SNAPSHOTS[entry["kind"]]
+        return entry["record"][id_field]
+    if op in ("enroll", "progress_update", "progress_set", "score_set"):
+        return entry["student_id"]
+    return entry["course_id"]
+
+
+def _read_entries(path, repair=False):
+    """Читає записи журналу; обрізаний хвіст відкидається (і видаляється при repair)"""
+    try:
+        with open_counted(path, binary=True) as file:
+            data = file.read()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    offset = 0
+    while offset < len(data):
+        end = data.find(b"\n", offset)
+        if end == -1:
+            break
+        try:
+            entries.append(json.loads(data[offset:end]))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            break
+        offset = end + 1
+
+    if repair and offset < len(data):
+        with open(path, "r+b") as file:
+            file.truncate(offset)
+    return entries
+
+
+class Journal:
+    """Журнал мутацій: O(1) дозапис, відтворення при завантаженні та ущільнення"""
+
+    def __init__(self, path=JOURNAL_FILE, threshold=COMPACT_THRESHOLD, lock=None):
+        self.path = path
+        self.threshold = threshold
+        self._lock = lock or DataLock()
+        self._compactor = None
+        # Функції from_dict типів, уже завантажених як об'єкти: потрібні, щоб перебудувати кеш після запису знімка
+        self._factories = {}
+
+    @property
+    def rotated_path(self):
+        return self.path + ".old"
+
+    def _entries(self, kind):
+        entries = _read_entries(self.rotated_path) + _read_entries(self.path, repair=True)
+        return [entry for entry in entries if entry["kind"] == kind]
+
+    def is_indexed(self, kind):
+        """json файли читаються лише цілком"""
+        return False
+
+    def load_records(self, kind):
+        """Повертає записи сутностей: останній знімок плюс журнал"""
+        with self._lock.shared():
+            snapshot = read_snapshot(kind)
+            entries = self._entries(kind)
+
+        _, id_field = SNAPSHOTS[kind]
+        records = {record[id_field]: record for record in snapshot}
+        for entry in entries:
+            apply_entry(records, entry)
+        return list(records.values())
+
+    def load_objects(self, kind, from_dict):
+        """Повертає об'єкти сутностей: знімок з двійкового кешу (або з json з побудовою кешу) плюс журнал"""
+        file_name, id_field = SNAPSHOTS[kind]
+        self._factories[kind] = from_dict
+        with self._lock.shared():
+            objects = snapshot_cache.load(file_name)
+            if objects is None:
+                records = read_snapshot(kind)
+                signature = snapshot_cache.signature(file_name)
+            entries = self._entries(kind)
+        if objects is None:
+            objects = snapshot_cache.build(records, from_dict)
+            snapshot_cache.store(file_name, objects, signature)
+
+        if not entries:
+            return objects
+        pending = {}
+        for entry in entries:
+            pending.setdefault(entry_key(entry), []).append(entry)
+
+        # Журнал накладається лише на змінені об'єкти: їх стан перетворюється в запис і назад
+        objects = {getattr(obj, id_field): obj for obj in objects}
+        for key, key_entries in pending.items():
+            records = {key: objects[key].to_dict()} if key in objects else {}
+            for entry in key_entries:
+                apply_entry(records, entry)
+            if key in records:
+                objects[key] = from_dict(records[key])
+        return list(objects.values())
+
+    def iter_records(self, kind):
+        """Потоково повертає записи: знімок читається по одному, журнал накладається на льоту"""
+        with self._lock.shared():
+            pending = {}
+            for entry in self._entries(kind):
+                pending.setdefault(entry_key(entry), []).append(entry)
+            # Файл відкривається під блокуванням, щоб знімок відповідав прочитаному журналу
+            file = open_snapshot(kind)
+        snapshot = iter_snapshot(kind, file) if file is not None else ()
+
+        _, id_field = SNAPSHOTS[kind]
+        for record in snapshot:
+            key = record[id_field]
+            if key not in pending:
+                yield record
+                continue
+            records = {key: record}
+            for entry in pending.pop(key):
+                apply_entry(records, entry)
+            yield records[key]
+
+        for key, entries in pending.items():
+            records = {}
+            for entry in entries:
+                apply_entry(records, entry)
+            if key in records:
+                yield records[key]
+
+    def load_record(self, kind, key):
+        """Пошук одного запису; json файли доводиться читати повністю"""
+        _, id_field = SNAPSHOTS[kind]
+        for record in self.load_records(kind):
+            if record[id_field] == key:
+                return record
+        return None
+
+    def max_id(self, kind, id_field):
+        """Найбільший збережений ID заданого типу"""
+        return max((record[id_field] for record in self.load_records(kind)), default=0)
+
+    def find_student_id(self, email):
+        """Пошук ID студента за електронною поштою (без урахування регістру)"""
+        for record in self.load_records("students"):
+            if record["email"].lower() == email.lower():
+                return record["student_id"]
+        return None
+
+    def write_snapshot(self, kind, records):
+        """Записує знімок сутностей"""
+        write_snapshot(kind, records)
+        self._rebuild_cache(kind, records, snapshot_cache.signature(SNAPSHOTS[kind][0]))
+
+    def _rebuild_cache(self, kind, records, signature):
+        """Будує кеш щойно записаного знімка; потоковий запис чи ще не завантажений тип лише скидає кеш"""
+        file_name, _ = SNAPSHOTS[kind]
+        from_dict = self._factories.get(kind)
+        if from_dict is not None and isinstance(records, list):
+            snapshot_cache.store(file_name, snapshot_cache.build(records, from_dict), signature)
+        else:
+            snapshot_cache.discard(file_name)
+
+    def discard(self):
+        """Видаляє журнал, коли знімки вже містять увесь стан"""
+        self.wait()
+        for path in (self.path, self.rotated_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def append(self, entries):
+        """Дописує записи в кінець журналу одним записом"""
+        if not entries:
+            return
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self._lock.exclusive(), open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+            sync(file, snapshot=False)
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def maybe_compact(self):
+        """Запускає фонове ущільнення, коли журнал перевищив поріг"""
+        if self.size() >= self.threshold:
+            self.compact(background=True)
+
+    def compact(self, background=False):
+        """Згортає журнал у знімки json файлів"""
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        with self._lock.exclusive():
+            if not os.path.exists(self.rotated_path):
+                if not os.path.exists(self.path):
+                    return
+                os.replace(self.path, self.rotated_path)
+
+        if background:
+            self._compactor = threading.Thread(target=self._fold_rotated)
+            self._compactor.start()
+        else:
+            self._fold_rotated()
+
+    def _fold_rotated(self):
+        # Згортання йде під виключним блокуванням: інший процес міг уже згорнути той самий файл
+        written = []
+        with self._lock.exclusive():
+            if not os.path.exists(self.rotated_path):
+                return
+            entries = _read_entries(self.rotated_path)
+            for kind, (file_name, id_field) in SNAPSHOTS.items():
+                kind_entries = [entry for entry in entries if entry["kind"] == kind]
+                if not kind_entries:
+                    continue
+                records = {record[id_field]: record for record in read_snapshot(kind)}
+                for entry in kind_entries:
+                    apply_entry(records, entry)
+                records = list(records.values())
+                write_snapshot(kind, records)
+                written.append((kind, records, snapshot_cache.signature(file_name)))
+            os.remove(self.rotated_path)
+
+        # Кеші будуються вже без блокування, щоб не затримувати збереження інших сесій
+        for kind, records, signature in written:
+            self._rebuild_cache(kind, records, signature)
+
+    def wait(self):
+        """Очікує завершення фонового ущільнення"""
+        if self._compactor is not None:
+            self._compactor.join()
+
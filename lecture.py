@@ -1,11 +1,16 @@
-import json
 from validators import validate_title, validate_content
 from lesson import Lesson
+from repository import repository
+from storage import backend
+from search import search_index
+import pagination
 
 
 class Lecture:
     """Клас для керування лекціями в системі онлайн-курсів"""
 
+    __slots__ = ("lesson_id", "content", "duration", "video_url")
+
     def __init__(self, lesson_id, content, duration, video_url=None):
         """Ініціалізація нової лекції з базовими атрибутами"""
         self.lesson_id = lesson_id
@@ -35,53 +40,60 @@ class Lecture:
     @staticmethod
     def load_lectures():
         """Завантаження всіх лекцій з файлу json"""
-        try:
-            with open("lectures.json", "r", encoding="utf-8") as file:
-                lectures_data = json.load(file)
-                lectures = []
-                for lecture_dict in lectures_data:
-                    lectures.append(Lecture.from_dict(lecture_dict))
-                return lectures
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return backend.load_objects("lectures", Lecture.from_dict)
 
     @staticmethod
-    def save_lectures(lectures):
-        """Збереження списку лекцій у json файл"""
-        lectures_data = [lecture.to_dict() for lecture in lectures]
-        with open("lectures.json", "w", encoding="utf-8") as file:
-            json.dump(lectures_data, file, ensure_ascii=False, indent=2)
+    def iter_lectures():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("lectures")
+
+    @staticmethod
+    def create(course_id, title, description, content, duration, video_url=None):
+        """Додавання лекції до курсу без діалогу; при помилці кидає ValueError"""
+        from courses import Course
+
+        course = Course.find_by_id(course_id)
+        if not course:
+            raise ValueError("Курс з таким ID не знайдено")
+
+        if duration <= 0:
+            raise ValueError("Тривалість повинна бути більше нуля")
+
+        # Валідація введених даних
+        if not validate_title(title):
+            raise ValueError("Назва лекції не може бути порожньою")
+
+        if not validate_content(content):
+            raise ValueError("Вміст лекції не може бути порожнім")
+
+        # Створюємо новий урок і лекцію
+        new_lesson = Lesson.create(title, description, "lecture")
+        new_lecture = Lecture(new_lesson.lesson_id, content, duration, video_url if video_url else None)
+        repository.add("lectures", new_lecture)
+
+        # Додаємо лекцію до курсу
+        if not course.add_lesson(new_lesson.lesson_id):
+            raise ValueError("Помилка при додаванні лекції до курсу")
+        search_index.update_lesson(new_lesson, course_id, lecture=new_lecture)
+        return new_lecture
 
     @staticmethod
     def add_to_course():
         """Додавання нової лекції до курсу"""
-        from course import Course
-
         print("\nДодавання лекції до курсу")
 
+        from courses import Course
+
         # Перевіряємо наявність курсів
-        courses = Course.load_courses()
-        if not courses:
+        if not pagination.count("courses"):
             print("Немає доступних курсів. Спочатку створіть курс.")
             return
 
-        # Виводимо список доступних курсів
-        print("\nДоступні курси:")
-        for idx, course in enumerate(courses, 1):
-            print(f"{idx}. {course.title} (ID: {course.course_id})")
-
-        # Обираємо курс
-        try:
-            course_idx = int(input("\nВиберіть номер курсу: ")) - 1
-            if course_idx < 0 or course_idx >= len(courses):
-                print("Невірний вибір курсу")
-                return
-        except ValueError:
-            print("Введіть числове значення")
+        # Обираємо курс зі списку доступних (посторінково)
+        course = Course.choose_course()
+        if not course:
             return
 
-        course = courses[course_idx]
-
         # Збираємо дані для створення лекції
         title = input("Введіть назву лекції: ")
         description = input("Введіть короткий опис лекції: ")
@@ -98,30 +110,10 @@ class Lecture:
 
         video_url = input("Введіть URL відео (необов'язково): ")
 
-        # Валідація введених даних
-        if not validate_title(title):
-            print("Назва лекції не може бути порожньою")
-            return
-
-        if not validate_content(content):
-            print("Вміст лекції не може бути порожнім")
-            return
-
-        # Створюємо новий урок
-        lesson_type = "lecture"
-        new_lesson = Lesson.create_lesson(title, description, lesson_type)
-
-        if not new_lesson:
+        try:
+            Lecture.create(course.course_id, title, description, content, duration, video_url)
+        except ValueError as error:
+            print(error)
             return
 
-        # Створюємо нову лекцію
-        lectures = Lecture.load_lectures()
-        new_lecture = Lecture(new_lesson.lesson_id, content, duration, video_url if video_url else None)
-        lectures.append(new_lecture)
-        Lecture.save_lectures(lectures)
-
-        # Додаємо лекцію до курсу
-        if course.add_lesson(new_lesson.lesson_id):
-            print(f"Лекція '{title}' успішно додана до курсу '{course.title}'")
-        else:
-            print("Помилка при додаванні лекції до курсу")
\ No newline at end of file
+        print(f"Лекція '{title}' успішно додана до курсу '{course.title}'")
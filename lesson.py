@@ -1,20 +1,16 @@
-import json
 from validators import validate_title, validate_content, validate_lesson_type
+from repository import repository
+from storage import backend
+from sequences import allocator
 
 class Lesson:
-    __LESSON_ID = 1
+    __slots__ = ("lesson_id", "title", "description", "type")
 
-    def __init__(self, title, description, type):
-        self.lesson_id = Lesson.__LESSON_ID
+    def __init__(self, title, description, type, lesson_id=None):
+        self.lesson_id = lesson_id if lesson_id is not None else allocator.next_id("lessons")
         self.title = title
         self.description = description
         self.type = type
-        Lesson.lesson_index()
-
-    @classmethod
-    def lesson_index(cls):
-        """Лічильник індексів, робить їх унікальними"""
-        cls.__LESSON_ID += 1
 
     def to_dict(self):
         """Перетворення об'єкта в словник"""
@@ -31,61 +27,47 @@ class Lesson:
         lesson = Lesson(
             lesson_dict["title"],
             lesson_dict["description"],
-            lesson_dict["type"]
+            lesson_dict["type"],
+            lesson_dict["lesson_id"]
         )
-        lesson.lesson_id = lesson_dict["lesson_id"]
         return lesson
 
     @staticmethod
     def load_lessons():
         """Підтягує всі уроки з словника"""
-        try:
-            with open("lessons.json", "r", encoding="utf-8") as file:
-                lessons_data = json.load(file)
-                lessons = []
-                for lesson_dict in lessons_data:
-                    lesson = Lesson.from_dict(lesson_dict)
-                    lessons.append(lesson)
-                return lessons
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return backend.load_objects("lessons", Lesson.from_dict)
 
     @staticmethod
-    def save_lessons(lessons):
-        """Зберігає уроки у словник"""
-        lessons_data = []
-        for lesson in lessons:
-            lessons_data.append(lesson.to_dict())
-
-        with open("lessons.json", "w", encoding="utf-8") as file:
-            json.dump(lessons_data, file, ensure_ascii=False, indent=2)
+    def iter_lessons():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("lessons")
 
     @staticmethod
-    def create_lesson(title, description, type):
-        """Створення нового уроку"""
+    def create(title, description, type):
+        """Створення нового уроку; при помилці валідації кидає ValueError"""
         if not validate_title(title):
-            print("Назва уроку не може бути порожньою")
-            return None
+            raise ValueError("Назва уроку не може бути порожньою")
 
         if not validate_content(description):
-            print("Опис уроку не може бути порожнім")
-            return None
+            raise ValueError("Опис уроку не може бути порожнім")
 
         if not validate_lesson_type(type):
-            print("Невірний тип уроку. Допустимі типи: 'lecture', 'task'")
-            return None
+            raise ValueError("Невірний тип уроку. Допустимі типи: 'lecture', 'task'")
 
-        lessons = Lesson.load_lessons()
         new_lesson = Lesson(title, description, type)
-        lessons.append(new_lesson)
-        Lesson.save_lessons(lessons)
+        repository.add("lessons", new_lesson)
         return new_lesson
 
+    @staticmethod
+    def create_lesson(title, description, type):
+        """Створення нового уроку"""
+        try:
+            return Lesson.create(title, description, type)
+        except ValueError as error:
+            print(error)
+            return None
+
     @staticmethod
     def find_by_id(lesson_id):
         """Пошук уроку за ID"""
-        lessons = Lesson.load_lessons()
-        for lesson in lessons:
-            if lesson.lesson_id == lesson_id:
-                return lesson
-        return None
\ No newline at end of file
+        return repository.get("lessons", lesson_id)
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""Локальний навантажувальний клієнт для server.py
+
+Відкриває кілька keep-alive з'єднань і паралельно надсилає запити прогресу студентів,
+а частку запитів (--write-ratio) - записи студентів на курс. В кінці виводить пропускну
+здатність і перцентилі затримки.
+
+Використання:
+    python load_test.py [--port 8080] [--connections 100] [--requests 50000] [--write-ratio 0.0]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+
+class Connection:
+    """Одне keep-alive з'єднання з сервером"""
+
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    @staticmethod
+    async def open(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        return Connection(reader, writer, host)
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode("latin-1") + body)
+        await self.writer.drain()
+
+        lines = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data)
+
+    def close(self):
+        self.writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def prepare(connection, students):
+    """Створює курс і студентів для тесту; повертає ID курсу та студентів"""
+    stamp = int(time.time() * 1000)
+    _, course = await connection.request("POST", "/courses", {
+        "title": f"Навантажувальний тест {stamp}", "description": "Курс", "author": "Автор"})
+    course_id = course["result"]["course_id"]
+
+    student_ids = []
+    for number in range(students):
+        _, student = await connection.request("POST", "/students", {
+            "first_name": "Студент", "last_name": "Тестовий", "email": f"load{stamp}-{number}@example.com"})
+        student_ids.append(student["result"]["student_id"])
+    return course_id, student_ids
+
+
+async def worker(connection, requests, course_id, student_ids, write_ratio, rng, latencies, failures):
+    enrolled = set()
+    for _ in range(requests):
+        student_id = rng.choice(student_ids)
+        started = time.perf_counter()
+        if rng.random() < write_ratio and student_id not in enrolled:
+            enrolled.add(student_id)
+            status, _ = await connection.request("POST", f"/courses/{course_id}/enroll", {"student_id": student_id})
+            ok = status in (200, 400)
+        else:
+            status, _ = await connection.request("GET", f"/students/{student_id}/progress")
+            ok = status == 200
+        latencies.append(time.perf_counter() - started)
+        if not ok:
+            failures.append(status)
+
+
+async def run(args):
+    setup = await Connection.open(args.host, args.port)
+    course_id, student_ids = await prepare(setup, args.students)
+    setup.close()
+
+    connections = [await Connection.open(args.host, args.port) for _ in range(args.connections)]
+    per_connection = args.requests // args.connections
+    latencies = []
+    failures = []
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(connection, per_connection, course_id, student_ids, args.write_ratio,
+               random.Random(args.seed + number), latencies, failures)
+        for number, connection in enumerate(connections)))
+    elapsed = time.perf_counter() - started
+
+    for connection in connections:
+        connection.close()
+
+    latencies.sort()
+    print(json.dumps({
+        "requests": len(latencies),
+        "connections": args.connections,
+        "write_ratio": args.write_ratio,
+        "failures": len(failures),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+        "latency_ms": {name: round(percentile(latencies, fraction) * 1000, 3)
+                       for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0))}
+    }, ensure_ascii=False, indent=2))
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=50000, help="загальна кількість запитів")
+    parser.add_argument("--students", type=int, default=200, help="скільки студентів створити для тесту")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="частка запитів запису на курс")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Блокування каталогу даних між процесами (fcntl) та лічильники версій файлів"""
+import fcntl
+import json
+import threading
+from contextlib import contextmanager
+from fileio import atomic_open
+
+LOCK_FILE = "data.lock"
+VERSION_FILE = "versions.json"
+
+
+class DataLock:
+    """Спільне (читання) або виключне (запис) блокування flock; повторно вхідне в межах процесу
+
+    Один дескриптор на процес, тож потоки процесу (наприклад, фонове ущільнення журналу)
+    серіалізуються через RLock, а процеси - через flock.
+    """
+
+    def __init__(self, path=LOCK_FILE):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._mode = None
+        self._depth = 0
+
+    @contextmanager
+    def _hold(self, mode):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._file = open(self.path, "a")
+                fcntl.flock(self._file, mode)
+                self._mode = mode
+            elif mode == fcntl.LOCK_EX and self._mode != fcntl.LOCK_EX:
+                raise RuntimeError("Неможливо підвищити спільне блокування до виключного")
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    fcntl.flock(self._file, fcntl.LOCK_UN)
+                    self._file.close()
+                    self._file = None
+                    self._mode = None
+
+    def shared(self):
+        """Блокування для читання: не перетинається із записом інших процесів"""
+        return self._hold(fcntl.LOCK_SH)
+
+    def exclusive(self):
+        """Блокування для циклу читання-зміни-запису"""
+        return self._hold(fcntl.LOCK_EX)
+
+
+class VersionFile:
+    """Лічильник версій кожного типу сутностей; збільшується при кожному записі у файл типу"""
+
+    def __init__(self, path=VERSION_FILE):
+        self.path = path
+
+    def read(self):
+        """Поточні версії {тип: номер}; відсутній файл - усі версії нульові"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def bump(self, kinds):
+        """Збільшує версії заданих типів; викликати лише під виключним блокуванням"""
+        versions = self.read()
+        for kind in kinds:
+            versions[kind] = versions.get(kind, 0) + 1
+        with atomic_open(self.path) as file:
+            json.dump(versions, file)
+        return versions
@@ -1,65 +1,143 @@
+import gc
 import os
+import sys
 import json
+import argparse
 from student import Student
-from course import Course
+from courses import Course
 from lecture import Lecture
 from task import Task
+from repository import repository
+from storage import STORAGE_BACKEND, backend
+from analytics import show_course_analytics
+from submission import Submission
+from search import search_catalog
+from deadlines import show_student_deadlines, show_overdue_tasks
+from iostats import io_stats, show_diagnostics
+
+# Сесія тримає сотні тисяч довгоживучих об'єктів сутностей без циклів, тож часті проходи
+# збирача сміття під час їх завантаження лише сповільнюють роботу на великих даних
+GC_THRESHOLDS = (100000, 50, 100)
+
+MENU = {
+    "1": "Зареєструвати студента",
+    "2": "Створити курс",
+    "3": "Додати лекцію до курсу",
+    "4": "Додати завдання до курсу",
+    "5": "Записати студента на курс",
+    "6": "Показати прогрес студента",
+    "7": "Редагувати курс",
+    "8": "Переглянути доступні курси",
+    "9": "Переглянути інформацію про курс",
+    "10": "Вирішити завдання",
+    "11": "Аналітика курсу",
+    "12": "Мої рішення",
+    "13": "Пошук",
+    "14": "Дедлайни студента",
+    "15": "Прострочені завдання курсу",
+    "16": "Діагностика вводу-виводу",
+}
+
+
+def configure_gc():
+    """Налаштовує збирач сміття один раз під час запуску програми (не з бібліотечного коду)"""
+    gc.set_threshold(*GC_THRESHOLDS)
+
 
 def initialize_files():
     """Перевірка чи є відповідні файли і створює їх при відсутності"""
-    files = ["students.json", "courses.json", "lessons.json", "lectures.json", "tasks.json"]
+    files = ["students.json", "courses.json", "lessons.json", "lectures.json", "tasks.json", "submissions.json"]
 
     for file in files:
         if not os.path.exists(file):
             with open(file, "w", encoding="utf-8") as f:
                 json.dump([], f)
 
+    if STORAGE_BACKEND == "mapped":
+        # Сховище mapped не працює з неперенесеними студентами: зупиняємось одразу, а не на першій дії
+        try:
+            backend.max_id("students", "student_id")
+        except ValueError as error:
+            sys.exit(str(error))
+
 
 def main():
     initialize_files()
 
     while True:
         print("\nМеню системи онлайн-курсів")
-        print("1. Зареєструвати студента")
-        print("2. Створити курс")
-        print("3. Додати лекцію до курсу")
-        print("4. Додати завдання до курсу")
-        print("5. Записати студента на курс")
-        print("6. Показати прогрес студента")
-        print("7. Редагувати курс")
-        print("8. Переглянути доступні курси")
-        print("9. Переглянути інформацію про курс")
-        print("10. Вирішити завдання")
+        for option, title in MENU.items():
+            print(f"{option}. {title}")
         print("0. Вихід")
 
         choice = input("Оберіть опцію: ")
+        repository.refresh()
+
+        with io_stats.operation(MENU.get(choice, "Інше")):
+            if choice == "1":
+                Student.register_student()
+            elif choice == "2":
+                Course.create_course()
+            elif choice == "3":
+                Lecture.add_to_course()
+            elif choice == "4":
+                Task.add_to_course()
+            elif choice == "5":
+                Course.enroll_student()
+            elif choice == "6":
+                Student.show_progress()
+            elif choice == "7":
+                Course.edit_course()
+            elif choice == "8":
+                Course.list_all_courses()
+            elif choice == "9":
+                Course.show_course_details()
+            elif choice == "10":
+                Task.submit_solution()
+            elif choice == "11":
+                show_course_analytics()
+            elif choice == "12":
+                Submission.show_student_submissions()
+            elif choice == "13":
+                search_catalog()
+            elif choice == "14":
+                show_student_deadlines()
+            elif choice == "15":
+                show_overdue_tasks()
+            elif choice == "16":
+                show_diagnostics()
+            elif choice == "0":
+                print("Програму завершено!")
+                backend.wait()
+                break
+            else:
+                print("Невірна опція. Спробуйте ще раз.")
 
-        if choice == "1":
-            Student.register_student()
-        elif choice == "2":
-            Course.create_course()
-        elif choice == "3":
-            Lecture.add_to_course()
-        elif choice == "4":
-            Task.add_to_course()
-        elif choice == "5":
-            Course.enroll_student()
-        elif choice == "6":
-            Student.show_progress()
-        elif choice == "7":
-            Course.edit_course()
-        elif choice == "8":
-            Course.list_all_courses()
-        elif choice == "9":
-            Course.show_course_details()
-        elif choice == "10":
-            Task.submit_solution()
-        elif choice == "0":
-            print("Програму завершено!")
-            break
-        else:
-            print("Невірна опція. Спробуйте ще раз.")
+            repository.flush()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Система онлайн-курсів")
+    parser.add_argument("--batch", metavar="FILE", help="виконати команди з JSONL файлу ('-' для stdin)")
+    parser.add_argument("--flush-every", type=int, default=0, metavar="N",
+                        help="зберігати зміни після кожних N команд (за замовчуванням - лише в кінці)")
+    parser.add_argument("--validate", metavar="FILE",
+                        help="перевірити команди JSONL файлу без виконання ('-' для stdin)")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="процесів для перевірки (за замовчуванням - кількість ядер)")
+    args = parser.parse_args()
+    configure_gc()
+
+    if args.validate:
+        import batch
+        initialize_files()
+        sys.exit(batch.validate(args.validate, args.workers))
+
+    if args.batch:
+        import batch
+        initialize_files()
+        exit_code = batch.main(args.batch, args.flush_every)
+        backend.wait()
+        sys.exit(exit_code)
+
     main()
\ No newline at end of file
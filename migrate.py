@@ -0,0 +1,126 @@
+"""Перенесення даних між json файлами та базою SQLite
+
+Використання:
+    python migrate.py import [courses.db]   json -> SQLite
+    python migrate.py export [courses.db]   SQLite -> json
+    python migrate.py map                   students.json -> файл записів фіксованої довжини (students.idx)
+    python migrate.py unmap                 students.idx -> students.json
+"""
+import os
+import sys
+from journal import Journal
+from sqlite_store import SqliteStore
+from student_store import INDEX_FILE, MAPPED_FILES, StudentFile
+from storage import ENTITY_KINDS, SQLITE_FILE, data_lock, versions
+
+
+class _Counter:
+    """Рахує записи, що проходять через потік"""
+
+    def __init__(self, records):
+        self.records = records
+        self.count = 0
+
+    def __iter__(self):
+        for record in self.records:
+            self.count += 1
+            yield record
+
+
+def import_json(db_path=SQLITE_FILE):
+    """Переносить дані з json файлів (разом із журналом) у базу SQLite"""
+    source = Journal(lock=data_lock)
+    target = SqliteStore(db_path)
+    try:
+        with data_lock.exclusive():
+            for kind in ENTITY_KINDS:
+                counter = _Counter(source.iter_records(kind))
+                target.write_snapshot(kind, counter)
+                print(f"{kind}: перенесено {counter.count} записів")
+            versions.bump(ENTITY_KINDS)
+    finally:
+        target.close()
+
+
+def export_json(db_path=SQLITE_FILE):
+    """Переносить дані з бази SQLite у json файли; повертає False, якщо бази немає"""
+    # sqlite3.connect створив би порожню базу, і експорт затер би всі json файли порожніми списками
+    if not os.path.exists(db_path):
+        print(f"Базу даних {db_path} не знайдено")
+        return False
+    source = SqliteStore(db_path)
+    target = Journal(lock=data_lock)
+    try:
+        target.wait()
+        with data_lock.exclusive():
+            for kind in ENTITY_KINDS:
+                counter = _Counter(source.iter_records(kind))
+                target.write_snapshot(kind, counter)
+                print(f"{kind}: перенесено {counter.count} записів")
+            target.discard()
+            versions.bump(ENTITY_KINDS)
+    finally:
+        source.close()
+    return True
+
+
+def map_students():
+    """Переносить студентів з json файлу (разом із журналом) у файл записів фіксованої довжини"""
+    journal = Journal(lock=data_lock)
+    students = StudentFile()
+    with data_lock.exclusive():
+        # Журнал згортається у знімки, щоб старі зміни студентів не застосувались повторно після unmap
+        journal.compact()
+        counter = _Counter(journal.iter_records("students"))
+        students.write_all(counter)
+        versions.bump(["students"])
+    print(f"students: перенесено {counter.count} записів")
+
+
+def unmap_students():
+    """Переносить студентів з файлу записів фіксованої довжини у json файл і видаляє файли записів
+
+    Без видалення наступний запуск зі сховищем mapped показував би застарілих студентів.
+    """
+    if not os.path.exists(INDEX_FILE):
+        print(f"Файл {INDEX_FILE} не знайдено: студенти вже зберігаються в json")
+        return
+    journal = Journal(lock=data_lock)
+    students = StudentFile(create=False)
+    try:
+        with data_lock.exclusive():
+            counter = _Counter(students.iter_records())
+            journal.write_snapshot("students", counter)
+            students.close()
+            # Індекс видаляється першим: без нього сховище mapped відмовиться працювати
+            for path in MAPPED_FILES + tuple(path + ".tmp" for path in MAPPED_FILES):
+                if os.path.exists(path):
+                    os.remove(path)
+            versions.bump(["students"])
+    finally:
+        students.close()
+    print(f"students: перенесено {counter.count} записів")
+
+
+def main(args):
+    if not args or args[0] not in ("import", "export", "map", "unmap"):
+        print(__doc__)
+        return 1
+
+    if args[0] == "map":
+        map_students()
+        return 0
+    if args[0] == "unmap":
+        unmap_students()
+        return 0
+
+    db_path = args[1] if len(args) > 1 else SQLITE_FILE
+    if args[0] == "import":
+        import_json(db_path)
+    elif not export_json(db_path):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
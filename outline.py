@@ -0,0 +1,45 @@
+"""Зведення курсу: уроки в порядку курсу разом з деталями лекцій та завдань"""
+from repository import repository
+
+
+class OutlineItem:
+    """Урок курсу з відповідною лекцією або завданням"""
+
+    __slots__ = ("position", "lesson", "lecture", "task")
+
+    def __init__(self, position, lesson, lecture=None, task=None):
+        self.position = position
+        self.lesson = lesson
+        self.lecture = lecture
+        self.task = task
+
+    def to_dict(self):
+        """Перетворення об'єкта в словник"""
+        item = {"position": self.position, "lesson": self.lesson.to_dict()}
+        if self.lecture is not None:
+            item["lecture"] = self.lecture.to_dict()
+        if self.task is not None:
+            item["task"] = self.task.to_dict()
+        return item
+
+
+def course_outline(course):
+    """Уроки курсу в порядку курсу за O(кількість уроків курсу)
+
+    Карти lesson_id -> Lesson/Lecture/Task - це карти ідентичності сховища,
+    тому кожен урок з'єднується з лекцією чи завданням одним пошуком у словнику.
+    """
+    outline = []
+    for position, lesson_id in enumerate(course.lessons, 1):
+        lesson = repository.get("lessons", lesson_id)
+        if not lesson:
+            continue
+        lecture = repository.get("lectures", lesson_id) if lesson.type == "lecture" else None
+        task = repository.get("tasks", lesson_id) if lesson.type == "task" else None
+        outline.append(OutlineItem(position, lesson, lecture, task))
+    return outline
+
+
+def course_tasks(course):
+    """Пари (урок, завдання) курсу в порядку курсу"""
+    return [(item.lesson, item.task) for item in course_outline(course) if item.task is not None]
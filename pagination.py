@@ -0,0 +1,231 @@
+"""Посторінковий перегляд студентів і курсів з курсорами та фільтром за префіксом
+
+Для кожного типу і порядку сортування тримається відсортований індекс пар (ключ, ID).
+Сторінка знаходиться бінарним пошуком від курсора, а об'єкти завантажуються лише
+для записів поточної сторінки. Після put індекс оновлюється на місці (старий запис
+видаляється, новий вставляється бінарним пошуком) і перебудовується лише тоді, коли
+репозиторій скинув тип цілком.
+"""
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+
+from repository import repository
+
+PAGE_SIZE = 20
+# Більші сторінки завантажували б майже всі об'єкти однією відповіддю
+MAX_PAGE_SIZE = 500
+
+ORDERS = {
+    "students": {
+        "id": lambda student: student.student_id,
+        "name": lambda student: f"{student.last_name} {student.first_name}".casefold(),
+        "email": lambda student: student.email.casefold(),
+    },
+    "courses": {
+        "id": lambda course: course.course_id,
+        "title": lambda course: course.title.casefold(),
+    },
+}
+
+ID_FIELDS = {"students": "student_id", "courses": "course_id"}
+
+
+class Page:
+    """Сторінка результатів: об'єкти, курсори сусідніх сторінок, позиція та кількість відібраних"""
+
+    __slots__ = ("items", "next_cursor", "prev_cursor", "offset", "total")
+
+    def __init__(self, items, next_cursor, prev_cursor, offset, total):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.offset = offset
+        self.total = total
+
+
+def encode_cursor(order, direction, entry):
+    """Непрозорий рядок-курсор: порядок, напрямок і запис на межі сторінки"""
+    data = json.dumps([order, direction, *entry], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def decode_cursor(cursor, order):
+    try:
+        cursor_order, direction, key, key_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as error:
+        raise ValueError("Некоректний курсор") from error
+    if cursor_order != order or direction not in ("after", "before"):
+        raise ValueError("Некоректний курсор")
+    # Ключ іншого типу, ніж у індексі, зробив би порівняння в бінарному пошуку неможливим (TypeError)
+    key_type = int if order == "id" else str
+    if not _exact(key, key_type) or not _exact(key_id, int):
+        raise ValueError("Некоректний курсор")
+    return direction, (key, key_id)
+
+
+def _exact(value, kind):
+    return isinstance(value, kind) and not isinstance(value, bool)
+
+
+class SortedIndex:
+    """Відсортовані пари (ключ, ID) одного типу за одним полем"""
+
+    def __init__(self, kind, order):
+        if order not in ORDERS.get(kind, {}):
+            raise ValueError(f"Невідомий порядок сортування: {order}")
+        self.kind = kind
+        self.order = order
+        self._key = ORDERS[kind][order]
+        self._entries = None
+        self._keys = {}
+        repository.watch(kind, self._update)
+
+    def _update(self, obj):
+        """Переносить один змінений об'єкт на його нове місце; None - індекс треба перебудувати"""
+        if self._entries is None:
+            return
+        if obj is None:
+            self._entries = None
+            return
+
+        key_id = getattr(obj, ID_FIELDS[self.kind])
+        key = self._key(obj)
+        old_key = self._keys.get(key_id)
+        if old_key == key and key_id in self._keys:
+            return
+        if key_id in self._keys:
+            del self._entries[bisect_left(self._entries, (old_key, key_id))]
+        insort(self._entries, (key, key_id))
+        self._keys[key_id] = key
+
+    def entries(self):
+        """Актуальний відсортований список; будується при першому зверненні та після скидання типу"""
+        if self._entries is None:
+            id_field = ID_FIELDS[self.kind]
+            self._keys = {getattr(obj, id_field): self._key(obj) for obj in repository.iter(self.kind)}
+            self._entries = sorted((key, key_id) for key_id, key in self._keys.items())
+        return self._entries
+
+    def bounds(self, prefix=None):
+        """Діапазон [lo, hi) записів, ключ яких починається з префікса"""
+        entries = self.entries()
+        if not prefix:
+            return 0, len(entries)
+        if self.order == "id":
+            raise ValueError("Фільтр за префіксом доступний лише для текстового порядку")
+        prefix = prefix.casefold()
+        return bisect_left(entries, (prefix,)), bisect_left(entries, (prefix + "\U0010ffff",))
+
+
+_indexes = {}
+
+
+def _index(kind, order):
+    if (kind, order) not in _indexes:
+        _indexes[kind, order] = SortedIndex(kind, order)
+    return _indexes[kind, order]
+
+
+def paginate(kind, order="id", cursor=None, limit=PAGE_SIZE, prefix=None):
+    """Сторінка об'єктів типу після/до курсора; при некоректних параметрах кидає ValueError"""
+    if limit <= 0:
+        raise ValueError("Розмір сторінки повинен бути більше нуля")
+    if limit > MAX_PAGE_SIZE:
+        raise ValueError(f"Розмір сторінки не може перевищувати {MAX_PAGE_SIZE}")
+
+    index = _index(kind, order)
+    lo, hi = index.bounds(prefix)
+    entries = index.entries()
+
+    if cursor is None:
+        start = lo
+        end = min(lo + limit, hi)
+    else:
+        direction, position = decode_cursor(cursor, order)
+        if direction == "after":
+            start = bisect_right(entries, position, lo, hi)
+            end = min(start + limit, hi)
+        else:
+            end = bisect_left(entries, position, lo, hi)
+            start = max(lo, end - limit)
+
+    items = [repository.get(kind, key_id) for _, key_id in entries[start:end]]
+    next_cursor = encode_cursor(order, "after", entries[end - 1]) if end < hi else None
+    prev_cursor = encode_cursor(order, "before", entries[start]) if start > lo else None
+    return Page(items, next_cursor, prev_cursor, start - lo, hi - lo)
+
+
+def count(kind):
+    """Кількість об'єктів типу"""
+    return len(_index(kind, "id").entries())
+
+
+def _show(page, heading, label):
+    print(f"\n{heading}")
+    for i, obj in enumerate(page.items, page.offset + 1):
+        label(i, obj)
+    if page.next_cursor or page.prev_cursor:
+        print(f"Показано {page.offset + 1}-{page.offset + len(page.items)} з {page.total}")
+
+
+def _navigate(page, command, prefix, filter_order):
+    """Обробляє команду переходу; повертає (курсор, префікс, порядок) або None"""
+    if command == "+" and page.next_cursor:
+        return page.next_cursor, prefix, filter_order if prefix else "id"
+    if command == "-" and page.prev_cursor:
+        return page.prev_cursor, prefix, filter_order if prefix else "id"
+    if command.startswith("/"):
+        prefix = command[1:].strip() or None
+        return None, prefix, filter_order if prefix else "id"
+    return None
+
+
+NAVIGATION_HINT = "+ - наступна сторінка, - - попередня, /текст - фільтр за початком назви"
+
+
+def choose(kind, heading, label, prompt, error, filter_order, limit=PAGE_SIZE):
+    """Вибір об'єкта зі списку посторінково; None, якщо вибір скасовано або невірний"""
+    cursor, prefix, order = None, None, "id"
+    while True:
+        page = paginate(kind, order, cursor, limit, prefix)
+        _show(page, heading, label)
+        if page.next_cursor or page.prev_cursor or prefix:
+            print(NAVIGATION_HINT)
+
+        answer = input(prompt).strip()
+        navigation = _navigate(page, answer, prefix, filter_order)
+        if navigation is not None:
+            cursor, prefix, order = navigation
+            continue
+
+        try:
+            index = int(answer) - 1 - page.offset
+        except ValueError:
+            print("Введіть числове значення")
+            return None
+        if index < 0 or index >= len(page.items):
+            print(error)
+            return None
+        return page.items[index]
+
+
+def browse(kind, heading, label, empty, filter_order, limit=PAGE_SIZE):
+    """Посторінковий перегляд без вибору; Enter завершує перегляд"""
+    cursor, prefix, order = None, None, "id"
+    while True:
+        page = paginate(kind, order, cursor, limit, prefix)
+        if not page.items:
+            print(f"\n{empty}")
+            if not prefix:
+                return
+        else:
+            _show(page, heading, label)
+        if not (page.next_cursor or page.prev_cursor or prefix):
+            return
+
+        answer = input(f"{NAVIGATION_HINT}, Enter - повернутися: ").strip()
+        navigation = _navigate(page, answer, prefix, filter_order)
+        if navigation is None:
+            return
+        cursor, prefix, order = navigation
@@ -0,0 +1,355 @@
+"""Спільне сховище об'єктів системи онлайн-курсів з картою ідентичності"""
+from storage import backend, data_lock, versions
+from journal import apply_entry, entry_key
+
+# Поля-колекції, які при конфлікті об'єднуються зі свіжим станом, а не перезаписуються
+MERGED_FIELDS = ("lessons", "enrolled_students", "enrolled_courses")
+
+
+def _entities():
+    """Опис типів сутностей: завантаження, створення зі словника та поле ID"""
+    from student import Student
+    from courses import Course
+    from lesson import Lesson
+    from lecture import Lecture
+    from task import Task
+    from submission import Submission
+
+    return {
+        "students": (Student.load_students, Student.from_dict, "student_id"),
+        "courses": (Course.load_courses, Course.from_dict, "course_id"),
+        "lessons": (Lesson.load_lessons, Lesson.from_dict, "lesson_id"),
+        "lectures": (Lecture.load_lectures, Lecture.from_dict, "lesson_id"),
+        "tasks": (Task.load_tasks, Task.from_dict, "lesson_id"),
+        "submissions": (Submission.load_submissions, Submission.from_dict, "submission_id"),
+    }
+
+
+def _merge_list(fresh, ours):
+    return fresh + [value for value in ours if value not in fresh]
+
+
+def _percentage(completed, total, fallback):
+    """Відсоток прогресу так само, як CourseProgress.percentage"""
+    if total <= 0:
+        return fallback
+    return round((len(completed) / total) * 100)
+
+
+def _merge_record(fresh, ours):
+    """Повний запис з нашими скалярними полями та об'єднаними колекціями свіжого стану"""
+    merged = dict(ours)
+    for field in MERGED_FIELDS:
+        if field in fresh:
+            merged[field] = _merge_list(fresh[field], ours.get(field, []))
+    if "progress" in fresh:
+        progress = dict(fresh["progress"])
+        for course_id, course_progress in ours.get("progress", {}).items():
+            current = progress.get(course_id)
+            if current is None:
+                progress[course_id] = course_progress
+            else:
+                progress[course_id] = {
+                    "completed_lessons": _merge_list(current["completed_lessons"],
+                                                     course_progress["completed_lessons"]),
+                    "overall_progress": max(current["overall_progress"], course_progress["overall_progress"])
+                }
+                scores = dict(current.get("scores", {}))
+                for lesson_id, score in course_progress.get("scores", {}).items():
+                    scores[lesson_id] = max(scores.get(lesson_id, score), score)
+                if scores:
+                    progress[course_id]["scores"] = scores
+        merged["progress"] = progress
+    return merged
+
+
+class Repository:
+    """Тримає по одному об'єкту на ID та дописує зміни в журнал лише під час flush
+
+    Для кожного завантаженого типу запам'ятовується версія файлу. Якщо під час flush
+    інший процес уже змінив ці файли, незбережені записи переносяться на свіжий стан
+    (колекції об'єднуються, відсотки прогресу перераховуються), а застарілі об'єкти скидаються.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._complete = set()
+        self._emails = {}
+        self._pending = []
+        self._versions = {}
+        self._watchers = {}
+        self._followers = []
+
+    def watch(self, kind, callback):
+        """Підписує похідний індекс на зміни типу: callback(obj) після put, callback(None) - тип скинуто"""
+        self._watchers.setdefault(kind, []).append(callback)
+
+    def follow_flush(self, follower):
+        """Підписує похідний файл на flush: його черга пишеться лише після успішного запису мутацій
+
+        follower.queued() - довжина черги, write_queued(count) - запис (може виконуватися в потоці
+        write_pending), finish_write(count) - зняття записаного з черги у finish_flush.
+        """
+        self._followers.append(follower)
+
+    def _changed(self, kind, obj=None):
+        for callback in self._watchers.get(kind, ()):
+            callback(obj)
+
+    def _seen(self, kind):
+        """Запам'ятовує версію файлу типу до першого читання з нього"""
+        if kind not in self._versions:
+            self._versions[kind] = versions.read().get(kind, 0)
+
+    def _drop(self, kind):
+        """Забуває застарілі об'єкти типу - вони будуть завантажені наново"""
+        self._objects.pop(kind, None)
+        self._complete.discard(kind)
+        self._changed(kind)
+        self._versions.pop(kind, None)
+        if kind == "students":
+            self._emails.clear()
+
+    def refresh(self):
+        """Скидає типи, файли яких змінив інший процес (викликається між операціями)"""
+        if self._pending or not self._versions:
+            return
+        current = versions.read()
+        for kind, version in list(self._versions.items()):
+            if current.get(kind, 0) != version:
+                self._drop(kind)
+
+    def _kind(self, kind):
+        """Завантажує всі сутності типу при першому зверненні, зберігаючи вже завантажені об'єкти"""
+        if kind not in self._complete:
+            self._seen(kind)
+            loader, _, id_field = _entities()[kind]
+            cached = self._objects.get(kind, {})
+            objects = {}
+            for obj in loader():
+                key = getattr(obj, id_field)
+                objects[key] = cached.get(key, obj)
+            for key, obj in cached.items():
+                objects.setdefault(key, obj)
+            self._objects[kind] = objects
+            self._complete.add(kind)
+            for obj in objects.values():
+                self._index(kind, obj)
+        return self._objects[kind]
+
+    def _index(self, kind, obj):
+        """Оновлює індекс електронних пошт студентів"""
+        if kind == "students":
+            self._emails[obj.email.lower()] = obj.student_id
+
+    def all(self, kind):
+        """Повертає всі об'єкти заданого типу в порядку збереження"""
+        return list(self._kind(kind).values())
+
+    def iter(self, kind):
+        """Потоково перебирає об'єкти без завантаження всього файлу в пам'ять"""
+        if kind in self._complete:
+            yield from list(self._objects[kind].values())
+            return
+
+        _, from_dict, id_field = _entities()[kind]
+        cached = self._objects.get(kind, {})
+        seen = set()
+        for record in backend.iter_records(kind):
+            key = record[id_field]
+            if key in cached:
+                seen.add(key)
+                yield cached[key]
+            else:
+                yield from_dict(record)
+
+        for key, obj in list(cached.items()):
+            if key not in seen:
+                yield obj
+
+    def get(self, kind, key):
+        """Пошук об'єкта за ID; індексоване сховище читає лише один запис"""
+        if kind in self._complete or not backend.is_indexed(kind):
+            return self._kind(kind).get(key)
+
+        objects = self._objects.setdefault(kind, {})
+        if key not in objects:
+            self._seen(kind)
+            record = backend.load_record(kind, key)
+            if record is None:
+                return None
+            _, from_dict, _ = _entities()[kind]
+            objects[key] = from_dict(record)
+            self._index(kind, objects[key])
+        return objects[key]
+
+    def find(self, kind, key):
+        """Пошук лише для читання: якщо тип ще не завантажено, json файл перебирається потоково до збігу
+
+        Знайдений так об'єкт не потрапляє в карту ідентичності, тож змінювати його не можна.
+        """
+        if kind in self._complete or backend.is_indexed(kind) or key in self._objects.get(kind, {}):
+            return self.get(kind, key)
+
+        _, _, id_field = _entities()[kind]
+        for obj in self.iter(kind):
+            if getattr(obj, id_field) == key:
+                return obj
+        return None
+
+    def find_student_by_email(self, email):
+        """Пошук студента за електронною поштою (без урахування регістру)"""
+        if not backend.is_indexed("students"):
+            self._kind("students")
+
+        student_id = self._emails.get(email.lower())
+        if student_id is None and "students" not in self._complete:
+            student_id = backend.find_student_id(email)
+        if student_id is None:
+            return None
+        return self.get("students", student_id)
+
+    def add(self, kind, obj):
+        """Додає новий об'єкт і записує його повний стан у журнал"""
+        _, _, id_field = _entities()[kind]
+        self._objects.setdefault(kind, {})[getattr(obj, id_field)] = obj
+        self.put(kind, obj)
+
+    def put(self, kind, obj):
+        """Фіксує повний стан зміненого об'єкта"""
+        self._index(kind, obj)
+        self._changed(kind, obj)
+        self.record({"op": "put", "kind": kind, "record": obj.to_dict()})
+
+    def record(self, entry):
+        """Додає запис мутації, який буде дописано в журнал під час flush"""
+        self._pending.append(entry)
+
+    def is_dirty(self):
+        """Чи є незбережені зміни"""
+        return bool(self._pending)
+
+    def flush(self):
+        """Передає накопичені мутації у сховище і за потреби ущільнює журнал
+
+        Перевірка версій, перенесення на свіжий стан і запис виконуються під одним
+        виключним блокуванням, тож конкурентні сесії не втрачають зміни одна одної.
+        """
+        self.finish_flush(self.write_pending())
+
+    def write_pending(self):
+        """Записує накопичені мутації під блокуванням, не змінюючи стану в пам'яті
+
+        Тому може виконуватися в іншому потоці, поки основний приймає нові зміни (сервер);
+        результат передається в finish_flush у потоці, що працює з репозиторієм.
+        """
+        pending = list(self._pending)
+        queued = [follower.queued() for follower in self._followers]
+        if not pending and not any(queued):
+            return None
+
+        known = dict(self._versions)
+        touched = {entry["kind"] for entry in pending}
+        stale, current = set(), {}
+        if pending:
+            with data_lock.exclusive():
+                current = versions.read()
+                stale = {kind for kind, version in known.items() if current.get(kind, 0) != version}
+                backend.append(self._rebase(pending) if stale else pending)
+                current = versions.bump(touched)
+            backend.maybe_compact()
+
+        for position, follower in enumerate(self._followers):
+            if not queued[position]:
+                continue
+            try:
+                follower.write_queued(queued[position])
+            except OSError:
+                # Мутації вже записано; черга похідного файлу лишається до наступного flush
+                queued[position] = 0
+        return len(pending), touched, stale, current, queued
+
+    def finish_flush(self, written):
+        """Знімає записані мутації з черги та скидає типи, змінені іншими процесами
+
+        Записи знімаються лише після успішного write_pending: якщо запис кине виняток,
+        зміни, які вже видно в пам'яті, лишаються в черзі й потраплять у наступний flush.
+        """
+        if written is None:
+            return
+        count, touched, stale, current, queued = written
+        del self._pending[:count]
+        for kind in stale:
+            self._drop(kind)
+        for kind in touched:
+            if kind in self._versions:
+                self._versions[kind] = current[kind]
+        for follower, written_count in zip(self._followers, queued):
+            follower.finish_write(written_count)
+
+    def _rebase(self, entries):
+        """Переносить незбережені записи на стан, збережений іншими процесами"""
+        fresh = {}
+
+        def load(kind, key):
+            if kind not in fresh and not backend.is_indexed(kind):
+                # json файли читаються цілком, тож один раз на тип, а не на кожен запис
+                _, _, id_field = _entities()[kind]
+                fresh[kind] = {record[id_field]: record for record in backend.load_records(kind)}
+            records = fresh.setdefault(kind, {})
+            if key not in records and backend.is_indexed(kind):
+                record = backend.load_record(kind, key)
+                if record is not None:
+                    records[key] = record
+            return records.get(key)
+
+        rebased = []
+        for entry in entries:
+            kind = entry["kind"]
+            key = entry_key(entry)
+            current = load(kind, key)
+
+            if entry["op"] == "put" and current is not None:
+                entry = {**entry, "record": _merge_record(current, entry["record"])}
+
+            elif entry["op"] in ("progress_update", "progress_set") and current is not None:
+                course = load("courses", entry["course_id"])
+                progress = current["progress"].get(str(entry["course_id"]))
+                if course is not None and progress is not None:
+                    completed = set(progress["completed_lessons"])
+                    if entry["op"] == "progress_update":
+                        completed.add(str(entry["lesson_id"]))
+                    entry = {**entry, "overall_progress": _percentage(completed, len(course["lessons"]),
+                                                                      entry["overall_progress"])}
+
+            apply_entry(fresh[kind], entry)
+            rebased.append(entry)
+
+            if entry["op"] == "add_lesson" and current is not None:
+                # Студенти, записані іншими процесами, теж отримують перерахований прогрес
+                for student_id in current["enrolled_students"]:
+                    student = load("students", int(student_id))
+                    progress = student["progress"].get(str(key)) if student else None
+                    if progress is None:
+                        continue
+                    percentage = _percentage(progress["completed_lessons"], len(current["lessons"]),
+                                             progress["overall_progress"])
+                    if percentage != progress["overall_progress"]:
+                        progress_set = {"op": "progress_set", "kind": "students", "student_id": int(student_id),
+                                        "course_id": key, "overall_progress": percentage}
+                        apply_entry(fresh["students"], progress_set)
+                        rebased.append(progress_set)
+        return rebased
+
+    def clear(self):
+        """Скидає завантажений стан (наприклад, після зміни файлів ззовні)"""
+        self._objects.clear()
+        self._complete.clear()
+        self._emails.clear()
+        self._pending = []
+        self._versions.clear()
+        for kind in _entities():
+            self._changed(kind)
+
+
+repository = Repository()
@@ -0,0 +1,292 @@
+"""Повнотекстовий пошук по курсах та уроках: інвертований індекс з ранжуванням BM25
+
+Документи індексу - курси (назва, опис) та уроки (назва, опис, вміст лекції або опис завдання).
+Індекс зберігається знімком search_index.json і журналом змін search_index.jsonl:
+оновлення документів стають у чергу й дописуються в журнал під час flush репозиторію, лише після
+успішного запису самих даних, а знімок переписується лише під час ущільнення.
+"""
+import json
+import math
+import os
+import re
+
+from fileio import atomic_open, sync
+from repository import repository
+from storage import data_lock
+
+INDEX_FILE = "search_index.json"
+JOURNAL_FILE = "search_index.jsonl"
+COMPACT_THRESHOLD = 256 * 1024
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Назва важливіша за текст: її терміни враховуються стільки разів
+TITLE_WEIGHT = 2
+
+APOSTROPHES = re.compile(r"['’ʼ`´]")
+WORD = re.compile(r"\w+")
+
+STOP_WORDS = {
+    "і", "й", "та", "а", "але", "або", "в", "у", "на", "з", "із", "зі", "до", "для", "від", "по", "про",
+    "що", "як", "це", "не", "за", "при", "без", "над", "під", "чи", "ж", "же", "the", "a", "an", "of", "and",
+}
+
+# Закінчення від довших до коротших; відкидається перше, що залишає основу з 3+ літер
+SUFFIXES = sorted([
+    "уванням", "юванням", "ування", "ювання", "анням", "енням", "ання", "ення", "іння",
+    "ією", "іями", "іях", "ія", "ії", "ію", "ость", "ості", "ість", "ями", "ами", "ові", "еві", "єві",
+    "ого", "ому", "ими", "іми", "ій", "ий", "ої", "ою", "ею", "єю", "ом", "ем", "єм", "ах", "ях", "ям",
+    "ів", "їв", "ся", "а", "я", "о", "е", "є", "и", "і", "ї", "у", "ю", "ь",
+], key=len, reverse=True)
+
+
+def stem(word):
+    """Проста евристична основа українського слова"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    """Терміни тексту: регістр, апострофи (пам'ять = памʼять), стоп-слова та основи"""
+    text = APOSTROPHES.sub("", (text or "").casefold())
+    return [stem(word) for word in WORD.findall(text) if len(word) > 1 and word not in STOP_WORDS]
+
+
+def _term_counts(title, *texts):
+    counts = {}
+    for term in tokenize(title) * TITLE_WEIGHT + [term for text in texts for term in tokenize(text)]:
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class SearchIndex:
+    """Інвертований індекс: термін -> {документ: частота}, довжини документів для BM25"""
+
+    def __init__(self, path=INDEX_FILE, journal_path=JOURNAL_FILE, threshold=COMPACT_THRESHOLD, lock=data_lock):
+        self.path = path
+        self.journal_path = journal_path
+        self.threshold = threshold
+        self._lock = lock
+        self._postings = {}
+        self._docs = {}
+        self._total_length = 0
+        self._signature = None
+        self._journal_offset = 0
+        # Записи журналу, що чекають на flush репозиторію
+        self._queued = []
+
+    # --- стан у пам'яті ---
+
+    def _remove(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        self._total_length -= doc["length"]
+        for term in doc["terms"]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _put(self, key, counts, meta):
+        self._remove(key)
+        if counts is None:
+            return
+        length = sum(counts.values())
+        self._docs[key] = {"length": length, "terms": list(counts), **meta}
+        self._total_length += length
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[key] = count
+
+    def _apply(self, entry):
+        self._put(entry["doc"], entry.get("terms"), entry.get("meta", {}))
+
+    # --- збереження ---
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        """Підтягує зміни з диска: новий знімок читається цілком, журнал - лише дописаний хвіст"""
+        signature = self._stat()
+        if signature != self._signature:
+            self._postings, self._docs, self._total_length = {}, {}, 0
+            self._journal_offset = 0
+            if signature is not None:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        snapshot = json.load(file)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"Файл {self.path} пошкоджено: {error}") from error
+                self._docs = snapshot["docs"]
+                self._postings = snapshot["postings"]
+                self._total_length = sum(doc["length"] for doc in self._docs.values())
+            self._signature = signature
+
+        try:
+            with open(self.journal_path, "rb") as file:
+                file.seek(self._journal_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].splitlines():
+            self._apply(json.loads(line))
+        self._journal_offset += complete
+
+    def exists(self):
+        return os.path.exists(self.path) or os.path.exists(self.journal_path)
+
+    def queued(self):
+        return len(self._queued)
+
+    def write_queued(self, count):
+        """Дописує перші count записів черги одним fsync; стан у пам'яті не змінюється (потік flush)"""
+        entries = self._queued[:count]
+        with self._lock.exclusive():
+            with open(self.journal_path, "a", encoding="utf-8") as file:
+                file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+                sync(file, snapshot=False)
+
+    def finish_write(self, count):
+        """Знімає записане з черги; записи читаються з журналу наступним _load, великий журнал ущільнюється"""
+        del self._queued[:count]
+        if count and os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) >= self.threshold:
+            self.compact()
+
+    def compact(self):
+        """Записує знімок індексу та очищує журнал змін"""
+        with self._lock.exclusive():
+            self._load()
+            with atomic_open(self.path) as file:
+                json.dump({"docs": self._docs, "postings": self._postings}, file, ensure_ascii=False,
+                          separators=(",", ":"))
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._signature = self._stat()
+            self._journal_offset = 0
+
+    # --- оновлення документів ---
+
+    @staticmethod
+    def course_entry(course):
+        return {"doc": f"course:{course.course_id}",
+                "terms": _term_counts(course.title, course.description),
+                "meta": {"kind": "course", "id": course.course_id}}
+
+    @staticmethod
+    def lesson_entry(lesson, course_id, lecture=None, task=None):
+        body = lecture.content if lecture else task.description if task else ""
+        return {"doc": f"lesson:{lesson.lesson_id}",
+                "terms": _term_counts(lesson.title, lesson.description, body),
+                "meta": {"kind": "lesson", "id": lesson.lesson_id, "course_id": course_id}}
+
+    def update_course(self, course):
+        """Індексує новий або змінений курс"""
+        self._ensure()
+        self._queued.append(self.course_entry(course))
+
+    def update_lesson(self, lesson, course_id, lecture=None, task=None):
+        """Індексує новий або змінений урок разом з вмістом лекції чи описом завдання"""
+        self._ensure()
+        self._queued.append(self.lesson_entry(lesson, course_id, lecture, task))
+
+    def _ensure(self):
+        """Перше використання: будує індекс з усіх наявних курсів і уроків"""
+        if not self.exists():
+            self.rebuild()
+
+    def rebuild(self):
+        """Повністю перебудовує індекс з даних сховища; повертає кількість документів"""
+        from outline import course_outline
+
+        entries = []
+        for course in repository.all("courses"):
+            entries.append(self.course_entry(course))
+            for item in course_outline(course):
+                entries.append(self.lesson_entry(item.lesson, course.course_id, item.lecture, item.task))
+
+        with self._lock.exclusive():
+            self._postings, self._docs, self._total_length = {}, {}, 0
+            for entry in entries:
+                self._apply(entry)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._journal_offset = 0
+            self._signature = None
+            with atomic_open(self.path) as file:
+                json.dump({"docs": self._docs, "postings": self._postings}, file, ensure_ascii=False,
+                          separators=(",", ":"))
+            self._signature = self._stat()
+        return len(entries)
+
+    # --- пошук ---
+
+    def search(self, query, limit=10):
+        """Документи за спаданням оцінки BM25: список (оцінка, метадані документа)"""
+        self._ensure()
+        with self._lock.shared():
+            self._load()
+
+        terms = set(tokenize(query))
+        count = len(self._docs)
+        if not terms or not count:
+            return []
+
+        average_length = self._total_length / count
+        scores = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                length = self._docs[key]["length"]
+                norm = frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (BM25_K1 + 1) / norm
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(score, {k: v for k, v in self._docs[key].items() if k not in ("terms", "length")})
+                for key, score in ranked]
+
+
+search_index = SearchIndex()
+repository.follow_flush(search_index)
+
+
+def search_catalog():
+    """Пошук курсів, лекцій та завдань у меню"""
+    from repository import repository
+
+    print("\nПошук")
+    query = input("Введіть запит: ")
+    if not query.strip():
+        print("Запит не може бути порожнім")
+        return
+
+    results = search_index.search(query)
+    if not results:
+        print("Нічого не знайдено")
+        return
+
+    print("\nРезультати пошуку:")
+    for i, (score, doc) in enumerate(results, 1):
+        if doc["kind"] == "course":
+            course = repository.get("courses", doc["id"])
+            if course:
+                print(f"{i}. Курс: {course.title} (ID: {course.course_id})")
+        else:
+            lesson = repository.get("lessons", doc["id"])
+            course = repository.get("courses", doc["course_id"])
+            if lesson:
+                kind = "Лекція" if lesson.type == "lecture" else "Завдання"
+                course_title = course.title if course else "?"
+                print(f"{i}. {kind}: {lesson.title} (ID: {lesson.lesson_id}), курс '{course_title}'")
+        print(f"   Релевантність: {score:.2f}")
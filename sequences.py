@@ -0,0 +1,87 @@
+"""Постійні послідовності ID для студентів, курсів та уроків"""
+import fcntl
+import json
+from contextlib import contextmanager
+from fileio import atomic_open
+
+SEQUENCE_FILE = "sequences.json"
+
+ID_FIELDS = {
+    "students": "student_id",
+    "courses": "course_id",
+    "lessons": "lesson_id",
+    "submissions": "submission_id",
+}
+
+
+class IdAllocator:
+    """Видає унікальні ID блоками; стан зберігається у файлі під блокуванням fcntl"""
+
+    def __init__(self, path=SEQUENCE_FILE):
+        self.path = path
+        self._blocks = {}
+        # Скільки ID резервує next_id за один запис файлу
+        self.block_size = 1
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, sequences):
+        with atomic_open(self.path) as file:
+            json.dump(sequences, file)
+
+    @staticmethod
+    def _max_existing(kind):
+        """Найбільший ID серед уже збережених записів (для першого запуску)"""
+        from storage import backend
+        return backend.max_id(kind, ID_FIELDS[kind])
+
+    def reserve(self, kind, count):
+        """Резервує count послідовних ID і повертає їх як range"""
+        if count < 1:
+            raise ValueError("Кількість ID повинна бути додатною")
+
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            sequences = self._read()
+            last_id = sequences.get(kind)
+            if last_id is None:
+                last_id = self._max_existing(kind)
+            sequences[kind] = last_id + count
+            self._write(sequences)
+        return range(last_id + 1, last_id + count + 1)
+
+    def next_id(self, kind):
+        """Наступний ID; бере з попередньо зарезервованого блоку, якщо він є"""
+        block = self._blocks.get(kind)
+        if not block:
+            block = iter(self.reserve(kind, self.block_size))
+            self._blocks[kind] = block
+        try:
+            return next(block)
+        except StopIteration:
+            self._blocks[kind] = None
+            return self.next_id(kind)
+
+    @contextmanager
+    def blocks(self, size):
+        """Поки діє, next_id резервує ID блоками по size: один запис файлу на блок, а не на кожен ID
+
+        Невикористаний залишок блоку після завершення процесу лишається пропуском у послідовності.
+        """
+        previous, self.block_size = self.block_size, size
+        try:
+            yield
+        finally:
+            self.block_size = previous
+
+    def reserve_block(self, kind, count):
+        """Резервує блок ID для наступних викликів next_id (масовий імпорт)"""
+        self._blocks[kind] = iter(self.reserve(kind, count))
+
+
+allocator = IdAllocator()
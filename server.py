@@ -0,0 +1,372 @@
+"""HTTP/JSON сервер системи онлайн-курсів на потоках asyncio
+
+Стан тримається в пам'яті (спільне сховище repository), зміни зберігає одна задача запису:
+вона збирає мутації кількох запитів і виконує один flush, після якого запити отримують відповідь.
+Сам запис (блокування та fsync) виконується в окремому потоці, тож інші з'єднання тим часом обслуговуються.
+
+Маршрути:
+    POST /students                              реєстрація студента
+    GET  /students/{id}/progress                прогрес студента
+    GET  /courses                               список курсів (?limit=20&cursor=...&order=title&prefix=...)
+    GET  /students                              сторінка студентів (?limit=20&cursor=...&order=name&prefix=...)
+    POST /courses                               створення курсу
+    POST /courses/{id}/lectures                 додавання лекції
+    POST /courses/{id}/tasks                    додавання завдання
+    POST /courses/{id}/enroll                   запис студента {"student_id": ...}
+    POST /courses/{id}/tasks/{lesson_id}/submit подання рішення {"student_id": ..., "solution": ...}
+    POST /search                                пошук курсів і уроків {"query": ..., "limit": 10}
+    GET  /diagnostics                           статистика вводу-виводу за операціями
+
+Використання:
+    python server.py [--host 127.0.0.1] [--port 8080] [--flush-delay 0.01]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import re
+import signal
+from urllib.parse import parse_qs
+
+import batch
+import pagination
+from main import configure_gc, initialize_files
+from repository import repository
+from search import search_index
+from iostats import io_stats
+from storage import ENTITY_KINDS, backend
+
+FLUSH_DELAY = 0.01
+REFRESH_INTERVAL = 1.0
+MAX_BODY = 1024 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """Помилка запиту з HTTP статусом"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Writer:
+    """Єдина задача запису: групує мутації і зберігає їх одним flush"""
+
+    def __init__(self, flush_delay=FLUSH_DELAY):
+        self.flush_delay = flush_delay
+        self._waiters = []
+        self._dirty = asyncio.Event()
+        self.flushes = 0
+
+    def committed(self):
+        """Future, що завершиться після збереження поточних змін"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._dirty.set()
+        return future
+
+    @staticmethod
+    def _write():
+        with io_stats.operation(batch.SAVE_OPERATION):
+            return repository.write_pending()
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), REFRESH_INTERVAL)
+            except asyncio.TimeoutError:
+                # Поки змін немає, підхоплюємо записи інших сесій
+                repository.refresh()
+                continue
+
+            await asyncio.sleep(self.flush_delay)
+            self._dirty.clear()
+            waiters, self._waiters = self._waiters, []
+            try:
+                # Запис із блокуванням і fsync виконується в потоці, щоб не зупиняти інші з'єднання
+                written = await asyncio.get_running_loop().run_in_executor(None, self._write)
+                repository.finish_flush(written)
+            except Exception as error:
+                for waiter in waiters:
+                    waiter.set_exception(error)
+                # Незбережені зміни лишаються в черзі репозиторію; повторна спроба - після паузи
+                await asyncio.sleep(REFRESH_INTERVAL)
+                self._dirty.set()
+            else:
+                self.flushes += 1
+                for waiter in waiters:
+                    waiter.set_result(None)
+
+
+async def _mutate(writer, command, status=201):
+    result = batch.execute(command)
+    if repository.is_dirty():
+        await writer.committed()
+    if not result["ok"]:
+        raise HttpError(400, result["error"])
+    return status, result["result"]
+
+
+def _int(value, name):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise HttpError(400, f"Поле {name} повинно бути числом")
+    return value
+
+
+def _text(value, name):
+    if value is not None and not isinstance(value, str):
+        raise HttpError(400, f"Поле {name} повинно бути рядком")
+    return value
+
+
+async def register_student(writer, body):
+    return await _mutate(writer, {**body, "command": "register_student"})
+
+
+async def create_course(writer, body):
+    return await _mutate(writer, {**body, "command": "create_course"})
+
+
+async def add_lecture(writer, body, course_id):
+    return await _mutate(writer, {**body, "command": "add_lecture", "course_id": course_id})
+
+
+async def add_task(writer, body, course_id):
+    return await _mutate(writer, {**body, "command": "add_task", "course_id": course_id})
+
+
+async def enroll(writer, body, course_id):
+    student_id = _int(body.get("student_id"), "student_id")
+    return await _mutate(writer, {"command": "enroll", "student_id": student_id, "course_id": course_id}, 200)
+
+
+async def submit(writer, body, course_id, lesson_id):
+    student_id = _int(body.get("student_id"), "student_id")
+    return await _mutate(writer, {"command": "submit", "student_id": student_id, "course_id": course_id,
+                                  "lesson_id": lesson_id, "solution": body.get("solution", "")}, 200)
+
+
+async def student_progress(writer, body, student_id):
+    student = repository.get("students", student_id)
+    if not student:
+        raise HttpError(404, "Студента з таким ID не знайдено")
+
+    courses = []
+    for course_id in student.enrolled_courses:
+        course = repository.get("courses", course_id)
+        progress = student.progress.get(course_id)
+        if course and progress:
+            courses.append({
+                "course_id": course_id,
+                "title": course.title,
+                "overall_progress": progress.overall_progress,
+                "completed_lessons": len(progress.completed_lessons),
+                "lessons": course.lesson_count
+            })
+    return 200, {"student_id": student.student_id, "courses": courses}
+
+
+def _course_summary(course):
+    return {
+        "course_id": course.course_id,
+        "title": course.title,
+        "author": course.author,
+        "lessons": course.lesson_count,
+        "students": len(course.enrolled_students)
+    }
+
+
+def _student_summary(student):
+    return {
+        "student_id": student.student_id,
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "email": student.email
+    }
+
+
+def _page(kind, body, summary):
+    """Сторінка списку за параметрами limit, cursor, order та prefix"""
+    limit = body.get("limit", pagination.PAGE_SIZE)
+    if isinstance(limit, str) and limit.isdigit():
+        limit = int(limit)
+    page = pagination.paginate(kind, _text(body.get("order", "id"), "order"), _text(body.get("cursor"), "cursor"),
+                               _int(limit, "limit"), _text(body.get("prefix"), "prefix"))
+    return 200, {
+        "items": [summary(obj) for obj in page.items],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+        "total": page.total
+    }
+
+
+async def list_courses(writer, body):
+    # Без параметрів сторінки - повний список, як і раніше
+    if not body:
+        return 200, [_course_summary(course) for course in repository.all("courses")]
+    return _page("courses", body, _course_summary)
+
+
+async def list_students(writer, body):
+    return _page("students", body, _student_summary)
+
+
+async def search(writer, body):
+    query = body.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise HttpError(400, "Запит не може бути порожнім")
+    limit = _int(body.get("limit", 10), "limit")
+    return 200, [{"score": round(score, 4), **doc} for score, doc in search_index.search(query, limit)]
+
+
+async def diagnostics(writer, body):
+    return 200, io_stats.to_dict()
+
+
+ROUTES = [
+    ("POST", re.compile(r"/students"), register_student),
+    ("GET", re.compile(r"/students"), list_students),
+    ("GET", re.compile(r"/students/(\d+)/progress"), student_progress),
+    ("GET", re.compile(r"/courses"), list_courses),
+    ("POST", re.compile(r"/courses"), create_course),
+    ("POST", re.compile(r"/courses/(\d+)/lectures"), add_lecture),
+    ("POST", re.compile(r"/courses/(\d+)/tasks"), add_task),
+    ("POST", re.compile(r"/courses/(\d+)/enroll"), enroll),
+    ("POST", re.compile(r"/courses/(\d+)/tasks/(\d+)/submit"), submit),
+    ("POST", re.compile(r"/search"), search),
+    ("GET", re.compile(r"/diagnostics"), diagnostics),
+]
+
+
+def _route(method, path):
+    allowed = False
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.fullmatch(path)
+        if match:
+            if route_method == method:
+                return handler, [int(group) for group in match.groups()]
+            allowed = True
+    if allowed:
+        raise HttpError(405, "Метод не підтримується")
+    raise HttpError(404, "Маршрут не знайдено")
+
+
+async def _read_request(reader):
+    """Читає один запит; None - клієнт закрив з'єднання"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY:
+        raise HttpError(413, "Завеликий запит")
+    body = await reader.readexactly(length) if length else b""
+    path, _, query = target.partition("?")
+    return method, path, query, headers, body
+
+
+def _response(status, payload, keep_alive):
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + data
+
+
+async def handle(reader, stream_writer, writer):
+    """Обслуговує одне з'єднання (keep-alive: кілька запитів поспіль)"""
+    try:
+        while True:
+            keep_alive = True
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, query, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                handler, args = _route(method, path)
+                try:
+                    # Параметри GET запиту передаються в рядку запиту
+                    payload = json.loads(body) if body else {name: values[-1]
+                                                             for name, values in parse_qs(query).items()}
+                except (json.JSONDecodeError, UnicodeDecodeError) as error:
+                    raise HttpError(400, f"Некоректний JSON: {error}") from error
+                if not isinstance(payload, dict):
+                    raise HttpError(400, "Тіло запиту повинно бути JSON об'єктом")
+
+                status, result = await handler(writer, payload, *args)
+                response = _response(status, {"ok": True, "result": result}, keep_alive)
+            except HttpError as error:
+                # Після 413 тіло запиту не прочитане, тож з'єднання продовжувати не можна
+                keep_alive = keep_alive and error.status != 413
+                response = _response(error.status, {"ok": False, "error": str(error)}, keep_alive)
+            except ValueError as error:
+                keep_alive = False
+                response = _response(400, {"ok": False, "error": f"Некоректний запит: {error}"}, keep_alive)
+            except Exception as error:
+                keep_alive = False
+                response = _response(500, {"ok": False, "error": f"Внутрішня помилка: {error}"}, keep_alive)
+
+            stream_writer.write(response)
+            await stream_writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        stream_writer.close()
+
+
+async def serve(host, port, flush_delay=FLUSH_DELAY):
+    initialize_files()
+    configure_gc()
+    for kind in ENTITY_KINDS:
+        repository.all(kind)
+    # Завантажені дані живуть до зупинки сервера: повні проходи збирача їх більше не перебирають
+    gc.freeze()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signal_number, stop.set)
+
+    writer = Writer(flush_delay)
+    writer_task = asyncio.create_task(writer.run())
+    server = await asyncio.start_server(lambda reader, stream: handle(reader, stream, writer), host, port)
+    print(f"Сервер працює на http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        writer_task.cancel()
+        repository.flush()
+        backend.wait()
+    print("Сервер зупинено")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервер системи онлайн-курсів")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--flush-delay", type=float, default=FLUSH_DELAY, metavar="SECONDS",
+                        help="скільки чекати на інші зміни перед спільним збереженням")
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.flush_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Двійковий кеш знімків: готові об'єкти сутностей у pickle поруч з json файлом
+
+Розбір великого json і побудова об'єктів через from_dict займають більшу частину запуску.
+Кеш (students.json.cache тощо) зберігає вже побудовані об'єкти разом з підписом json файлу:
+часом зміни, розміром і хешем вмісту. Якщо час і розмір збігаються, кеш читається одразу;
+якщо змінився лише час (файл скопійовано чи відновлено) - вирішує хеш. Кеш будується під час
+першого читання json і заново після кожного запису знімка (зокрема ущільнення журналу).
+Кеш - похідні дані: його можна видалити будь-коли, а COURSES_SNAPSHOT_CACHE=0 вимикає його зовсім.
+"""
+import hashlib
+import os
+import pickle
+import threading
+
+from fileio import open_counted
+
+CACHE_ENABLED = os.environ.get("COURSES_SNAPSHOT_CACHE", "1") != "0"
+CACHE_SUFFIX = ".cache"
+# Збільшується при зміні полів класів сутностей, щоб кеші старого формату не використовувались
+FORMAT_VERSION = 1
+HASH_CHUNK = 1024 * 1024
+
+
+def cache_path(file_name):
+    return file_name + CACHE_SUFFIX
+
+
+def file_digest(file_name):
+    """Хеш вмісту файлу"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open_counted(file_name, binary=True) as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def signature(file_name):
+    """Підпис json файлу для перевірки кешу (час зміни, розмір, хеш) або None, якщо кеш вимкнено чи файлу немає"""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        stat = os.stat(file_name)
+        return stat.st_mtime_ns, stat.st_size, file_digest(file_name)
+    except FileNotFoundError:
+        return None
+
+
+def load(file_name):
+    """Об'єкти з кешу, якщо він відповідає json файлу, інакше None"""
+    if not CACHE_ENABLED:
+        return None
+    try:
+        stat = os.stat(file_name)
+        with open_counted(cache_path(file_name), binary=True) as file:
+            header = pickle.load(file)
+            if header.get("format") != FORMAT_VERSION or header.get("size") != stat.st_size:
+                return None
+            # Інший час зміни при тому ж розмірі (файл скопійовано чи відновлено) перевіряється хешем
+            if header.get("mtime") != stat.st_mtime_ns and file_digest(file_name) != header.get("digest"):
+                return None
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+
+
+def build(records, from_dict):
+    """Об'єкти з записів знімка"""
+    return [from_dict(record) for record in records]
+
+
+def store(file_name, objects, file_signature):
+    """Атомарно записує кеш з підписом json файлу, взятим під блокуванням разом із записами
+
+    Тимчасовий файл унікальний, бо кеш можуть будувати кілька процесів одночасно. Якщо json
+    встиг змінитися, підпис не збігатиметься і кеш просто не буде використано.
+    """
+    if file_signature is None:
+        return
+    mtime, size, digest = file_signature
+    path = cache_path(file_name)
+    tmp_name = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    header = {"format": FORMAT_VERSION, "mtime": mtime, "size": size, "digest": digest}
+    try:
+        with open(tmp_name, "wb") as file:
+            pickle.dump(header, file)
+            pickle.dump(objects, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, path)
+    except OSError:
+        # Кеш необов'язковий: якщо записати не вдалося, дані читаються з json
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+
+def discard(file_name):
+    """Видаляє кеш json файлу"""
+    try:
+        os.remove(cache_path(file_name))
+    except FileNotFoundError:
+        pass
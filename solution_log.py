@@ -0,0 +1,179 @@
+"""Сегментований журнал текстів рішень з індексом зміщень
+
+Тексти рішень дописуються в сегменти solutions/segment-NNNNNN.log (заголовок + текст),
+а індекс solutions/index.bin зберігає записи фіксованої довжини
+(student_id, lesson_id, attempt) -> (сегмент, зміщення, довжина).
+Будь-яке рішення читається одним seek; заповнений сегмент більше не змінюється,
+тож старі сегменти можна архівувати або переносити.
+"""
+import os
+import struct
+
+from fileio import sync
+from storage import data_lock
+
+SOLUTIONS_DIR = "solutions"
+INDEX_FILE = "index.bin"
+SEGMENT_SIZE = 4 * 1024 * 1024
+
+# Заголовок запису в сегменті: мітка, student_id, lesson_id, спроба, довжина тексту в байтах
+RECORD_HEADER = struct.Struct("<4sQQII")
+RECORD_MAGIC = b"SOL1"
+# Запис індексу: student_id, lesson_id, спроба, номер сегмента, зміщення тексту, довжина тексту
+INDEX_ENTRY = struct.Struct("<QQIIQI")
+
+
+class SolutionLog:
+    """Сховище текстів рішень: дозапис у сегменти та індекс для читання одним seek"""
+
+    def __init__(self, directory=SOLUTIONS_DIR, segment_size=SEGMENT_SIZE, lock=data_lock):
+        self.directory = directory
+        self.segment_size = segment_size
+        self._lock = lock
+        self._index = {}
+        self._attempts = {}
+        self._ends = {}
+        self._index_offset = 0
+        self._segment = 0
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, f"segment-{segment:06d}.log")
+
+    def segments(self):
+        """Номери наявних сегментів за зростанням"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[8:14]) for name in names if name.startswith("segment-") and name.endswith(".log"))
+
+    def _remember(self, student_id, lesson_id, attempt, segment, offset, length):
+        self._index[(student_id, lesson_id, attempt)] = (segment, offset, length)
+        key = (student_id, lesson_id)
+        self._attempts[key] = max(self._attempts.get(key, 0), attempt)
+        self._ends[segment] = max(self._ends.get(segment, 0), offset + length)
+        self._segment = max(self._segment, segment)
+
+    def _refresh(self):
+        """Дочитує записи індексу, додані після останнього читання (зокрема іншими процесами)"""
+        if not self._index_offset and not os.path.exists(self.index_path) and self.segments():
+            self.rebuild_index()
+
+        try:
+            with open(self.index_path, "rb") as file:
+                file.seek(self._index_offset)
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        complete = len(data) - len(data) % INDEX_ENTRY.size
+        for entry in INDEX_ENTRY.iter_unpack(data[:complete]):
+            self._remember(*entry)
+        self._index_offset += complete
+
+    def append(self, student_id, lesson_id, text):
+        """Дописує текст рішення; повертає номер спроби студента для цього завдання"""
+        payload = text.encode("utf-8")
+        with self._lock.exclusive():
+            os.makedirs(self.directory, exist_ok=True)
+            self._refresh()
+            attempt = self._attempts.get((student_id, lesson_id), 0) + 1
+
+            # Активний сегмент - останній наявний (після rotate він може бути ще порожнім)
+            segment = max([self._segment, 1] + self.segments()[-1:])
+            path = self.segment_path(segment)
+            if os.path.exists(path) and os.path.getsize(path) >= self.segment_size:
+                segment += 1
+                path = self.segment_path(segment)
+
+            with open(path, "ab") as file:
+                # Хвіст, не внесений в індекс (збій під час запису), відкидається
+                if file.tell() > self._ends.get(segment, 0):
+                    file.truncate(self._ends.get(segment, 0))
+                    file.seek(0, os.SEEK_END)
+                offset = file.tell() + RECORD_HEADER.size
+                file.write(RECORD_HEADER.pack(RECORD_MAGIC, student_id, lesson_id, attempt, len(payload)))
+                file.write(payload)
+                sync(file, snapshot=False)
+
+            entry = (student_id, lesson_id, attempt, segment, offset, len(payload))
+            with open(self.index_path, "ab") as file:
+                # Обрізаний після збою запис індексу відкидається, щоб не зсунути наступні
+                if file.tell() % INDEX_ENTRY.size:
+                    file.truncate(file.tell() - file.tell() % INDEX_ENTRY.size)
+                file.write(INDEX_ENTRY.pack(*entry))
+                sync(file, snapshot=False)
+            self._index_offset = os.path.getsize(self.index_path)
+            self._remember(*entry)
+        return attempt
+
+    def locate(self, student_id, lesson_id, attempt):
+        """(сегмент, зміщення, довжина) рішення або None"""
+        key = (student_id, lesson_id, attempt)
+        if key not in self._index:
+            with self._lock.shared():
+                self._refresh()
+        return self._index.get(key)
+
+    def read(self, student_id, lesson_id, attempt):
+        """Текст рішення (один seek у сегменті) або None"""
+        location = self.locate(student_id, lesson_id, attempt)
+        if location is None:
+            return None
+        segment, offset, length = location
+        with open(self.segment_path(segment), "rb") as file:
+            file.seek(offset)
+            return file.read(length).decode("utf-8")
+
+    def attempts(self, student_id, lesson_id):
+        """Кількість збережених спроб студента для завдання"""
+        with self._lock.shared():
+            self._refresh()
+        return self._attempts.get((student_id, lesson_id), 0)
+
+    def rotate(self):
+        """Закриває поточний сегмент: наступні рішення пишуться в новий"""
+        with self._lock.exclusive():
+            segments = self.segments()
+            if not segments or not os.path.getsize(self.segment_path(segments[-1])):
+                return segments[-1] if segments else 0
+            segment = segments[-1] + 1
+            open(self.segment_path(segment), "ab").close()
+            return segment
+
+    def rebuild_index(self):
+        """Відновлює індекс скануванням заголовків сегментів (наприклад, після втрати index.bin)"""
+        entries = []
+        for segment in self.segments():
+            with open(self.segment_path(segment), "rb") as file:
+                data = file.read()
+            position = 0
+            while position + RECORD_HEADER.size <= len(data):
+                magic, student_id, lesson_id, attempt, length = RECORD_HEADER.unpack_from(data, position)
+                offset = position + RECORD_HEADER.size
+                if magic != RECORD_MAGIC or offset + length > len(data):
+                    break
+                entries.append((student_id, lesson_id, attempt, segment, offset, length))
+                position = offset + length
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            for entry in entries:
+                file.write(INDEX_ENTRY.pack(*entry))
+            sync(file)
+        os.replace(tmp_path, self.index_path)
+
+        self._index.clear()
+        self._attempts.clear()
+        self._ends.clear()
+        self._index_offset = 0
+        self._segment = 0
+        return len(entries)
+
+
+solution_log = SolutionLog()
@@ -0,0 +1,338 @@
+"""Сховище даних системи онлайн-курсів у SQLite з індексованими запитами"""
+import json
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id INTEGER PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_students_email_lower ON students (lower(email));
+
+CREATE TABLE IF NOT EXISTS courses (
+    course_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    author TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS course_lessons (
+    course_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    PRIMARY KEY (course_id, position),
+    UNIQUE (course_id, lesson_id)
+);
+CREATE INDEX IF NOT EXISTS idx_course_lessons_lesson ON course_lessons (lesson_id);
+
+CREATE TABLE IF NOT EXISTS enrollments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    overall_progress INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (student_id, course_id)
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments (course_id);
+
+CREATE TABLE IF NOT EXISTS completed_lessons (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    UNIQUE (student_id, course_id, lesson_id)
+);
+CREATE INDEX IF NOT EXISTS idx_completed_lessons_lesson ON completed_lessons (lesson_id);
+
+CREATE TABLE IF NOT EXISTS lesson_scores (
+    student_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (student_id, course_id, lesson_id)
+);
+
+CREATE TABLE IF NOT EXISTS lessons (
+    lesson_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    type TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lectures (
+    lesson_id INTEGER PRIMARY KEY,
+    content TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    video_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    lesson_id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    max_score INTEGER NOT NULL,
+    deadline TEXT,
+    tests TEXT
+);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    attempt INTEGER,
+    solution TEXT,
+    status TEXT NOT NULL,
+    score INTEGER,
+    passed INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    feedback TEXT,
+    submitted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_student ON submissions (student_id);
+CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions (status);
+"""
+
+# Колонки, додані після першої версії схеми: (таблиця, колонка, визначення)
+ADDED_COLUMNS = [
+    ("tasks", "tests", "TEXT"),
+    ("submissions", "attempt", "INTEGER"),
+]
+
+SCALAR_COLUMNS = {
+    "students": ("student_id", "first_name", "last_name", "email", "phone"),
+    "courses": ("course_id", "title", "description", "author"),
+    "lessons": ("lesson_id", "title", "description", "type"),
+    "lectures": ("lesson_id", "content", "duration", "video_url"),
+    "tasks": ("lesson_id", "description", "max_score", "deadline", "tests"),
+    "submissions": ("submission_id", "student_id", "course_id", "lesson_id", "attempt", "status", "score",
+                    "passed", "total", "feedback", "submitted_at", "solution"),
+}
+
+# Колонки зі списками, що зберігаються як json текст
+JSON_COLUMNS = {
+    "tasks": ("tests",),
+}
+
+
+class SqliteStore:
+    """Сховище з нормалізованими таблицями записів, уроків курсу та прогресу"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Додає колонки, яких немає в базах, створених старішою версією схеми"""
+        for table, column, definition in ADDED_COLUMNS:
+            existing = {row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")}
+            if column not in existing:
+                with self.connection:
+                    self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def close(self):
+        self.connection.close()
+
+    def is_indexed(self, kind):
+        """Окремі записи читаються за первинним ключем"""
+        return True
+
+    def _select(self, kind, where="", params=()):
+        columns = SCALAR_COLUMNS[kind]
+        query = f"SELECT {', '.join(columns)} FROM {kind} {where} ORDER BY {columns[0]}"
+        records = [dict(zip(columns, row)) for row in self.connection.execute(query, params)]
+        for column in JSON_COLUMNS.get(kind, ()):
+            for record in records:
+                record[column] = json.loads(record[column]) if record[column] else []
+        return records
+
+    def _attach_students(self, students, where="", params=()):
+        """Додає до студентів записи на курси та завершені уроки"""
+        by_id = {student["student_id"]: student for student in students}
+        for student in students:
+            student["enrolled_courses"] = []
+            student["progress"] = {}
+
+        rows = self.connection.execute(
+            f"SELECT student_id, course_id, overall_progress FROM enrollments {where} ORDER BY seq", params)
+        for student_id, course_id, overall_progress in rows:
+            student = by_id.get(student_id)
+            if student is not None:
+                student["enrolled_courses"].append(str(course_id))
+                student["progress"][str(course_id)] = {"completed_lessons": [], "overall_progress": overall_progress}
+
+        rows = self.connection.execute(
+            f"SELECT student_id, course_id, lesson_id FROM completed_lessons {where} ORDER BY seq", params)
+        for student_id, course_id, lesson_id in rows:
+            student = by_id.get(student_id)
+            if student is not None and str(course_id) in student["progress"]:
+                student["progress"][str(course_id)]["completed_lessons"].append(str(lesson_id))
+
+        rows = self.connection.execute(
+            f"SELECT student_id, course_id, lesson_id, score FROM lesson_scores {where} "
+            "ORDER BY student_id, course_id, lesson_id", params)
+        for student_id, course_id, lesson_id, score in rows:
+            student = by_id.get(student_id)
+            if student is not None and str(course_id) in student["progress"]:
+                student["progress"][str(course_id)].setdefault("scores", {})[str(lesson_id)] = score
+        return students
+
+    def _attach_courses(self, courses, where="", params=()):
+        """Додає до курсів упорядковані уроки та записаних студентів"""
+        by_id = {course["course_id"]: course for course in courses}
+        for course in courses:
+            course["lessons"] = []
+            course["enrolled_students"] = []
+
+        rows = self.connection.execute(
+            f"SELECT course_id, lesson_id FROM course_lessons {where} ORDER BY course_id, position", params)
+        for course_id, lesson_id in rows:
+            if course_id in by_id:
+                by_id[course_id]["lessons"].append(str(lesson_id))
+
+        rows = self.connection.execute(
+            f"SELECT course_id, student_id FROM enrollments {where} ORDER BY seq", params)
+        for course_id, student_id in rows:
+            if course_id in by_id:
+                by_id[course_id]["enrolled_students"].append(str(student_id))
+        return courses
+
+    def load_records(self, kind):
+        """Повертає всі записи заданого типу у форматі json файлів"""
+        records = self._select(kind)
+        if kind == "students":
+            return self._attach_students(records)
+        if kind == "courses":
+            return self._attach_courses(records)
+        return records
+
+    def load_objects(self, kind, from_dict):
+        """Повертає всі об'єкти заданого типу"""
+        return [from_dict(record) for record in self.load_records(kind)]
+
+    def iter_records(self, kind):
+        """Потоково повертає записи по одному через курсор"""
+        id_field = SCALAR_COLUMNS[kind][0]
+        for (key,) in self.connection.execute(f"SELECT {id_field} FROM {kind} ORDER BY {id_field}"):
+            record = self.load_record(kind, key)
+            if record is not None:
+                yield record
+
+    def load_record(self, kind, key):
+        """Пошук одного запису за первинним ключем"""
+        id_field = SCALAR_COLUMNS[kind][0]
+        records = self._select(kind, f"WHERE {id_field} = ?", (key,))
+        if not records:
+            return None
+        if kind == "students":
+            self._attach_students(records, "WHERE student_id = ?", (key,))
+        elif kind == "courses":
+            self._attach_courses(records, "WHERE course_id = ?", (key,))
+        return records[0]
+
+    def max_id(self, kind, id_field):
+        """Найбільший збережений ID заданого типу"""
+        return self.connection.execute(f"SELECT COALESCE(MAX({id_field}), 0) FROM {kind}").fetchone()[0]
+
+    def find_student_id(self, email):
+        """Пошук ID студента за електронною поштою (без урахування регістру) через індекс"""
+        row = self.connection.execute(
+            "SELECT student_id FROM students WHERE lower(email) = ?", (email.lower(),)).fetchone()
+        return row[0] if row else None
+
+    def _put(self, kind, record):
+        columns = SCALAR_COLUMNS[kind]
+        placeholders = ", ".join("?" for _ in columns)
+        json_columns = JSON_COLUMNS.get(kind, ())
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {kind} ({', '.join(columns)}) VALUES ({placeholders})",
+            [json.dumps(record.get(column) or [], ensure_ascii=False) if column in json_columns
+             else record.get(column) for column in columns])
+
+        if kind == "students":
+            student_id = record["student_id"]
+            for course_id in record.get("enrolled_courses", []):
+                self._enroll(student_id, int(course_id))
+            for course_id, progress in record.get("progress", {}).items():
+                for lesson_id in progress["completed_lessons"]:
+                    self._complete(student_id, int(course_id), int(lesson_id), progress["overall_progress"])
+                for lesson_id, score in progress.get("scores", {}).items():
+                    self._score(student_id, int(course_id), int(lesson_id), score)
+
+        elif kind == "courses":
+            course_id = record["course_id"]
+            self.connection.execute("DELETE FROM course_lessons WHERE course_id = ?", (course_id,))
+            self.connection.executemany(
+                "INSERT INTO course_lessons (course_id, position, lesson_id) VALUES (?, ?, ?)",
+                [(course_id, position, int(lesson_id)) for position, lesson_id in enumerate(record.get("lessons", []))])
+            for student_id in record.get("enrolled_students", []):
+                self._enroll(int(student_id), course_id)
+
+    def _enroll(self, student_id, course_id):
+        self.connection.execute(
+            "INSERT OR IGNORE INTO enrollments (student_id, course_id) VALUES (?, ?)", (student_id, course_id))
+
+    def _add_lesson(self, course_id, lesson_id):
+        self.connection.execute(
+            "INSERT OR IGNORE INTO course_lessons (course_id, position, lesson_id) "
+            "SELECT ?, COALESCE(MAX(position) + 1, 0), ? FROM course_lessons WHERE course_id = ?",
+            (course_id, lesson_id, course_id))
+
+    def _complete(self, student_id, course_id, lesson_id, overall_progress):
+        self.connection.execute(
+            "INSERT OR IGNORE INTO completed_lessons (student_id, course_id, lesson_id) VALUES (?, ?, ?)",
+            (student_id, course_id, lesson_id))
+        self.connection.execute(
+            "UPDATE enrollments SET overall_progress = ? WHERE student_id = ? AND course_id = ?",
+            (overall_progress, student_id, course_id))
+
+    def _score(self, student_id, course_id, lesson_id, score):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO lesson_scores (student_id, course_id, lesson_id, score) VALUES (?, ?, ?, ?)",
+            (student_id, course_id, lesson_id, score))
+
+    def append(self, entries):
+        """Застосовує записи мутацій в одній транзакції"""
+        if not entries:
+            return
+        with self.connection:
+            for entry in entries:
+                op = entry["op"]
+                if op == "put":
+                    self._put(entry["kind"], entry["record"])
+                elif op in ("enroll", "add_student"):
+                    self._enroll(int(entry["student_id"]), int(entry["course_id"]))
+                elif op == "add_lesson":
+                    self._add_lesson(int(entry["course_id"]), int(entry["lesson_id"]))
+                elif op == "progress_set":
+                    self.connection.execute(
+                        "UPDATE enrollments SET overall_progress = ? WHERE student_id = ? AND course_id = ?",
+                        (entry["overall_progress"], int(entry["student_id"]), int(entry["course_id"])))
+                elif op == "progress_update":
+                    self._complete(int(entry["student_id"]), int(entry["course_id"]),
+                                   int(entry["lesson_id"]), entry["overall_progress"])
+                elif op == "score_set":
+                    self._score(int(entry["student_id"]), int(entry["course_id"]),
+                                int(entry["lesson_id"]), entry["score"])
+
+    def write_snapshot(self, kind, records):
+        """Замінює всі записи заданого типу"""
+        with self.connection:
+            self.connection.execute(f"DELETE FROM {kind}")
+            if kind == "students":
+                self.connection.execute("DELETE FROM enrollments")
+                self.connection.execute("DELETE FROM completed_lessons")
+                self.connection.execute("DELETE FROM lesson_scores")
+            elif kind == "courses":
+                self.connection.execute("DELETE FROM course_lessons")
+            for record in records:
+                self._put(kind, record)
+
+    def maybe_compact(self):
+        """SQLite не потребує ущільнення журналу"""
+
+    def wait(self):
+        """Фонових задач немає"""
@@ -0,0 +1,30 @@
+"""Вибір сховища даних: json файли з журналом або SQLite"""
+import os
+from journal import Journal
+from sqlite_store import SqliteStore
+from student_store import MappedStore
+from locking import DataLock, VersionFile
+from iostats import InstrumentedBackend
+
+STORAGE_BACKEND = os.environ.get("COURSES_STORAGE", "json")
+SQLITE_FILE = os.environ.get("COURSES_DB", "courses.db")
+
+ENTITY_KINDS = ["students", "courses", "lessons", "lectures", "tasks", "submissions"]
+
+data_lock = DataLock()
+versions = VersionFile()
+
+
+def create_backend(name=STORAGE_BACKEND, path=SQLITE_FILE):
+    """Створює сховище за назвою: 'json', 'sqlite' або 'mapped' (студенти у файлі записів фіксованої довжини)"""
+    if name == "json":
+        return Journal(lock=data_lock)
+    if name == "mapped":
+        return MappedStore(Journal(lock=data_lock), lock=data_lock)
+    if name == "sqlite":
+        return SqliteStore(path)
+    raise ValueError(f"Невідоме сховище: {name}")
+
+
+# Обгортка лише рахує ввід-вивід для діагностики (iostats) і передає виклики сховищу
+backend = InstrumentedBackend(create_backend())
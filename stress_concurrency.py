@@ -0,0 +1,158 @@
+"""Стрес-тест кількох одночасних сесій main.py над одним каталогом даних
+
+Кожен процес записує на курс власних студентів, подає рішення та редагує курс
+(повний запис курсу із застарілими списками), один процес ще й додає лекцію.
+Після завершення перевіряється, що жоден запис на курс і жодне виконане завдання не втрачено,
+а відсотки прогресу відповідають кінцевій кількості уроків.
+
+Використання:
+    python stress_concurrency.py [--processes 4] [--students 25] [--storage json|sqlite|mapped]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(ROOT, "main.py")
+TASKS = 3
+
+
+def _run_batch(directory, env, commands, name="seed", wait=True):
+    """Запускає main.py --batch над файлом команд; результати пишуться у файл поруч"""
+    path = os.path.join(directory, f"{name}.jsonl")
+    with open(path, "w", encoding="utf-8") as file:
+        file.writelines(json.dumps(command, ensure_ascii=False) + "\n" for command in commands)
+    with open(path + ".out", "w", encoding="utf-8") as output:
+        process = subprocess.Popen([sys.executable, MAIN, "--batch", path, "--flush-every", "1"], cwd=directory,
+                                   env=env, stdout=output, stderr=subprocess.DEVNULL)
+    if not wait:
+        return process, path + ".out"
+    process.wait()
+    return _results(path + ".out")
+
+
+def _results(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def seed(directory, env, students):
+    """Один курс із завданнями та зареєстровані студенти; повертає ID курсу, завдань і студентів"""
+    commands = [{"command": "create_course", "title": "Стрес-тест", "description": "Курс", "author": "Автор"}]
+    results = _run_batch(directory, env, commands)
+    course_id = results[0]["result"]["course_id"]
+
+    commands = [{"command": "add_task", "course_id": course_id, "title": f"Завдання {i}", "summary": "Опис",
+                 "description": "Опис", "max_score": 10} for i in range(TASKS)]
+    commands += [{"command": "register_student", "first_name": "Студент", "last_name": "Тестовий",
+                  "email": f"student{i}@example.com"} for i in range(students)]
+    results = _run_batch(directory, env, commands)
+    task_ids = [result["result"]["lesson_id"] for result in results[:TASKS]]
+    student_ids = [result["result"]["student_id"] for result in results[TASKS:]]
+    return course_id, task_ids, student_ids
+
+
+def session_commands(index, course_id, task_ids, student_ids, rng):
+    """Команди однієї сесії та очікувані завершені уроки її студентів"""
+    commands = []
+    expected = {}
+    for number, student_id in enumerate(student_ids):
+        commands.append({"command": "enroll", "student_id": student_id, "course_id": course_id})
+        completed = rng.sample(task_ids, rng.randint(0, len(task_ids)))
+        expected[student_id] = set(completed)
+        for lesson_id in completed:
+            commands.append({"command": "submit", "student_id": student_id, "course_id": course_id,
+                             "lesson_id": lesson_id, "solution": "print(42)"})
+        if number % 5 == 0:
+            commands.append({"command": "edit_course", "course_id": course_id,
+                             "description": f"Редагування сесії {index}"})
+        if index == 0 and number == len(student_ids) // 2:
+            commands.append({"command": "add_lecture", "course_id": course_id, "title": "Додаткова лекція",
+                             "description": "Опис", "content": "Вміст", "duration": 10})
+    return commands, expected
+
+
+def verify(directory, env, course_id, expected):
+    """Перевіряє стан свіжим процесом; повертає список знайдених втрат"""
+    script = (
+        "import json, sys\n"
+        "from repository import repository\n"
+        f"course = repository.get('courses', {course_id})\n"
+        "students = {s.student_id: {'courses': list(s.enrolled_courses),"
+        " 'progress': {c: [list(p.completed_lessons), p.overall_progress] for c, p in s.progress.items()}}"
+        " for s in repository.all('students')}\n"
+        "print(json.dumps({'lessons': list(course.lessons), 'enrolled': list(course.enrolled_students),"
+        " 'students': students}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=directory, env=dict(env, PYTHONPATH=ROOT),
+                            capture_output=True, text=True, check=True).stdout
+    state = json.loads(output)
+    lesson_count = len(state["lessons"])
+    enrolled = set(state["enrolled"])
+
+    problems = []
+    for student_id, lessons in expected.items():
+        student = state["students"][str(student_id)]
+        if student_id not in enrolled:
+            problems.append(f"студент {student_id} відсутній у курсі")
+        if course_id not in student["courses"]:
+            problems.append(f"курс відсутній у студента {student_id}")
+            continue
+        completed, overall = student["progress"][str(course_id)]
+        if set(completed) != lessons:
+            problems.append(f"студент {student_id}: завершено {sorted(completed)}, очікувалось {sorted(lessons)}")
+        if overall != round(len(lessons) / lesson_count * 100):
+            problems.append(f"студент {student_id}: прогрес {overall}% не відповідає {len(lessons)}/{lesson_count}")
+    if lesson_count != TASKS + 1:
+        problems.append(f"у курсі {lesson_count} уроків, очікувалось {TASKS + 1}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стрес-тест конкурентних сесій")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--students", type=int, default=25, help="студентів на процес")
+    parser.add_argument("--storage", choices=("json", "sqlite", "mapped"), default="json")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    env = dict(os.environ, COURSES_STORAGE=args.storage, COURSES_FSYNC="never")
+
+    with tempfile.TemporaryDirectory() as directory:
+        course_id, task_ids, student_ids = seed(directory, env, args.processes * args.students)
+
+        sessions = []
+        expected = {}
+        for index in range(args.processes):
+            own = student_ids[index * args.students:(index + 1) * args.students]
+            commands, session_expected = session_commands(index, course_id, task_ids, own, rng)
+            expected.update(session_expected)
+            sessions.append(commands)
+
+        processes = [_run_batch(directory, env, commands, f"session{index}", wait=False)
+                     for index, commands in enumerate(sessions)]
+        errors = 0
+        for process, output in processes:
+            process.wait()
+            errors += sum(not result["ok"] for result in _results(output))
+
+        problems = verify(directory, env, course_id, expected)
+
+    commands = sum(len(commands) for commands in sessions)
+    print(f"Процесів: {args.processes}, команд: {commands}, помилок команд: {errors}")
+    if problems:
+        print(f"Втрачено оновлень: {len(problems)}")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        return 1
+    print("Усі записи на курс і завершені завдання збережено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,75 @@
-import json
 from validators import validate_email, validate_name
+from repository import repository
+from storage import backend
+from sequences import allocator
+from idset import IdSet
+from completion import completions
+
+
+class CourseProgress:
+    """Прогрес студента на одному курсі"""
+
+    __slots__ = ("completed_lessons", "overall_progress", "scores")
+
+    def __init__(self, completed_lessons=(), overall_progress=0, scores=None):
+        self.completed_lessons = IdSet(completed_lessons)
+        self.overall_progress = overall_progress
+        # Бали за автоматично перевірені завдання {lesson_id: бал}; None, поки балів немає (економія пам'яті)
+        self.scores = scores or None
+
+    def percentage(self, total_lessons):
+        """Відсоток завершених уроків від загальної кількості уроків курсу"""
+        if total_lessons <= 0:
+            return self.overall_progress
+        return round((len(self.completed_lessons) / total_lessons) * 100)
+
+    def score(self, lesson_id):
+        """Найкращий бал за завдання або None"""
+        return self.scores.get(lesson_id) if self.scores else None
+
+    def to_dict(self):
+        """Перетворення об'єкта в словник"""
+        progress_dict = {
+            "completed_lessons": self.completed_lessons.to_strings(),
+            "overall_progress": self.overall_progress
+        }
+        if self.scores:
+            progress_dict["scores"] = {str(lesson_id): score for lesson_id, score in self.scores.items()}
+        return progress_dict
+
+    @staticmethod
+    def from_dict(progress_dict):
+        """Створює новий об'єкт з словника"""
+        return CourseProgress(
+            [int(lesson_id) for lesson_id in progress_dict.get("completed_lessons", [])],
+            progress_dict.get("overall_progress", 0),
+            {int(lesson_id): score for lesson_id, score in progress_dict.get("scores", {}).items()}
+        )
 
 
 class Student:
-    __STUDENT_ID = 1
+    __slots__ = ("student_id", "first_name", "last_name", "email", "phone", "enrolled_courses", "progress")
 
-    def __init__(self, first_name, last_name, email, phone=None, enrolled_courses=None, progress=None):
-        self.student_id = Student.__STUDENT_ID
+    def __init__(self, first_name, last_name, email, phone=None, enrolled_courses=None, progress=None,
+                 student_id=None):
+        self.student_id = student_id if student_id is not None else allocator.next_id("students")
         self.first_name = first_name
         self.last_name = last_name
         self.email = email
         self.phone = phone
-        self.enrolled_courses = enrolled_courses if enrolled_courses else []
+        self.enrolled_courses = IdSet(enrolled_courses or ())
         self.progress = progress if progress else {}
-        Student.increment_student_id()
-
-    @classmethod
-    def increment_student_id(cls):
-        """Лічильник індексів, робить їх унікальними"""
-        cls.__STUDENT_ID += 1
 
     def to_dict(self):
-        """Перетворення об'єкта в словник"""
+        """Перетворення об'єкта в словник (ID зберігаються рядками, як і раніше)"""
         return {
             "student_id": self.student_id,
             "first_name": self.first_name,
             "last_name": self.last_name,
             "email": self.email,
             "phone": self.phone,
-            "enrolled_courses": self.enrolled_courses,
-            "progress": self.progress
+            "enrolled_courses": self.enrolled_courses.to_strings(),
+            "progress": {str(course_id): progress.to_dict() for course_id, progress in self.progress.items()}
         }
 
     @staticmethod
@@ -40,35 +80,38 @@ class Student:
             student_dict["last_name"],
             student_dict["email"],
             student_dict.get("phone"),
-            student_dict.get("enrolled_courses", []),
-            student_dict.get("progress", {})
+            [int(course_id) for course_id in student_dict.get("enrolled_courses", [])],
+            {int(course_id): CourseProgress.from_dict(progress)
+             for course_id, progress in student_dict.get("progress", {}).items()},
+            student_dict["student_id"]
         )
-        student.student_id = student_dict["student_id"]
         return student
 
     @staticmethod
     def load_students():
         """Підтягує всіх студентів з словника"""
-        try:
-            with open("students.json", "r", encoding="utf-8") as file:
-                students_data = json.load(file)
-                students = []
-                for student_dict in students_data:
-                    student = Student.from_dict(student_dict)
-                    students.append(student)
-                return students
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return backend.load_objects("students", Student.from_dict)
 
     @staticmethod
-    def save_students(students):
-        """Зберігає студентів у словник"""
-        students_data = []
-        for student in students:
-            students_data.append(student.to_dict())
+    def iter_students():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("students")
 
-        with open("students.json", "w", encoding="utf-8") as file:
-            json.dump(students_data, file, ensure_ascii=False, indent=2)
+    @staticmethod
+    def register(first_name, last_name, email, phone=None):
+        """Реєстрація студента без діалогу; при помилці валідації кидає ValueError"""
+        if not validate_name(first_name) or not validate_name(last_name):
+            raise ValueError("Ім'я та прізвище повинні містити тільки літери і не бути порожніми")
+
+        if not validate_email(email):
+            raise ValueError("Некоректний формат електронної пошти")
+
+        if repository.find_student_by_email(email):
+            raise ValueError("Студент з такою електронною поштою вже існує")
+
+        new_student = Student(first_name, last_name, email, phone if phone else None)
+        repository.add("students", new_student)
+        return new_student
 
     @staticmethod
     def register_student():
@@ -79,77 +122,99 @@ class Student:
         email = input("Введіть електронну пошту: ")
         phone = input("Введіть номер телефону (необов'язково): ")
 
-        if not validate_name(first_name) or not validate_name(last_name):
-            print("Ім'я та прізвище повинні містити тільки літери і не бути порожніми")
-            return
-
-        if not validate_email(email):
-            print("Некоректний формат електронної пошти")
+        try:
+            new_student = Student.register(first_name, last_name, email, phone)
+        except ValueError as error:
+            print(error)
             return
 
-        students = Student.load_students()
-        for student in students:
-            if student.email == email:
-                print("Студент з такою електронною поштою вже існує")
-                return
-
-        phone = phone if phone else None
-        new_student = Student(first_name, last_name, email, phone)
-        students.append(new_student)
-        Student.save_students(students)
         print(f"Студент {first_name} {last_name} з ID {new_student.student_id} успішно зареєстрований!")
 
     @staticmethod
     def find_by_id(student_id):
         """Пошук студента за ID"""
-        students = Student.load_students()
-        for student in students:
-            if student.student_id == student_id:
-                return student
-        return None
+        return repository.get("students", student_id)
 
     def enroll_in_course(self, course_id):
         """Запис студента на курс"""
-        if str(course_id) not in self.enrolled_courses:
-            self.enrolled_courses.append(str(course_id))
-            self.progress[str(course_id)] = {"completed_lessons": [], "overall_progress": 0}
-
-            students = Student.load_students()
-            for i, student in enumerate(students):
-                if student.student_id == self.student_id:
-                    students[i] = self
-                    Student.save_students(students)
-                    return True
+        if self.enrolled_courses.add(course_id):
+            self.progress[course_id] = CourseProgress()
+            repository.record({
+                "op": "enroll",
+                "kind": "students",
+                "student_id": self.student_id,
+                "course_id": course_id
+            })
+            return True
         return False
 
     def update_progress(self, course_id, lesson_id):
         """Оновлює прогрес студента після завершення уроку"""
-        course_id_str = str(course_id)
-        lesson_id_str = str(lesson_id)
-
-        if course_id_str in self.progress:
-            if lesson_id_str not in self.progress[course_id_str]["completed_lessons"]:
-                self.progress[course_id_str]["completed_lessons"].append(lesson_id_str)
+        progress = self.progress.get(course_id)
 
+        if progress is not None:
+            if progress.completed_lessons.add(lesson_id):
                 # Оновлюємо загальний прогрес курсу
-                from course import Course
-                course = Course.find_by_id(int(course_id))
+                from courses import Course
+                course = Course.find_by_id(course_id)
                 if course:
-                    total_lessons = len(course.lessons)
-                    completed_lessons = len(self.progress[course_id_str]["completed_lessons"])
-
-                    if total_lessons > 0:
-                        progress_percentage = round((completed_lessons / total_lessons) * 100)
-                        self.progress[course_id_str]["overall_progress"] = progress_percentage
-
-                students = Student.load_students()
-                for i, student in enumerate(students):
-                    if student.student_id == self.student_id:
-                        students[i] = self
-                        Student.save_students(students)
-                        return True
+                    progress.overall_progress = progress.percentage(course.lesson_count)
+                completions.mark(course_id, self.student_id, lesson_id)
+
+                repository.record({
+                    "op": "progress_update",
+                    "kind": "students",
+                    "student_id": self.student_id,
+                    "course_id": course_id,
+                    "lesson_id": lesson_id,
+                    "overall_progress": progress.overall_progress
+                })
+                return True
         return False
 
+    def record_score(self, course_id, lesson_id, score):
+        """Зберігає бал за завдання, якщо він кращий за попередній"""
+        progress = self.progress.get(course_id)
+        if progress is None:
+            return False
+
+        best = progress.score(lesson_id)
+        if best is not None and best >= score:
+            return False
+
+        if progress.scores is None:
+            progress.scores = {}
+        progress.scores[lesson_id] = score
+        repository.record({
+            "op": "score_set",
+            "kind": "students",
+            "student_id": self.student_id,
+            "course_id": course_id,
+            "lesson_id": lesson_id,
+            "score": score
+        })
+        return True
+
+    def refresh_progress(self, course_id, total_lessons):
+        """Перераховує відсоток прогресу після зміни кількості уроків курсу"""
+        progress = self.progress.get(course_id)
+        if progress is None:
+            return False
+
+        percentage = progress.percentage(total_lessons)
+        if percentage == progress.overall_progress:
+            return False
+
+        progress.overall_progress = percentage
+        repository.record({
+            "op": "progress_set",
+            "kind": "students",
+            "student_id": self.student_id,
+            "course_id": course_id,
+            "overall_progress": percentage
+        })
+        return True
+
     @staticmethod
     def show_progress():
         """Відображення прогресу студента за всіма курсами"""
@@ -162,7 +227,8 @@ class Student:
             print("ID студента повинен бути числом")
             return
 
-        student = Student.find_by_id(student_id)
+        # Звіт лише читає дані, тож студенти й курси перебираються потоково без завантаження всіх файлів
+        student = repository.find("students", student_id)
         if not student:
             print("Студента з таким ID не знайдено")
             return
@@ -173,15 +239,19 @@ class Student:
             print("Студент не записаний на жодний курс")
             return
 
-        from course import Course
+        from courses import Course
 
+        courses = {course.course_id: course for course in Course.iter_courses()
+                   if course.course_id in student.enrolled_courses}
         for course_id in student.enrolled_courses:
-            course = Course.find_by_id(int(course_id))
+            course = courses.get(course_id)
             if course:
-                progress_info = student.progress.get(course_id, {"overall_progress": 0})
+                progress_info = student.progress.get(course_id, CourseProgress())
                 print(f"Курс: {course.title}")
-                print(f"Прогрес: {progress_info['overall_progress']}%")
+                print(f"Прогрес: {progress_info.overall_progress}%")
 
-                completed_lessons = progress_info.get("completed_lessons", [])
+                completed_lessons = progress_info.completed_lessons
                 print(f"Завершено уроків: {len(completed_lessons)} з {len(course.lessons)}")
+                if progress_info.scores:
+                    print(f"Бали за завдання: {sum(progress_info.scores.values())}")
                 print("-" * 30)
\ No newline at end of file
@@ -0,0 +1,400 @@
+"""Сховище студентів у файлі записів фіксованої довжини, відображеному в пам'ять (mmap)
+
+students.idx - заголовок і масив записів однакової довжини: запис студента з ID n лежить за
+зміщенням n * RECORD.size, тож пошук, читання й зміна одного студента не торкаються інших.
+Запис містить лише зміщення й довжини у двох купах:
+    students.strings  - ID, ім'я, прізвище, пошта й телефон рядком json (JSONL, лише дописується);
+    students.progress - записані курси та прогрес; кожен студент має область з двох половин:
+                        нова версія пишеться в неактивну половину, а потім у записі змінюється
+                        зміщення, тож збій посеред запису не пошкоджує попередній стан.
+Якщо нова версія не вміщається в половину, область виділяється заново в кінці купи.
+Новий студент - запис у масиві та дописування в кінець куп, тобто O(1).
+"""
+import json
+import mmap
+import os
+import struct
+
+import fileio
+import snapshot_cache
+from journal import apply_entry, entry_key
+from locking import DataLock
+
+INDEX_FILE = "students.idx"
+STRINGS_FILE = "students.strings"
+PROGRESS_FILE = "students.progress"
+MAPPED_FILES = (INDEX_FILE, STRINGS_FILE, PROGRESS_FILE)
+
+MAGIC = b"STUDIDX1"
+NOT_MAPPED_ERROR = "Студентів ще не перенесено у students.idx: виконайте python migrate.py map"
+# Зміщення рядків, поточної версії прогресу та області прогресу; довжини рядків і прогресу;
+# розмір половини області; прапорці
+RECORD = struct.Struct("<QQQIIII")
+PRESENT = 1
+MIN_HALF = 64
+ITER_BATCH = 1024
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Heap:
+    """Файл-купа: читання за зміщенням, запис на місці та дописування в кінець"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def size(self):
+        return os.fstat(self._fd).st_size
+
+    def read(self, offset, length):
+        data = os.pread(self._fd, length, offset)
+        fileio.count_read(len(data))
+        return data
+
+    def write(self, offset, data):
+        os.pwrite(self._fd, data, offset)
+
+    def append(self, data, reserve=0):
+        """Дописує дані в кінець, залишаючи після них reserve вільних байтів; повертає зміщення"""
+        offset = self.size()
+        if reserve:
+            os.ftruncate(self._fd, offset + len(data) + reserve)
+        self.write(offset, data)
+        return offset
+
+    def sync(self):
+        if fileio.FSYNC_POLICY == "always":
+            os.fsync(self._fd)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class StudentFile:
+    """Студенти в масиві записів фіксованої довжини з купами рядків і прогресу
+
+    Методи не блокують каталог даних: читання викликаються під спільним блокуванням,
+    зміни - під виключним (див. MappedStore).
+    """
+
+    def __init__(self, index_path=INDEX_FILE, strings_path=STRINGS_FILE, progress_path=PROGRESS_FILE, create=True):
+        self.paths = (index_path, strings_path, progress_path)
+        # Без create відсутній індекс - FileNotFoundError, а не новий порожній файл
+        self.create = create
+        self._map = None
+        self._index_fd = None
+        self._inode = None
+        self._strings = None
+        self._progress = None
+        self._emails = {}
+        self._scanned = 0
+
+    def _open(self):
+        """Відкриває файли; якщо їх замінено (перетворення з json), відкриває заново"""
+        index_path, strings_path, progress_path = self.paths
+        if self._map is not None:
+            try:
+                if os.stat(index_path).st_ino == self._inode:
+                    return
+            except FileNotFoundError:
+                pass
+            self.close()
+
+        fd = os.open(index_path, os.O_RDWR | (os.O_CREAT if self.create else 0), 0o644)
+        stat = os.fstat(fd)
+        if stat.st_size == 0:
+            os.pwrite(fd, MAGIC.ljust(RECORD.size, b"\0"), 0)
+        self._map = mmap.mmap(fd, 0)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            os.close(fd)
+            self._map = None
+            raise ValueError(f"Файл {index_path} пошкоджено: невідомий формат")
+        self._index_fd = fd
+        self._inode = stat.st_ino
+        self._strings = _Heap(strings_path)
+        self._progress = _Heap(progress_path)
+        self._emails = {}
+        self._scanned = 0
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            os.close(self._index_fd)
+            self._strings.close()
+            self._progress.close()
+            self._map = None
+
+    def _capacity(self):
+        """Кількість місць у масиві разом із заголовком (місце 0)"""
+        return len(self._map) // RECORD.size
+
+    def _remap(self, slots=0):
+        """Відображає файл заново, якщо його збільшив інший процес, або збільшує його до slots місць"""
+        size = os.fstat(self._index_fd).st_size
+        needed = slots * RECORD.size
+        if needed > size:
+            # Подвоєння місткості: дописування нових студентів лишається амортизовано O(1)
+            size = max(needed, 2 * size)
+            os.ftruncate(self._index_fd, size)
+        if size != len(self._map):
+            self._map.close()
+            self._map = mmap.mmap(self._index_fd, size)
+
+    def _slot(self, student_id):
+        """Поля запису студента або None, якщо його немає"""
+        if student_id < 1:
+            return None
+        if student_id >= self._capacity():
+            self._remap()
+            if student_id >= self._capacity():
+                return None
+        fields = RECORD.unpack_from(self._map, student_id * RECORD.size)
+        return fields if fields[6] & PRESENT else None
+
+    def _decode(self, student_id, fields):
+        strings_offset, progress_offset, _, strings_length, progress_length, _, _ = fields
+        _, first_name, last_name, email, phone = json.loads(self._strings.read(strings_offset, strings_length))
+        progress = json.loads(self._progress.read(progress_offset, progress_length))
+        return {
+            "student_id": student_id,
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "phone": phone,
+            "enrolled_courses": progress["enrolled_courses"],
+            "progress": progress["progress"]
+        }
+
+    def get(self, student_id):
+        """Запис студента у форматі json файлу або None; читається лише один запис"""
+        self._open()
+        fields = self._slot(student_id)
+        return self._decode(student_id, fields) if fields else None
+
+    def read_range(self, start, count):
+        """Записи студентів з ID від start (не більше count місць); повертає (записи, наступний ID або None)"""
+        self._open()
+        self._remap()
+        end = min(start + count, self._capacity())
+        records = []
+        for student_id in range(start, end):
+            fields = RECORD.unpack_from(self._map, student_id * RECORD.size)
+            if fields[6] & PRESENT:
+                records.append(self._decode(student_id, fields))
+        return records, end if end < self._capacity() else None
+
+    def iter_records(self):
+        """Усі записи студентів у порядку ID"""
+        start = 1
+        while start is not None:
+            records, start = self.read_range(start, ITER_BATCH)
+            yield from records
+
+    def max_id(self):
+        self._open()
+        self._remap()
+        for student_id in range(self._capacity() - 1, 0, -1):
+            if RECORD.unpack_from(self._map, student_id * RECORD.size)[6] & PRESENT:
+                return student_id
+        return 0
+
+    def find_id(self, email):
+        """ID студента за поштою: індекс будується з купи рядків, а далі дочитується лише її новий хвіст"""
+        self._open()
+        size = self._strings.size()
+        if size > self._scanned:
+            data = self._strings.read(self._scanned, size - self._scanned)
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                student_id, _, _, line_email, _ = json.loads(line)
+                self._emails[line_email.lower()] = student_id
+            self._scanned += end
+
+        student_id = self._emails.get(email.lower())
+        # Купа лише дописується, тож у ній можуть бути старі версії рядків - перевіряємо поточний запис
+        record = self.get(student_id) if student_id is not None else None
+        if record is None or record["email"].lower() != email.lower():
+            return None
+        return student_id
+
+    def put(self, record):
+        """Записує стан студента: змінені рядки дописуються, прогрес - у неактивну половину області"""
+        self._open()
+        student_id = record["student_id"]
+        strings = _encode([student_id, record["first_name"], record["last_name"], record["email"],
+                           record.get("phone")])
+        progress = _encode({"enrolled_courses": record.get("enrolled_courses", []),
+                            "progress": record.get("progress", {})})
+
+        fields = self._slot(student_id)
+        if fields is None:
+            strings_offset, strings_length = None, 0
+            progress_offset = region_offset = half = 0
+        else:
+            strings_offset, progress_offset, region_offset, strings_length, _, half, _ = fields
+        if strings_offset is None or self._strings.read(strings_offset, strings_length) != strings:
+            strings_offset = self._strings.append(strings + b"\n")
+            strings_length = len(strings)
+
+        if len(progress) <= half:
+            progress_offset = region_offset + half if progress_offset == region_offset else region_offset
+            self._progress.write(progress_offset, progress)
+        else:
+            half = max(MIN_HALF, 2 * len(progress))
+            region_offset = progress_offset = self._progress.append(progress, 2 * half - len(progress))
+
+        # Запис змінюється останнім, коли нові дані вже в купах
+        self._remap(student_id + 1)
+        RECORD.pack_into(self._map, student_id * RECORD.size, strings_offset, progress_offset, region_offset,
+                         strings_length, len(progress), half, PRESENT)
+
+    def sync(self):
+        """Скидає купи, а потім записи на диск відповідно до політики fsync"""
+        if self._map is None:
+            return
+        self._strings.sync()
+        self._progress.sync()
+        if fileio.FSYNC_POLICY == "always":
+            self._map.flush()
+
+    def apply(self, entries):
+        """Застосовує записи мутацій студентів: кожен студент читається й записується один раз"""
+        pending = {}
+        for entry in entries:
+            pending.setdefault(entry_key(entry), []).append(entry)
+        for student_id, student_entries in pending.items():
+            record = self.get(student_id)
+            records = {student_id: record} if record is not None else {}
+            for entry in student_entries:
+                apply_entry(records, entry)
+            if student_id in records:
+                self.put(records[student_id])
+        self.sync()
+
+    def write_all(self, records):
+        """Замінює всіх студентів: нові файли пишуться поруч і підміняють старі (індекс - останнім)"""
+        tmp_paths = [path + ".tmp" for path in self.paths]
+        for path in tmp_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        builder = StudentFile(*tmp_paths)
+        try:
+            # Файли створюються й без записів: порожній індекс - теж перенесені студенти
+            builder._open()
+            for record in records:
+                builder.put(record)
+            builder.sync()
+        finally:
+            builder.close()
+
+        self.close()
+        for tmp_path, path in zip(tmp_paths[1:], self.paths[1:]):
+            os.replace(tmp_path, path)
+        os.replace(tmp_paths[0], self.paths[0])
+
+
+class MappedStore:
+    """Студенти - у StudentFile з доступом за ID, решта типів - у json файлах з журналом"""
+
+    def __init__(self, journal, students=None, lock=None):
+        self.journal = journal
+        self.students = students or StudentFile(create=False)
+        self._lock = lock or DataLock()
+
+    def _require_index(self):
+        """Без індексу створює порожні файли, але лише якщо в json даних немає студентів
+
+        Інакше (migrate.py map не виконано) наявні студенти зникли б, а нові отримали б їхні ID.
+        """
+        if os.path.exists(self.students.paths[0]):
+            return
+        with self._lock.exclusive():
+            if os.path.exists(self.students.paths[0]):
+                return
+            if next(iter(self.journal.iter_records("students")), None) is not None:
+                raise ValueError(NOT_MAPPED_ERROR)
+            self.students.write_all(())
+
+    def is_indexed(self, kind):
+        """Окремий студент читається без розбору інших; решта типів - цілими json файлами"""
+        return kind == "students"
+
+    def load_records(self, kind):
+        if kind != "students":
+            return self.journal.load_records(kind)
+        self._require_index()
+        with self._lock.shared():
+            return list(self.students.iter_records())
+
+    def load_objects(self, kind, from_dict):
+        if kind != "students":
+            return self.journal.load_objects(kind, from_dict)
+        return snapshot_cache.build(self.load_records(kind), from_dict)
+
+    def iter_records(self, kind):
+        if kind != "students":
+            return self.journal.iter_records(kind)
+        self._require_index()
+        return self._iter_students()
+
+    def _iter_students(self):
+        """Потоковий перебір пачками: блокування тримається лише під час читання пачки"""
+        start = 1
+        while start is not None:
+            with self._lock.shared():
+                records, start = self.students.read_range(start, ITER_BATCH)
+            yield from records
+
+    def load_record(self, kind, key):
+        if kind != "students":
+            return self.journal.load_record(kind, key)
+        self._require_index()
+        with self._lock.shared():
+            return self.students.get(key)
+
+    def max_id(self, kind, id_field):
+        if kind != "students":
+            return self.journal.max_id(kind, id_field)
+        self._require_index()
+        with self._lock.shared():
+            return self.students.max_id()
+
+    def find_student_id(self, email):
+        self._require_index()
+        with self._lock.shared():
+            return self.students.find_id(email)
+
+    def append(self, entries):
+        """Зміни студентів записуються у їхні записи на місці, решта - у журнал"""
+        students = [entry for entry in entries if entry["kind"] == "students"]
+        if students:
+            self._require_index()
+            with self._lock.exclusive():
+                self.students.apply(students)
+        self.journal.append([entry for entry in entries if entry["kind"] != "students"])
+
+    def write_snapshot(self, kind, records):
+        if kind != "students":
+            self.journal.write_snapshot(kind, records)
+            return
+        with self._lock.exclusive():
+            self.students.write_all(records)
+
+    def size(self):
+        return self.journal.size()
+
+    def discard(self):
+        self.journal.discard()
+
+    def maybe_compact(self):
+        self.journal.maybe_compact()
+
+    def compact(self, background=False):
+        self.journal.compact(background)
+
+    def wait(self):
+        self.journal.wait()
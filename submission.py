@@ -0,0 +1,188 @@
+from datetime import datetime
+
+from repository import repository
+from storage import backend
+from sequences import allocator
+from solution_log import solution_log
+
+# pending - очікує автоматичної перевірки; graded - перевірено тестами;
+# accepted - завдання без тестів, зараховується одразу
+STATUSES = ("pending", "graded", "accepted")
+
+
+class Submission:
+    """Подане рішення завдання та результат його перевірки
+
+    Текст рішення зберігається в сегментованому журналі solution_log за ключем
+    (student_id, lesson_id, attempt), тож записи рішень лишаються малими.
+    """
+
+    __slots__ = ("submission_id", "student_id", "course_id", "lesson_id", "attempt", "status",
+                 "score", "passed", "total", "feedback", "submitted_at", "_legacy_solution")
+
+    def __init__(self, student_id, course_id, lesson_id, attempt, status="pending", score=None, passed=0,
+                 total=0, feedback=None, submitted_at=None, submission_id=None, legacy_solution=None):
+        self.submission_id = submission_id if submission_id is not None else allocator.next_id("submissions")
+        self.student_id = student_id
+        self.course_id = course_id
+        self.lesson_id = lesson_id
+        self.attempt = attempt
+        # Текст рішень, збережених до появи solution_log, лишається в самому записі
+        self._legacy_solution = legacy_solution
+        self.status = status
+        self.score = score
+        self.passed = passed
+        self.total = total
+        self.feedback = feedback
+        self.submitted_at = submitted_at or datetime.now().isoformat(timespec="seconds")
+
+    @property
+    def solution(self):
+        """Текст рішення: одне читання з журналу рішень"""
+        if self._legacy_solution is not None:
+            return self._legacy_solution
+        return solution_log.read(self.student_id, self.lesson_id, self.attempt)
+
+    def to_dict(self):
+        """Перетворення об'єкта в словник"""
+        submission_dict = {
+            "submission_id": self.submission_id,
+            "student_id": self.student_id,
+            "course_id": self.course_id,
+            "lesson_id": self.lesson_id,
+            "attempt": self.attempt,
+            "status": self.status,
+            "score": self.score,
+            "passed": self.passed,
+            "total": self.total,
+            "feedback": self.feedback,
+            "submitted_at": self.submitted_at
+        }
+        if self._legacy_solution is not None:
+            submission_dict["solution"] = self._legacy_solution
+        return submission_dict
+
+    @staticmethod
+    def from_dict(submission_dict):
+        """Створює новий об'єкт з словника"""
+        return Submission(
+            submission_dict["student_id"],
+            submission_dict["course_id"],
+            submission_dict["lesson_id"],
+            submission_dict.get("attempt"),
+            submission_dict.get("status", "pending"),
+            submission_dict.get("score"),
+            submission_dict.get("passed", 0),
+            submission_dict.get("total", 0),
+            submission_dict.get("feedback"),
+            submission_dict.get("submitted_at"),
+            submission_dict["submission_id"],
+            submission_dict.get("solution")
+        )
+
+    @staticmethod
+    def load_submissions():
+        """Підтягує всі подані рішення"""
+        return backend.load_objects("submissions", Submission.from_dict)
+
+    @staticmethod
+    def iter_submissions():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("submissions")
+
+    @staticmethod
+    def create(student_id, course_id, lesson_id, solution, status="pending"):
+        """Дописує текст рішення в журнал рішень і зберігає запис про нову спробу"""
+        attempt = solution_log.append(student_id, lesson_id, solution)
+        submission = Submission(student_id, course_id, lesson_id, attempt, status)
+        repository.add("submissions", submission)
+        return submission
+
+    @staticmethod
+    def find_by_id(submission_id):
+        """Пошук рішення за ID"""
+        return repository.get("submissions", submission_id)
+
+    @staticmethod
+    def for_student(student_id):
+        """Рішення студента, від нових до старих"""
+        submissions = [submission for submission in repository.all("submissions")
+                       if submission.student_id == student_id]
+        return sorted(submissions, key=lambda submission: submission.submission_id, reverse=True)
+
+    @staticmethod
+    def pending():
+        """Рішення, що очікують автоматичної перевірки, у порядку подання"""
+        return [submission for submission in repository.all("submissions") if submission.status == "pending"]
+
+    def record_result(self, passed, total, score, feedback):
+        """Зберігає результат перевірки"""
+        self.status = "graded"
+        self.passed = passed
+        self.total = total
+        self.score = score
+        self.feedback = feedback
+        repository.put("submissions", self)
+
+    def status_label(self):
+        """Стан рішення для виведення"""
+        if self.status == "pending":
+            return "Очікує перевірки"
+        if self.status == "accepted":
+            return "Зараховано"
+        task = repository.get("tasks", self.lesson_id)
+        max_score = task.max_score if task else "?"
+        return f"Перевірено: {self.score} з {max_score} (тестів {self.passed} з {self.total})"
+
+    @staticmethod
+    def show_student_submissions():
+        """Перегляд рішень студента з можливістю відкрити текст будь-якої спроби"""
+        from student import Student
+
+        print("\nМої рішення")
+        student_id_input = input("Введіть ID студента: ")
+        try:
+            student_id = int(student_id_input)
+        except ValueError:
+            print("ID студента повинен бути числом")
+            return
+
+        student = Student.find_by_id(student_id)
+        if not student:
+            print("Студента з таким ID не знайдено")
+            return
+
+        submissions = Submission.for_student(student_id)
+        if not submissions:
+            print("Студент ще не подав жодного рішення")
+            return
+
+        print(f"\nРішення студента: {student.first_name} {student.last_name}")
+        for i, submission in enumerate(submissions, 1):
+            lesson = repository.get("lessons", submission.lesson_id)
+            title = lesson.title if lesson else f"ID {submission.lesson_id}"
+            attempt = f", спроба {submission.attempt}" if submission.attempt else ""
+            print(f"{i}. {title}{attempt} ({submission.submitted_at})")
+            print(f"   {submission.status_label()}")
+            if submission.feedback:
+                print(f"   {submission.feedback}")
+
+        choice = input("\nВиберіть номер рішення для перегляду тексту (Enter - повернутися): ")
+        if not choice.strip():
+            return
+        try:
+            index = int(choice) - 1
+            if index < 0 or index >= len(submissions):
+                print("Невірний вибір рішення")
+                return
+        except ValueError:
+            print("Введіть числове значення")
+            return
+
+        solution = submissions[index].solution
+        if solution is None:
+            print("Текст рішення не знайдено")
+            return
+        print("-" * 30)
+        print(solution.rstrip("\n"))
+        print("-" * 30)
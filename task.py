@@ -1,15 +1,27 @@
-import json
-from validators import validate_title, validate_content
+from validators import validate_title, validate_content, validate_date, validate_tests
 from lesson import Lesson
+from repository import repository
+from storage import backend
+from search import search_index
+import pagination
+from submission import Submission
+
+# Рядок, що завершує введення рішення в меню
+SOLUTION_END = "EOF"
 
 
 class Task:
     """Клас для керування завданнями в системі онлайн-курсів"""
-    def __init__(self, lesson_id, description, max_score, deadline=None):
+
+    __slots__ = ("lesson_id", "description", "max_score", "deadline", "tests")
+
+    def __init__(self, lesson_id, description, max_score, deadline=None, tests=None):
         self.lesson_id = lesson_id
         self.description = description
         self.max_score = max_score
         self.deadline = deadline
+        # Тести для автоматичної перевірки: [{"input": "...", "expected": "..."}]
+        self.tests = tests or []
 
     def to_dict(self):
         """Конвертація об'єкта завдання в словник для серіалізації"""
@@ -17,7 +29,8 @@ class Task:
             "lesson_id": self.lesson_id,
             "description": self.description,
             "max_score": self.max_score,
-            "deadline": self.deadline
+            "deadline": self.deadline,
+            "tests": self.tests
         }
 
     @staticmethod
@@ -27,59 +40,78 @@ class Task:
             task_dict["lesson_id"],
             task_dict["description"],
             task_dict["max_score"],
-            task_dict.get("deadline")
+            task_dict.get("deadline"),
+            task_dict.get("tests")
         )
 
     @staticmethod
     def load_tasks():
         """Завантаження всіх завдань з файлу json"""
-        try:
-            with open("tasks.json", "r", encoding="utf-8") as file:
-                tasks_data = json.load(file)
-                tasks = []
-                for task_dict in tasks_data:
-                    tasks.append(Task.from_dict(task_dict))
-                return tasks
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        return backend.load_objects("tasks", Task.from_dict)
+
+    @staticmethod
+    def iter_tasks():
+        """Потоково перебирає збережені об'єкти по одному"""
+        return repository.iter("tasks")
+
+    @staticmethod
+    def validate_tests(tests):
+        """Перевіряє формат тестів: список об'єктів з рядками input (необов'язково) та expected"""
+        return validate_tests(tests)
 
     @staticmethod
-    def save_tasks(tasks):
-        """Збереження списку завдань у json файл"""
-        tasks_data = [task.to_dict() for task in tasks]
-        with open("tasks.json", "w", encoding="utf-8") as file:
-            json.dump(tasks_data, file, ensure_ascii=False, indent=2)
+    def create(course_id, title, summary, description, max_score, deadline=None, tests=None):
+        """Додавання завдання до курсу без діалогу; при помилці кидає ValueError"""
+        from courses import Course
+
+        course = Course.find_by_id(course_id)
+        if not course:
+            raise ValueError("Курс з таким ID не знайдено")
+
+        if max_score <= 0:
+            raise ValueError("Максимальний бал повинен бути більше нуля")
+
+        # Валідація введених даних
+        if not validate_title(title):
+            raise ValueError("Назва завдання не може бути порожньою")
+
+        if not validate_content(description):
+            raise ValueError("Опис завдання не може бути порожнім")
+
+        if deadline and not validate_date(deadline):
+            raise ValueError("Дедлайн повинен бути датою у форматі YYYY-MM-DD")
+
+        if tests is not None and not Task.validate_tests(tests):
+            raise ValueError("Тести повинні бути списком об'єктів з полями input та expected")
+
+        # Створюємо новий урок і завдання
+        new_lesson = Lesson.create(title, summary, "task")
+        new_task = Task(new_lesson.lesson_id, description, max_score, deadline.strip() if deadline else None, tests)
+        repository.add("tasks", new_task)
+
+        # Додаємо завдання до курсу
+        if not course.add_lesson(new_lesson.lesson_id):
+            raise ValueError("Помилка при додаванні завдання до курсу")
+        search_index.update_lesson(new_lesson, course_id, task=new_task)
+        return new_task
 
     @staticmethod
     def add_to_course():
         """Додавання нового завдання до курсу"""
-        from course import Course
-
         print("\nДодавання завдання до курсу")
 
+        from courses import Course
+
         # Перевіряємо наявність курсів
-        courses = Course.load_courses()
-        if not courses:
+        if not pagination.count("courses"):
             print("Немає доступних курсів. Спочатку створіть курс.")
             return
 
-        # Виводимо список доступних курсів
-        print("\nДоступні курси:")
-        for idx, course in enumerate(courses, 1):
-            print(f"{idx}. {course.title} (ID: {course.course_id})")
-
-        # Обираємо курс
-        try:
-            course_idx = int(input("\nВиберіть номер курсу: ")) - 1
-            if course_idx < 0 or course_idx >= len(courses):
-                print("Невірний вибір курсу")
-                return
-        except ValueError:
-            print("Введіть числове значення")
+        # Обираємо курс зі списку доступних (посторінково)
+        course = Course.choose_course()
+        if not course:
             return
 
-        course = courses[course_idx]
-
         # Збираємо дані для створення завдання
         title = input("Введіть назву завдання: ")
         summary = input("Введіть короткий опис завдання: ")
@@ -96,38 +128,64 @@ class Task:
 
         deadline = input("Введіть дедлайн (необов'язково, формат YYYY-MM-DD): ")
 
-        # Валідація введених даних
-        if not validate_title(title):
-            print("Назва завдання не може бути порожньою")
-            return
+        tests = []
+        tests_count = input("Кількість тестів для автоматичної перевірки (необов'язково): ")
+        if tests_count.strip():
+            try:
+                tests_count = int(tests_count)
+            except ValueError:
+                print("Кількість тестів повинна бути числом")
+                return
+            print("Символи \\n у вхідних даних та результаті позначають новий рядок")
+            for number in range(1, tests_count + 1):
+                test_input = input(f"Вхідні дані тесту {number}: ").replace("\\n", "\n")
+                expected = input(f"Очікуваний результат тесту {number}: ").replace("\\n", "\n")
+                tests.append({"input": test_input, "expected": expected})
 
-        if not validate_content(description):
-            print("Опис завдання не може бути порожнім")
+        try:
+            Task.create(course.course_id, title, summary, description, max_score, deadline, tests)
+        except ValueError as error:
+            print(error)
             return
 
-        # Створюємо новий урок
-        lesson_type = "task"
-        new_lesson = Lesson.create_lesson(title, summary, lesson_type)
+        print(f"Завдання '{title}' успішно додано до курсу '{course.title}'")
 
-        if not new_lesson:
-            return
+    @staticmethod
+    def submit(student_id, course_id, lesson_id, solution):
+        """Подання рішення без діалогу; при помилці кидає ValueError"""
+        from student import Student
+        from courses import Course
 
-        # Створюємо нове завдання
-        tasks = Task.load_tasks()
-        new_task = Task(new_lesson.lesson_id, description, max_score, deadline if deadline else None)
-        tasks.append(new_task)
-        Task.save_tasks(tasks)
+        student = Student.find_by_id(student_id)
+        if not student:
+            raise ValueError("Студента з таким ID не знайдено")
 
-        # Додаємо завдання до курсу
-        if course.add_lesson(new_lesson.lesson_id):
-            print(f"Завдання '{title}' успішно додано до курсу '{course.title}'")
-        else:
-            print("Помилка при додаванні завдання до курсу")
+        if course_id not in student.enrolled_courses:
+            raise ValueError("Студент не записаний на цей курс")
+
+        course = Course.find_by_id(course_id)
+        lesson = Lesson.find_by_id(lesson_id)
+        if not course or lesson_id not in course.lessons or not lesson or lesson.type != "task":
+            raise ValueError("Завдання з таким ID не знайдено у курсі")
+
+        if not solution.strip():
+            raise ValueError("Рішення не може бути порожнім")
+
+        # Рішення з тестами стає в чергу перевірки; прогрес оновить grader
+        task = repository.get("tasks", lesson_id)
+        if task and task.tests:
+            return Submission.create(student_id, course_id, lesson_id, solution)
+
+        # Оновлюємо прогрес студента
+        if not student.update_progress(course_id, lesson_id):
+            raise ValueError("Помилка при поданні рішення")
+        return Submission.create(student_id, course_id, lesson_id, solution, "accepted")
 
     @staticmethod
     def submit_solution():
         """Метод для подання рішення завдання студентом"""
         from student import Student
+        from outline import course_tasks
 
         print("\nПодання рішення завдання")
 
@@ -150,11 +208,11 @@ class Task:
             return
 
         # Виводимо курси, на які записаний студент
-        from course import Course
+        from courses import Course
 
         enrolled_courses = []
         for course_id in student.enrolled_courses:
-            course = Course.find_by_id(int(course_id))
+            course = Course.find_by_id(course_id)
             if course:
                 enrolled_courses.append(course)
 
@@ -178,16 +236,7 @@ class Task:
         selected_course = enrolled_courses[course_idx]
 
         # Виводимо список завдань з цього курсу
-        tasks_in_course = []
-        lessons = Lesson.load_lessons()
-        all_tasks = Task.load_tasks()
-
-        for lesson_id in selected_course.lessons:
-            for lesson in lessons:
-                if str(lesson.lesson_id) == lesson_id and lesson.type == "task":
-                    for task in all_tasks:
-                        if task.lesson_id == lesson.lesson_id:
-                            tasks_in_course.append((lesson, task))
+        tasks_in_course = course_tasks(selected_course)
 
         if not tasks_in_course:
             print("У цьому курсі немає завдань")
@@ -195,8 +244,8 @@ class Task:
 
         print("\nЗавдання у курсі:")
         for idx, (lesson, task) in enumerate(tasks_in_course, 1):
-            completed = str(lesson.lesson_id) in student.progress.get(str(selected_course.course_id), {}).get(
-                "completed_lessons", [])
+            progress = student.progress.get(selected_course.course_id)
+            completed = progress is not None and lesson.lesson_id in progress.completed_lessons
             status = "✓ Виконано" if completed else "◯ Не виконано"
             print(f"{idx}. {lesson.title} - {status}")
 
@@ -215,14 +264,36 @@ class Task:
         print(f"Опис: {selected_task.description}")
         print(f"Максимальний бал: {selected_task.max_score}")
 
-        solution = input("\nВведіть ваше рішення: ")
+        if selected_task.tests:
+            print(f"\nРішення перевіряється автоматично ({len(selected_task.tests)} тестів)")
+            print("Введіть код Python (дані тесту - у stdin, відповідь - у stdout); "
+                  f"рядок {SOLUTION_END} завершує введення:")
+            lines = []
+            while True:
+                try:
+                    line = input()
+                except EOFError:
+                    break
+                # Порожні рядки - звичайна частина коду (наприклад, між функціями), тож кінець позначається явно
+                if line.strip() == SOLUTION_END:
+                    break
+                lines.append(line)
+            solution = "\n".join(lines) + "\n"
+        else:
+            solution = input("\nВведіть ваше рішення: ")
 
-        if not solution.strip():
-            print("Рішення не може бути порожнім")
+        try:
+            submission = Task.submit(student.student_id, selected_course.course_id, selected_lesson.lesson_id, solution)
+        except ValueError as error:
+            print(error)
             return
 
-        # Оновлюємо прогрес студента
-        if student.update_progress(selected_course.course_id, selected_lesson.lesson_id):
-            print("Рішення успішно подано!")
-        else:
-            print("Помилка при поданні рішення")
\ No newline at end of file
+        print(f"Рішення успішно подано! (спроба {submission.attempt})")
+
+        if submission.status == "pending":
+            import grader
+            grader.grade([submission])
+            print(f"Пройдено тестів: {submission.passed} з {submission.total}")
+            print(f"Бал: {submission.score} з {selected_task.max_score}")
+            if submission.feedback:
+                print(submission.feedback)
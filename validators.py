@@ -1,4 +1,12 @@
+import json
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Рядків у пачці, яку перевіряє один процес пулу
+CHUNK_SIZE = 2000
 
 def validate_email(email):
     """Перевіряє коректність формату електронної пошти"""
@@ -21,4 +29,189 @@ def validate_content(content):
 
 def validate_lesson_type(lesson_type):
     """Перевіряє, що тип уроку вказаний вірно"""
-    return lesson_type in ["lecture", "task"]
\ No newline at end of file
+    return lesson_type in ["lecture", "task"]
+
+def validate_date(value):
+    """Перевіряє, що дата задана у форматі YYYY-MM-DD"""
+    try:
+        datetime.strptime(value.strip(), "%Y-%m-%d")
+    except (AttributeError, ValueError):
+        return False
+    return True
+
+def validate_tests(tests):
+    """Перевіряє формат тестів: список об'єктів з рядками input (необов'язково) та expected"""
+    if not isinstance(tests, list):
+        return False
+    for test in tests:
+        if not isinstance(test, dict) or not isinstance(test.get("expected"), str):
+            return False
+        if not isinstance(test.get("input", ""), str):
+            return False
+    return True
+
+def _text(value):
+    return value if isinstance(value, str) else None
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _integer(value):
+    """Ціле число, як у пакетному режимі: True/False не є ID"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _optional_text(row, name):
+    return row.get(name) is None or isinstance(row[name], str)
+
+def _student_errors(row):
+    errors = []
+    if not validate_name(_text(row["first_name"])) or not validate_name(_text(row["last_name"])):
+        errors.append("Ім'я та прізвище повинні містити тільки літери і не бути порожніми")
+    if _text(row["email"]) is None or not validate_email(row["email"]):
+        errors.append("Некоректний формат електронної пошти")
+    if not _optional_text(row, "phone"):
+        errors.append("Номер телефону повинен бути рядком")
+    return errors
+
+def _course_errors(row):
+    errors = []
+    if not validate_title(_text(row["title"])):
+        errors.append("Назва курсу не може бути порожньою")
+    if not validate_content(_text(row["description"])):
+        errors.append("Опис курсу не може бути порожнім")
+    if not validate_title(_text(row["author"])):
+        errors.append("Ім'я автора не може бути порожнім")
+    return errors
+
+def _lecture_errors(row):
+    errors = []
+    if not _integer(row["course_id"]):
+        errors.append("ID курсу повинен бути числом")
+    if not _number(row["duration"]) or row["duration"] <= 0:
+        errors.append("Тривалість повинна бути більше нуля")
+    # Назва уроку - та сама назва лекції, тож окремо перевіряється лише опис уроку (правило Lesson.create)
+    if not validate_title(_text(row["title"])):
+        errors.append("Назва лекції не може бути порожньою")
+    if not validate_content(_text(row["description"])):
+        errors.append("Опис уроку не може бути порожнім")
+    if not validate_content(_text(row["content"])):
+        errors.append("Вміст лекції не може бути порожнім")
+    if not _optional_text(row, "video_url"):
+        errors.append("Посилання на відео повинно бути рядком")
+    return errors
+
+def _task_errors(row):
+    errors = []
+    if not _integer(row["course_id"]):
+        errors.append("ID курсу повинен бути числом")
+    if not _number(row["max_score"]) or row["max_score"] <= 0:
+        errors.append("Максимальний бал повинен бути більше нуля")
+    if not validate_title(_text(row["title"])):
+        errors.append("Назва завдання не може бути порожньою")
+    if not validate_content(_text(row["summary"])):
+        errors.append("Опис уроку не може бути порожнім")
+    if not validate_content(_text(row["description"])):
+        errors.append("Опис завдання не може бути порожнім")
+    if not _optional_text(row, "deadline") or (row.get("deadline") and not validate_date(row["deadline"])):
+        errors.append("Дедлайн повинен бути датою у форматі YYYY-MM-DD")
+    if row.get("tests") is not None and not validate_tests(row["tests"]):
+        errors.append("Тести повинні бути списком об'єктів з полями input та expected")
+    return errors
+
+# Команди пакетного режиму, що створюють записи: обов'язкові поля та правила полів
+FIELD_RULES = {
+    "register_student": (("first_name", "last_name", "email"), _student_errors),
+    "create_course": (("title", "description", "author"), _course_errors),
+    "add_lecture": (("course_id", "title", "description", "content", "duration"), _lecture_errors),
+    "add_task": (("course_id", "title", "summary", "description", "max_score"), _task_errors),
+}
+
+def _check_row(row):
+    """Правила полів одного рядка: (команда, пошта, ID курсу, помилки); None для порожнього рядка JSONL"""
+    if isinstance(row, str):
+        if not row.strip():
+            return None
+        try:
+            row = json.loads(row)
+        except json.JSONDecodeError as error:
+            return None, None, None, [f"Некоректний JSON: {error}"]
+    if not isinstance(row, dict):
+        return None, None, None, ["Команда повинна бути JSON об'єктом"]
+
+    command = row.get("command")
+    if command not in FIELD_RULES:
+        return command, None, None, [f"Невідома команда: {command}"]
+    required, rule = FIELD_RULES[command]
+    missing = [field for field in required if field not in row]
+    if missing:
+        return command, None, None, [f"Відсутнє поле: {field}" for field in missing]
+
+    errors = rule(row)
+    # Повтори перевіряються лише для коректних адрес
+    email = None
+    if command == "register_student" and "Некоректний формат електронної пошти" not in errors:
+        email = row["email"].lower()
+    course_id = row.get("course_id") if _integer(row.get("course_id")) else None
+    return command, email, course_id, errors
+
+def check_rows(rows):
+    """Правила полів для пачки рядків (виконується в процесі пулу)"""
+    return [_check_row(row) for row in rows]
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _field_checks(rows, workers, chunk_size):
+    """Результати check_rows у порядку рядків; у пулі одночасно не більше двох пачок на процес"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(rows, chunk_size):
+            yield from check_rows(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(rows, chunk_size):
+            pending.append(executor.submit(check_rows, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def validate_batch(rows, workers=None, chunk_size=CHUNK_SIZE):
+    """Перевіряє рядки команд register_student, create_course, add_lecture та add_task без їх виконання
+
+    Рядки - словники або рядки JSONL (порожні рядки пропускаються). Правила полів перевіряються пачками в пулі процесів
+    (за замовчуванням - по процесу на ядро), а повтори пошти в пакеті й серед наявних студентів
+    та існування курсів - у поточному процесі. Повертає генератор звітів у порядку рядків:
+    {"row": номер з 1, "command": ..., "ok": ..., "errors": [...]}.
+    """
+    from repository import repository
+
+    emails = {}
+    courses = {}
+    for number, checked in enumerate(_field_checks(rows, workers, chunk_size), 1):
+        if checked is None:
+            continue
+        command, email, course_id, errors = checked
+        if email is not None:
+            first = emails.setdefault(email, number)
+            if first != number:
+                errors.append(f"Електронна пошта вже використана в рядку {first}")
+            elif repository.find_student_by_email(email):
+                errors.append("Студент з такою електронною поштою вже існує")
+
+        if course_id is not None:
+            if course_id not in courses:
+                courses[course_id] = repository.get("courses", course_id) is not None
+            if not courses[course_id]:
+                errors.append("Курс з таким ID не знайдено")
+
+        yield {"row": number, "command": command, "ok": not errors, "errors": errors}